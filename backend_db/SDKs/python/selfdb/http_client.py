@@ -209,6 +209,24 @@ class HTTPClient:
         )
         return response.json()
 
+    async def put(
+        self,
+        path: str,
+        *,
+        json: Optional[Dict[str, Any]] = None,
+        params: Optional[Dict[str, Any]] = None,
+        authenticated: bool = False,
+    ) -> Any:
+        """Make a PUT request and return JSON response."""
+        response = await self.request(
+            "PUT",
+            path,
+            json=json,
+            params=params,
+            authenticated=authenticated,
+        )
+        return response.json()
+
     async def delete(
         self,
         path: str,
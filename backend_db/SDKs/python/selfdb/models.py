@@ -151,9 +151,58 @@ class TableRead:
 class TableDataResponse:
     """Response model for table data with pagination."""
     data: List[Dict[str, Any]]
-    total: int
+    total: Optional[int]  # None when count="none"
     page: int
     page_size: int
+    has_more: bool = False
+    count_strategy: str = "exact"
+    next_cursor: Optional[str] = None
+
+
+@dataclass
+class BulkBatchResult:
+    """Outcome of one COPY batch of a bulk insert."""
+    batch: int
+    first_row: int
+    last_row: int
+    inserted: int
+    failed: int
+    duration_ms: float
+
+
+@dataclass
+class BulkRowError:
+    """A rejected row of a bulk insert."""
+    row: Optional[int]  # 1-based data row, None if not tied to a row
+    detail: str
+
+
+@dataclass
+class BulkInsertResponse:
+    """Response from a bulk insert."""
+    status: str  # "completed" or "aborted"
+    inserted: int
+    failed: int
+    batches: List[BulkBatchResult] = field(default_factory=list)
+    errors: List[BulkRowError] = field(default_factory=list)
+    duration_ms: float = 0.0
+
+
+@dataclass
+class SearchIndexCreate:
+    """Request model for creating a table's search index."""
+    method: str  # "trigram" (substring search) or "fulltext" (word search)
+    columns: Optional[List[str]] = None  # Defaults to all text columns
+    language: str = "simple"  # Text search configuration, fulltext only
+
+
+@dataclass
+class SearchIndexRead:
+    """Search index configuration of a table."""
+    method: str  # "ilike" when no index is configured
+    columns: List[str]
+    language: Optional[str] = None
+    indexes: List[str] = field(default_factory=list)
 
 
 @dataclass
@@ -234,19 +283,50 @@ class FileUploadResponse:
     path: str
     size: int
     file_id: Optional[str] = None
+    checksum_sha256: Optional[str] = None
     upload_time: Optional[float] = None
     url: Optional[str] = None
     original_path: Optional[str] = None
     message: Optional[str] = None
 
 
+@dataclass
+class UploadStatus:
+    """Progress of a resumable upload."""
+    upload_id: str
+    size: int
+    offset: int  # Bytes received without a gap from the start
+    received_bytes: int
+    ranges: List[List[int]] = field(default_factory=list)  # Received [start, end) ranges
+    complete: bool = False
+    expires_at: Optional[datetime] = None
+
+
+@dataclass
+class UploadSession:
+    """
+    A resumable upload session. Plain data - persist it (e.g. asdict) to resume
+    the upload from another process before expires_at.
+    """
+    upload_id: str
+    upload_token: str
+    bucket_id: str
+    path: str
+    size: int
+    chunk_size: int
+    max_chunk_size: int
+    expires_at: Optional[datetime] = None
+
+
 @dataclass
 class FileDataResponse:
     """Response model for file listing with pagination."""
     data: List[FileResponse]
-    total: int
+    total: Optional[int]  # None when count="none"
     page: int
     page_size: int
+    has_more: bool = False
+    count_strategy: str = "exact"
 
 
 @dataclass
@@ -327,6 +407,33 @@ def bucket_from_dict(data: Dict[str, Any]) -> BucketResponse:
     )
 
 
+def upload_status_from_dict(data: Dict[str, Any]) -> UploadStatus:
+    """Create an UploadStatus from a dictionary."""
+    return UploadStatus(
+        upload_id=data["upload_id"],
+        size=data["size"],
+        offset=data["offset"],
+        received_bytes=data["received_bytes"],
+        ranges=data.get("ranges", []),
+        complete=data.get("complete", False),
+        expires_at=parse_datetime(data.get("expires_at")),
+    )
+
+
+def upload_session_from_dict(data: Dict[str, Any]) -> UploadSession:
+    """Create an UploadSession from a dictionary."""
+    return UploadSession(
+        upload_id=data["upload_id"],
+        upload_token=data["upload_token"],
+        bucket_id=data["bucket_id"],
+        path=data["path"],
+        size=data["size"],
+        chunk_size=data["chunk_size"],
+        max_chunk_size=data["max_chunk_size"],
+        expires_at=parse_datetime(data.get("expires_at")),
+    )
+
+
 def file_from_dict(data: Dict[str, Any]) -> FileResponse:
     """Create a FileResponse from a dictionary."""
     return FileResponse(
@@ -1,8 +1,13 @@
 """SelfDB SDK Storage Module - Bucket and file management."""
 
+import asyncio
+import os
 from dataclasses import asdict
-from typing import Any, BinaryIO, Dict, List, Optional, Union
+from typing import Any, BinaryIO, Callable, Dict, List, Optional, Union
 
+import httpx
+
+from selfdb.exceptions import APIConnectionError, InternalServerError
 from selfdb.http_client import HTTPClient
 from selfdb.models import (
     BucketCreate,
@@ -12,11 +17,76 @@ from selfdb.models import (
     FileUploadResponse,
     FileDataResponse,
     StorageStatsResponse,
+    UploadSession,
+    UploadStatus,
     bucket_from_dict,
     file_from_dict,
+    upload_session_from_dict,
+    upload_status_from_dict,
 )
 
 
+DEFAULT_UPLOAD_CONCURRENCY = 4
+
+UploadSource = Union[bytes, str, "os.PathLike[str]", BinaryIO]
+
+
+class _ChunkReader:
+    """Random-access reads of an upload source: bytes, a file path or a seekable binary file."""
+
+    def __init__(self, source: UploadSource):
+        self._data: Optional[memoryview] = None
+        self._path: Optional[str] = None
+        self._file: Optional[BinaryIO] = None
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            self._data = memoryview(source)
+            self.size = len(self._data)
+        elif isinstance(source, (str, os.PathLike)):
+            self._path = os.fspath(source)
+            self.size = os.path.getsize(self._path)
+        else:
+            self._file = source
+            self.size = source.seek(0, os.SEEK_END)
+            # One file position shared by all workers
+            self._lock = asyncio.Lock()
+
+    def _read_path(self, offset: int, length: int) -> bytes:
+        with open(self._path, "rb") as f:
+            f.seek(offset)
+            return f.read(length)
+
+    def _read_file(self, offset: int, length: int) -> bytes:
+        self._file.seek(offset)
+        return self._file.read(length)
+
+    async def read(self, offset: int, length: int) -> bytes:
+        if self._data is not None:
+            return bytes(self._data[offset:offset + length])
+        if self._path is not None:
+            return await asyncio.to_thread(self._read_path, offset, length)
+        async with self._lock:
+            return await asyncio.to_thread(self._read_file, offset, length)
+
+
+def _upload_response(result: Dict[str, Any]) -> FileUploadResponse:
+    return FileUploadResponse(
+        success=result.get("success", True),
+        bucket=result["bucket"],
+        path=result["path"],
+        size=result["size"],
+        file_id=result.get("file_id"),
+        checksum_sha256=result.get("checksum_sha256"),
+        upload_time=result.get("upload_time"),
+        url=result.get("url"),
+        original_path=result.get("original_path"),
+        message=result.get("message"),
+    )
+
+
+def _is_received(start: int, end: int, ranges: List[List[int]]) -> bool:
+    return any(r_start <= start and end <= r_end for r_start, r_end in ranges)
+
+
 class BucketsResource:
     """Storage buckets sub-resource."""
 
@@ -190,25 +260,194 @@ class FilesResource:
                 headers=headers,
             )
         except Exception as e:
-            from selfdb.exceptions import APIConnectionError
             raise APIConnectionError(f"Upload failed: {e}")
         
         if response.status_code >= 400:
             self._http._handle_error(response)
         
-        result = response.json()
-        return FileUploadResponse(
-            success=result.get("success", True),
-            bucket=result["bucket"],
-            path=result["path"],
-            size=result["size"],
-            file_id=result.get("file_id"),
-            upload_time=result.get("upload_time"),
-            url=result.get("url"),
-            original_path=result.get("original_path"),
-            message=result.get("message"),
+        return _upload_response(response.json())
+
+    # ── Resumable uploads ──────────────────────────────────────────────────
+
+    async def create_upload(
+        self,
+        bucket_id: str,
+        filename: str,
+        size: int,
+        *,
+        path: Optional[str] = None,
+        content_type: Optional[str] = None,
+    ) -> UploadSession:
+        """Start a resumable upload of size bytes. POST /storage/files/uploads"""
+        params = {
+            "bucket_id": bucket_id,
+            "filename": filename,
+            "size": size,
+            "path": path,
+            "content_type": content_type or "application/octet-stream",
+        }
+        response = await self._http.post(
+            "/storage/files/uploads",
+            params=params,
+            authenticated=True,
+        )
+        return upload_session_from_dict(response)
+
+    async def upload_status(self, session: UploadSession) -> UploadStatus:
+        """Received ranges of a resumable upload. GET /storage/files/uploads/{upload_id}"""
+        response = await self._http.request(
+            "GET",
+            f"/storage/files/uploads/{session.upload_id}",
+            headers={"X-Upload-Token": session.upload_token},
+        )
+        return upload_status_from_dict(response.json())
+
+    async def upload_chunk(self, session: UploadSession, offset: int, data: bytes) -> UploadStatus:
+        """Send one chunk at offset. PUT /storage/files/uploads/{upload_id}"""
+        client = await self._http._get_client()
+        headers = self._http._build_headers()
+        headers["Content-Type"] = "application/octet-stream"
+        headers["X-Upload-Token"] = session.upload_token
+
+        try:
+            response = await client.put(
+                f"/storage/files/uploads/{session.upload_id}",
+                params={"offset": offset},
+                content=data,
+                headers=headers,
+                # A large chunk on a slow link may take longer than one request timeout
+                timeout=httpx.Timeout(self._http.timeout, write=None),
+            )
+        except httpx.RequestError as e:
+            raise APIConnectionError(f"Chunk upload failed: {e}")
+
+        if response.status_code >= 400:
+            self._http._handle_error(response)
+        return upload_status_from_dict(response.json())
+
+    async def complete_upload(self, session: UploadSession) -> FileUploadResponse:
+        """Assemble the uploaded chunks into the file. POST /storage/files/uploads/{upload_id}/complete"""
+        client = await self._http._get_client()
+        headers = self._http._build_headers()
+        headers["X-Upload-Token"] = session.upload_token
+
+        try:
+            response = await client.post(
+                f"/storage/files/uploads/{session.upload_id}/complete",
+                headers=headers,
+                # The server reads the whole file once to assemble and hash it
+                timeout=httpx.Timeout(self._http.timeout, read=None),
+            )
+        except httpx.RequestError as e:
+            raise APIConnectionError(f"Completing upload failed: {e}")
+
+        if response.status_code >= 400:
+            self._http._handle_error(response)
+        return _upload_response(response.json())
+
+    async def abort_upload(self, session: UploadSession) -> None:
+        """Discard a resumable upload. DELETE /storage/files/uploads/{upload_id}"""
+        await self._http.request(
+            "DELETE",
+            f"/storage/files/uploads/{session.upload_id}",
+            headers={"X-Upload-Token": session.upload_token},
         )
 
+    async def _send_chunk(
+        self,
+        session: UploadSession,
+        offset: int,
+        data: bytes,
+        max_retries: int,
+    ) -> None:
+        for attempt in range(max_retries + 1):
+            try:
+                await self.upload_chunk(session, offset, data)
+                return
+            except (APIConnectionError, InternalServerError):
+                if attempt == max_retries:
+                    raise
+                await asyncio.sleep(0.5 * 2 ** attempt)
+
+    async def upload_resumable(
+        self,
+        bucket_id: str,
+        filename: str,
+        source: UploadSource,
+        *,
+        path: Optional[str] = None,
+        content_type: Optional[str] = None,
+        chunk_size: Optional[int] = None,
+        concurrency: int = DEFAULT_UPLOAD_CONCURRENCY,
+        max_retries: int = 3,
+        session: Optional[UploadSession] = None,
+        on_progress: Optional[Callable[[int, int], None]] = None,
+    ) -> FileUploadResponse:
+        """
+        Upload a large file in chunks, several at a time, resuming where a
+        previous attempt stopped.
+
+        Args:
+            bucket_id: The bucket ID to upload to
+            filename: The name of the file
+            source: File content as bytes, a file path, or a seekable binary file object
+            path: Optional path within the bucket
+            content_type: Optional MIME type
+            chunk_size: Bytes per chunk (default: the server's suggestion, 8 MB)
+            concurrency: Chunks in flight at once; at most concurrency * chunk_size
+                bytes are held in memory
+            max_retries: Attempts per chunk after connection or server errors
+            session: A session from create_upload() to resume; chunks the server
+                already has are skipped
+            on_progress: Called with (bytes_done, total_bytes) after each chunk
+
+        Keep the session (create it with create_upload() first) to resume after
+        the process itself fails; within one call, failed chunks are retried.
+        """
+        reader = _ChunkReader(source)
+        if session is None:
+            session = await self.create_upload(
+                bucket_id,
+                filename,
+                reader.size,
+                path=path,
+                content_type=content_type,
+            )
+            received: List[List[int]] = []
+        else:
+            if session.size != reader.size:
+                raise ValueError(f"Source is {reader.size} bytes, the upload session expects {session.size}")
+            received = (await self.upload_status(session)).ranges
+
+        chunk_size = min(chunk_size or session.chunk_size, session.max_chunk_size)
+        offsets = [
+            offset for offset in range(0, session.size, chunk_size)
+            if not _is_received(offset, min(offset + chunk_size, session.size), received)
+        ]
+        done = session.size - sum(min(chunk_size, session.size - offset) for offset in offsets)
+        pending = iter(offsets)
+
+        async def worker() -> None:
+            nonlocal done
+            # The shared iterator hands each offset to exactly one worker
+            for offset in pending:
+                data = await reader.read(offset, min(chunk_size, session.size - offset))
+                await self._send_chunk(session, offset, data, max_retries)
+                done += len(data)
+                if on_progress is not None:
+                    on_progress(done, session.size)
+
+        tasks = [asyncio.ensure_future(worker()) for _ in range(max(1, min(concurrency, len(offsets))))]
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
+        return await self.complete_upload(session)
+
     async def list(
         self,
         *,
@@ -218,8 +457,13 @@ class FilesResource:
         search: Optional[str] = None,
         sort_by: Optional[str] = None,
         sort_order: Optional[str] = None,
+        count: Optional[str] = None,
     ) -> FileDataResponse:
-        """List files with optional filters. GET /storage/files/"""
+        """
+        List files with optional filters. GET /storage/files/
+
+        count: "exact" (default), "planned", "estimated" or "none".
+        """
         params = {
             "bucket_id": bucket_id,
             "page": page,
@@ -227,6 +471,7 @@ class FilesResource:
             "search": search,
             "sort_by": sort_by,
             "sort_order": sort_order,
+            "count": count,
         }
         response = await self._http.get(
             "/storage/files/",
@@ -238,6 +483,8 @@ class FilesResource:
             total=response.get("total", 0),
             page=response.get("page", 1),
             page_size=response.get("page_size", 100),
+            has_more=response.get("has_more", False),
+            count_strategy=response.get("count_strategy", "exact"),
         )
 
     async def get(self, file_id: str) -> FileResponse:
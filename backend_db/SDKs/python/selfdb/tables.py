@@ -1,7 +1,10 @@
 """SelfDB SDK Tables Module - Table management and data operations."""
 
+import json
 from dataclasses import asdict
-from typing import Any, Dict, List, Optional, TYPE_CHECKING
+from typing import Any, AsyncIterable, AsyncIterator, BinaryIO, Dict, Iterable, List, Optional, Union, TYPE_CHECKING
+
+import httpx
 
 from selfdb.http_client import HTTPClient
 from selfdb.models import (
@@ -9,14 +12,58 @@ from selfdb.models import (
     TableUpdate,
     TableRead,
     TableDataResponse,
+    BulkBatchResult,
+    BulkRowError,
+    BulkInsertResponse,
     TableDeleteResponse,
     RowDeleteResponse,
     ColumnDefinition,
     ColumnUpdate,
+    SearchIndexCreate,
+    SearchIndexRead,
     table_from_dict,
 )
 
 
+BULK_CHUNK_SIZE = 64 * 1024
+
+BulkSource = Union[
+    Iterable[Dict[str, Any]],
+    AsyncIterable[Dict[str, Any]],
+    bytes,
+    BinaryIO,
+    AsyncIterable[bytes],
+]
+
+
+async def _bulk_chunks(source: BulkSource, chunk_size: int) -> AsyncIterator[bytes]:
+    """Encode rows as NDJSON (or pass raw bytes through) in chunk_size pieces."""
+    if isinstance(source, bytes):
+        for start in range(0, len(source), chunk_size):
+            yield source[start:start + chunk_size]
+        return
+    if hasattr(source, "read"):
+        while chunk := source.read(chunk_size):
+            yield chunk
+        return
+
+    buffer = bytearray()
+    if hasattr(source, "__aiter__"):
+        async for item in source:
+            buffer += item if isinstance(item, bytes) else json.dumps(item, default=str).encode() + b"\n"
+            if len(buffer) >= chunk_size:
+                yield bytes(buffer)
+                buffer.clear()
+    else:
+        for item in source:
+            buffer += json.dumps(item, default=str).encode() + b"\n"
+            if len(buffer) >= chunk_size:
+                yield bytes(buffer)
+                buffer.clear()
+    if buffer:
+        yield bytes(buffer)
+
+
 class TableDataQueryBuilder:
     """
     Fluent query builder for table data queries.
@@ -33,6 +80,9 @@ class TableDataQueryBuilder:
         self._sort_order: Optional[str] = None
         self._page_num: int = 1
         self._page_size_val: int = 100
+        self._pagination: str = "page"
+        self._cursor_token: Optional[str] = None
+        self._count: Optional[str] = None
 
     def search(self, term: str) -> "TableDataQueryBuilder":
         """Filter: ILIKE search across text columns."""
@@ -42,6 +92,9 @@ class TableDataQueryBuilder:
         new_builder._sort_order = self._sort_order
         new_builder._page_num = self._page_num
         new_builder._page_size_val = self._page_size_val
+        new_builder._pagination = self._pagination
+        new_builder._cursor_token = self._cursor_token
+        new_builder._count = self._count
         return new_builder
 
     def sort(self, column: str, order: str = "desc") -> "TableDataQueryBuilder":
@@ -52,6 +105,9 @@ class TableDataQueryBuilder:
         new_builder._sort_order = order
         new_builder._page_num = self._page_num
         new_builder._page_size_val = self._page_size_val
+        new_builder._pagination = self._pagination
+        new_builder._cursor_token = self._cursor_token
+        new_builder._count = self._count
         return new_builder
 
     def page(self, page_num: int) -> "TableDataQueryBuilder":
@@ -62,6 +118,9 @@ class TableDataQueryBuilder:
         new_builder._sort_order = self._sort_order
         new_builder._page_num = page_num
         new_builder._page_size_val = self._page_size_val
+        new_builder._pagination = self._pagination
+        new_builder._cursor_token = self._cursor_token
+        new_builder._count = self._count
         return new_builder
 
     def page_size(self, size: int) -> "TableDataQueryBuilder":
@@ -72,6 +131,45 @@ class TableDataQueryBuilder:
         new_builder._sort_order = self._sort_order
         new_builder._page_num = self._page_num
         new_builder._page_size_val = size
+        new_builder._pagination = self._pagination
+        new_builder._cursor_token = self._cursor_token
+        new_builder._count = self._count
+        return new_builder
+
+    def cursor(self, token: Optional[str] = None) -> "TableDataQueryBuilder":
+        """
+        Use keyset (cursor) pagination.
+
+        Pass None for the first page, then the previous response's
+        next_cursor. next_cursor is None once the last page is reached.
+        The table needs a unique "id" column.
+        """
+        new_builder = TableDataQueryBuilder(self._http, self._table_id)
+        new_builder._search_term = self._search_term
+        new_builder._sort_by = self._sort_by
+        new_builder._sort_order = self._sort_order
+        new_builder._page_num = self._page_num
+        new_builder._page_size_val = self._page_size_val
+        new_builder._pagination = "cursor"
+        new_builder._cursor_token = token
+        new_builder._count = self._count
+        return new_builder
+
+    def count(self, strategy: str) -> "TableDataQueryBuilder":
+        """
+        How `total` is computed: "exact" (default), "planned", "estimated" or "none".
+
+        "none" skips counting entirely; use has_more on the response instead.
+        """
+        new_builder = TableDataQueryBuilder(self._http, self._table_id)
+        new_builder._search_term = self._search_term
+        new_builder._sort_by = self._sort_by
+        new_builder._sort_order = self._sort_order
+        new_builder._page_num = self._page_num
+        new_builder._page_size_val = self._page_size_val
+        new_builder._pagination = self._pagination
+        new_builder._cursor_token = self._cursor_token
+        new_builder._count = strategy
         return new_builder
 
     async def execute(self) -> TableDataResponse:
@@ -82,7 +180,11 @@ class TableDataQueryBuilder:
             "search": self._search_term,
             "sort_by": self._sort_by,
             "sort_order": self._sort_order,
+            "count": self._count,
         }
+        if self._pagination == "cursor":
+            params["pagination"] = "cursor"
+            params["cursor"] = self._cursor_token
         response = await self._http.get(
             f"/tables/{self._table_id}/data",
             params=params,
@@ -93,6 +195,9 @@ class TableDataQueryBuilder:
             total=response.get("total", 0),
             page=response.get("page", 1),
             page_size=response.get("page_size", 100),
+            has_more=response.get("has_more", False),
+            count_strategy=response.get("count_strategy", "exact"),
+            next_cursor=response.get("next_cursor"),
         )
 
 
@@ -115,10 +220,17 @@ class TableDataResource:
         search: Optional[str] = None,
         sort_by: Optional[str] = None,
         sort_order: Optional[str] = None,
+        pagination: Optional[str] = None,
+        cursor: Optional[str] = None,
+        count: Optional[str] = None,
     ) -> TableDataResponse:
         """
         Fetch paginated data from a table.
         GET /tables/{table_id}/data
+
+        pagination="cursor" (or passing cursor) switches to keyset pagination;
+        follow next_cursor on the response for the next page.
+        count: "exact" (default), "planned", "estimated" or "none".
         """
         params = {
             "page": page,
@@ -126,6 +238,9 @@ class TableDataResource:
             "search": search,
             "sort_by": sort_by,
             "sort_order": sort_order,
+            "pagination": pagination,
+            "cursor": cursor,
+            "count": count,
         }
         response = await self._http.get(
             f"/tables/{table_id}/data",
@@ -137,6 +252,9 @@ class TableDataResource:
             total=response.get("total", 0),
             page=response.get("page", 1),
             page_size=response.get("page_size", 100),
+            has_more=response.get("has_more", False),
+            count_strategy=response.get("count_strategy", "exact"),
+            next_cursor=response.get("next_cursor"),
         )
 
     async def insert(self, table_id: str, row_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -151,6 +269,101 @@ class TableDataResource:
         )
         return response
 
+    async def bulk_insert(
+        self,
+        table_id: str,
+        source: BulkSource,
+        *,
+        format: str = "ndjson",
+        batch_size: Optional[int] = None,
+        max_errors: Optional[int] = None,
+        chunk_size: int = BULK_CHUNK_SIZE,
+    ) -> BulkInsertResponse:
+        """
+        Stream rows into a table. POST /tables/{table_id}/data/bulk
+
+        Args:
+            table_id: The table ID
+            source: Rows as dicts (sync or async iterable, sent as NDJSON), or raw
+                NDJSON/CSV as bytes, a binary file object or an async iterable of bytes
+            format: "ndjson" or "csv" (CSV needs a header line)
+            batch_size: Rows per server-side COPY batch (default 5000)
+            max_errors: Rejected rows to skip before the load aborts (default 0)
+            chunk_size: Bytes per request body chunk
+
+        The body is sent as it is produced, so large imports never sit in memory.
+        """
+        params = {
+            "format": format,
+            "batch_size": batch_size,
+            "max_errors": max_errors,
+        }
+        params = {k: v for k, v in params.items() if v is not None}
+
+        client = await self._http._get_client()
+        headers = self._http._build_headers(authenticated=True)
+        headers["Content-Type"] = "text/csv" if format == "csv" else "application/x-ndjson"
+
+        try:
+            response = await client.post(
+                f"/tables/{table_id}/data/bulk",
+                params=params,
+                content=_bulk_chunks(source, chunk_size),
+                headers=headers,
+                # The server commits batches while the body streams; only the
+                # final batch runs after the upload completes
+                timeout=httpx.Timeout(self._http.timeout, read=None),
+            )
+        except httpx.RequestError as e:
+            from selfdb.exceptions import APIConnectionError
+            raise APIConnectionError(f"Bulk insert failed: {e}")
+
+        if response.status_code >= 400:
+            self._http._handle_error(response)
+
+        result = response.json()
+        return BulkInsertResponse(
+            status=result["status"],
+            inserted=result["inserted"],
+            failed=result["failed"],
+            batches=[BulkBatchResult(**b) for b in result.get("batches", [])],
+            errors=[BulkRowError(**e) for e in result.get("errors", [])],
+            duration_ms=result.get("duration_ms", 0.0),
+        )
+
+    async def export(
+        self,
+        table_id: str,
+        *,
+        format: str = "csv",
+    ) -> AsyncIterator[bytes]:
+        """
+        Stream every row of a table. GET /tables/{table_id}/export
+
+        Yields raw CSV (with header) or NDJSON bytes as they arrive:
+
+            async for chunk in selfdb.tables.data.export(table_id, format="ndjson"):
+                out.write(chunk)
+        """
+        client = await self._http._get_client()
+        headers = self._http._build_headers(authenticated=True)
+
+        try:
+            async with client.stream(
+                "GET",
+                f"/tables/{table_id}/export",
+                params={"format": format},
+                headers=headers,
+            ) as response:
+                if response.status_code >= 400:
+                    await response.aread()
+                    self._http._handle_error(response)
+                async for chunk in response.aiter_bytes():
+                    yield chunk
+        except httpx.RequestError as e:
+            from selfdb.exceptions import APIConnectionError
+            raise APIConnectionError(f"Export failed: {e}")
+
     async def update_row(
         self,
         table_id: str,
@@ -244,6 +457,42 @@ class TableColumnsResource:
         return table_from_dict(response)
 
 
+class TableSearchIndexResource:
+    """Table search index operations sub-resource."""
+
+    def __init__(self, http: HTTPClient):
+        self._http = http
+
+    async def get(self, table_id: str) -> SearchIndexRead:
+        """
+        Get the search index configuration of a table.
+        GET /tables/{table_id}/search-index
+        """
+        response = await self._http.get(f"/tables/{table_id}/search-index", authenticated=True)
+        return SearchIndexRead(**response)
+
+    async def create(self, table_id: str, index: SearchIndexCreate) -> SearchIndexRead:
+        """
+        Create (or replace) the search index of a table.
+        PUT /tables/{table_id}/search-index
+        """
+        data = {k: v for k, v in asdict(index).items() if v is not None}
+        response = await self._http.put(
+            f"/tables/{table_id}/search-index",
+            json=data,
+            authenticated=True,
+        )
+        return SearchIndexRead(**response)
+
+    async def remove(self, table_id: str) -> SearchIndexRead:
+        """
+        Drop the search index of a table - search falls back to ILIKE.
+        DELETE /tables/{table_id}/search-index
+        """
+        response = await self._http.delete(f"/tables/{table_id}/search-index", authenticated=True)
+        return SearchIndexRead(**response)
+
+
 class TablesClient:
     """Tables client for SelfDB."""
 
@@ -251,6 +500,7 @@ class TablesClient:
         self._http = http
         self.columns = TableColumnsResource(http)
         self.data = TableDataResource(http)
+        self.search_index = TableSearchIndexResource(http)
 
     async def count(self, search: Optional[str] = None) -> int:
         """Get total number of tables. GET /tables/count"""
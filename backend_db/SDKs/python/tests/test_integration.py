@@ -9,6 +9,8 @@ Or standalone: python tests/test_integration.py
 """
 
 import asyncio
+import hashlib
+import os
 import sys
 import uuid
 from typing import Optional
@@ -198,6 +200,33 @@ class IntegrationTest:
         except Exception as e:
             self.log_fail("Insert row into public table", str(e))
 
+        # Read public table with cursor pagination (should reach the inserted row)
+        try:
+            query = self.user_client.tables.data.query(self.public_table_id).page_size(1)
+            result = await query.cursor().execute()
+            seen = [row["id"] for row in result.data]
+            while result.next_cursor:
+                result = await query.cursor(result.next_cursor).execute()
+                seen.extend(row["id"] for row in result.data)
+            if row_id in seen and len(seen) == len(set(seen)):
+                self.log_pass("Cursor pagination over public table")
+            else:
+                self.log_fail("Cursor pagination over public table", f"Unexpected rows: {seen}")
+        except Exception as e:
+            self.log_fail("Cursor pagination over public table", str(e))
+
+        # Export public table as NDJSON (should contain the inserted row)
+        try:
+            exported = b""
+            async for chunk in self.user_client.tables.data.export(self.public_table_id, format="ndjson"):
+                exported += chunk
+            if row_id.encode() in exported:
+                self.log_pass("Export public table (NDJSON)")
+            else:
+                self.log_fail("Export public table (NDJSON)", "Inserted row missing from export")
+        except Exception as e:
+            self.log_fail("Export public table (NDJSON)", str(e))
+
         # Update row in public table (should fail with 403 - not owner)
         try:
             await self.user_client.tables.data.update_row(
@@ -288,6 +317,45 @@ class IntegrationTest:
         except Exception as e:
             self.log_fail("Insert row in own table", str(e))
 
+        # Bulk insert into own table (second row rejected, load continues)
+        try:
+            result = await self.user_client.tables.data.bulk_insert(
+                private_table_id,
+                [
+                    {"data": "bulk 1"},
+                    {"data": "bulk 2", "missing_column": 1},
+                    {"data": "bulk 3"},
+                ],
+                max_errors=1,
+            )
+            if result.status == "completed" and result.inserted == 2 and [e.row for e in result.errors] == [2]:
+                self.log_pass("Bulk insert rows in own table")
+            else:
+                self.log_fail("Bulk insert rows in own table", f"Unexpected result: {result}")
+        except Exception as e:
+            self.log_fail("Bulk insert rows in own table", str(e))
+
+        # Bulk insert CSV: a rejected row after a multi-line quoted field is the one reported
+        try:
+            csv_body = (
+                "id,data\n"
+                f'{uuid.uuid4()},"line one\nline two"\n'
+                "not-a-uuid,bad row\n"
+                f"{uuid.uuid4()},after\n"
+            ).encode()
+            result = await self.user_client.tables.data.bulk_insert(
+                private_table_id,
+                csv_body,
+                format="csv",
+                max_errors=1,
+            )
+            if result.status == "completed" and result.inserted == 2 and [e.row for e in result.errors] == [2]:
+                self.log_pass("Bulk insert CSV with multi-line field")
+            else:
+                self.log_fail("Bulk insert CSV with multi-line field", f"Unexpected result: {result}")
+        except Exception as e:
+            self.log_fail("Bulk insert CSV with multi-line field", str(e))
+
         # Update own row
         try:
             await self.user_client.tables.data.update_row(
@@ -345,6 +413,23 @@ class IntegrationTest:
         except Exception as e:
             self.log_fail("Upload file to own bucket", str(e))
 
+        # Resumable upload to own bucket (small chunks, several in flight)
+        try:
+            content = os.urandom(256 * 1024)
+            result = await self.user_client.storage.files.upload_resumable(
+                private_bucket_id,
+                filename="resumable_file.bin",
+                source=content,
+                chunk_size=64 * 1024,
+                concurrency=3,
+            )
+            if result.size == len(content) and result.checksum_sha256 == hashlib.sha256(content).hexdigest():
+                self.log_pass("Resumable upload to own bucket")
+            else:
+                self.log_fail("Resumable upload to own bucket", f"Unexpected result: {result}")
+        except Exception as e:
+            self.log_fail("Resumable upload to own bucket", str(e))
+
         # Delete own bucket
         try:
             await self.user_client.storage.buckets.delete(private_bucket_id)
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+API Key Middleware Benchmark (BaseHTTPMiddleware vs pure ASGI)
+
+Measures per-request latency of the API key middleware in-process, without a
+network or database in the way, so the only difference between the two runs is
+the middleware implementation itself.
+
+Two endpoints are exercised on each app:
+    - GET /system/status                      small JSON response
+    - GET /storage/files/download/bench/blob  streamed download (chunked body)
+
+Usage:
+    cd backend
+    uv run python benchmarks/middleware_benchmark.py
+    uv run python benchmarks/middleware_benchmark.py -n 5000 -c 50 --download-mb 16
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import httpx
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.responses import JSONResponse
+
+# Make backend modules importable when run from any directory
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from middleware import APIKeyMiddleware  # noqa: E402
+
+API_KEY = os.environ.get("API_KEY", "bench-api-key")
+CHUNK_SIZE = 256 * 1024
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Legacy middleware (the BaseHTTPMiddleware version it replaced, kept for comparison)
+# ─────────────────────────────────────────────────────────────────────────────
+
+class LegacyAPIKeyMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request, call_next):
+        current_path = request.url.path
+        if current_path.startswith("/webhooks/trigger/"):
+            return await call_next(request)
+
+        api_key = request.headers.get("X-API-Key")
+        if not api_key and current_path.startswith("/realtime/socket"):
+            api_key = request.query_params.get("X-API-Key")
+
+        if not api_key:
+            return JSONResponse(status_code=406, content={"detail": "Missing required header: X-API-Key"})
+        if api_key != API_KEY:
+            return JSONResponse(status_code=401, content={"detail": "Invalid API key"})
+
+        return await call_next(request)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Benchmark apps
+# ─────────────────────────────────────────────────────────────────────────────
+
+def build_app(use_asgi_middleware: bool, download_bytes: int) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/system/status")
+    async def system_status():
+        return {"initialized": True, "version": "1.0.0"}
+
+    @app.get("/storage/files/download/bench/blob")
+    async def download():
+        async def stream():
+            remaining = download_bytes
+            chunk = b"\0" * CHUNK_SIZE
+            while remaining > 0:
+                size = min(CHUNK_SIZE, remaining)
+                yield chunk[:size]
+                remaining -= size
+
+        return StreamingResponse(
+            stream(),
+            media_type="application/octet-stream",
+            headers={"Content-Length": str(download_bytes)},
+        )
+
+    if use_asgi_middleware:
+        app.add_middleware(APIKeyMiddleware, api_key=API_KEY)
+    else:
+        app.add_middleware(LegacyAPIKeyMiddleware)
+    return app
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Runner
+# ─────────────────────────────────────────────────────────────────────────────
+
+async def measure(app: FastAPI, path: str, requests: int, concurrency: int) -> list[float]:
+    """Issue `requests` GETs with `concurrency` in flight and return per-request latencies (ms)."""
+    transport = httpx.ASGITransport(app=app)
+    latencies: list[float] = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        # Warm-up so route compilation and first-call costs are excluded
+        for _ in range(min(50, requests)):
+            await client.get(path, headers={"X-API-Key": API_KEY})
+
+        async def one():
+            async with semaphore:
+                start = time.perf_counter()
+                response = await client.get(path, headers={"X-API-Key": API_KEY})
+                response.raise_for_status()
+                latencies.append((time.perf_counter() - start) * 1000)
+
+        await asyncio.gather(*(one() for _ in range(requests)))
+
+    return latencies
+
+
+def summarize(label: str, latencies: list[float]) -> dict:
+    ordered = sorted(latencies)
+    p99_index = max(0, int(len(ordered) * 0.99) - 1)
+    stats = {
+        "mean": statistics.fmean(ordered),
+        "p50": statistics.median(ordered),
+        "p99": ordered[p99_index],
+    }
+    print(f"  {label:<28} mean={stats['mean']:8.3f}ms  p50={stats['p50']:8.3f}ms  p99={stats['p99']:8.3f}ms")
+    return stats
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-n", "--requests", type=int, default=2000, help="Requests per endpoint (default: 2000)")
+    parser.add_argument("-c", "--concurrency", type=int, default=10, help="Concurrent requests (default: 10)")
+    parser.add_argument("--download-mb", type=int, default=4, help="Size of the streamed download in MB (default: 4)")
+    args = parser.parse_args()
+
+    download_bytes = args.download_mb * 1024 * 1024
+    download_requests = max(1, args.requests // 10)
+
+    print("=" * 70)
+    print("  API KEY MIDDLEWARE BENCHMARK")
+    print("=" * 70)
+    print(f"  Requests: {args.requests} (download: {download_requests})  Concurrency: {args.concurrency}")
+    print(f"  Download size: {args.download_mb} MB")
+
+    results = {}
+    for label, use_asgi in (("BaseHTTPMiddleware", False), ("Pure ASGI", True)):
+        app = build_app(use_asgi, download_bytes)
+        print(f"\n▶ {label}")
+        results[(label, "status")] = summarize(
+            "GET /system/status",
+            await measure(app, "/system/status", args.requests, args.concurrency),
+        )
+        results[(label, "download")] = summarize(
+            f"GET download ({args.download_mb} MB)",
+            await measure(app, "/storage/files/download/bench/blob", download_requests, args.concurrency),
+        )
+
+    print("\n" + "=" * 70)
+    print("  DELTA (pure ASGI vs BaseHTTPMiddleware)")
+    print("=" * 70)
+    for endpoint in ("status", "download"):
+        before = results[("BaseHTTPMiddleware", endpoint)]
+        after = results[("Pure ASGI", endpoint)]
+        for metric in ("p50", "p99"):
+            change = (after[metric] - before[metric]) / before[metric] * 100 if before[metric] else 0.0
+            print(f"  {endpoint:<10} {metric}: {before[metric]:8.3f}ms → {after[metric]:8.3f}ms ({change:+.1f}%)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+SQL Tokenizer Micro-Benchmark (legacy splitter vs utils/sql_tokenizer)
+
+Builds migration-style scripts of increasing size - CREATE TABLEs, INSERTs
+with quoted ';' and '' escapes, dollar-quoted function bodies - and times the
+per-request work POST /sql/query does on them:
+
+    - legacy   the old character-by-character split_sql_statements, run three
+               times (execution, CREATE TABLE and DROP TABLE detection) plus
+               the security regexes over the whole query
+    - single   utils.sql_tokenizer.split_statements once, then the security
+               checks and read-only classification on the resulting statements
+
+Both must find the same statements. The single-pass tokenizer has to scale
+linearly: time per MB at the largest size may be at most --max-growth times
+the time per MB at the smallest, otherwise the script exits non-zero.
+No database is needed.
+
+Usage:
+    cd backend
+    uv run python benchmarks/sql_tokenizer_benchmark.py
+    uv run python benchmarks/sql_tokenizer_benchmark.py --sizes-mb 1 5 10 --repeat 5
+"""
+
+import argparse
+import re
+import sys
+import time
+from pathlib import Path
+
+# Make backend modules importable when run from any directory
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from utils.sql_tokenizer import split_statements  # noqa: E402
+
+DANGEROUS_PATTERNS = [
+    r'\bpg_read_file\b',
+    r'\bpg_write_file\b',
+    r'\bpg_ls_dir\b',
+    r'\blo_import\b',
+    r'\blo_export\b',
+    r'\bcopy\s+.*\s+to\s+program\b',
+    r'\bcopy\s+.*\s+from\s+program\b',
+    r'\bexecute\s+format\b',
+    r';\s*--',
+]
+# Literal-prefiltered form used by endpoints/sql.validate_query_security
+DANGEROUS_LITERALS = ['pg_read_file', 'pg_write_file', 'pg_ls_dir', 'lo_import', 'lo_export', 'program', 'program', 'format', '--']
+DANGEROUS_REGEXES = [(literal, re.compile(pattern)) for literal, pattern in zip(DANGEROUS_LITERALS, DANGEROUS_PATTERNS)]
+PROTECTED_TABLES = {'system_config', 'sql_history', 'sql_snippets', 'pg_catalog', 'information_schema'}
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Legacy Implementation (endpoints/sql.py before the tokenizer)
+# ─────────────────────────────────────────────────────────────────────────────
+
+def legacy_split(query: str) -> list[str]:
+    statements = []
+    current = ""
+    in_string = False
+    string_char = None
+    i = 0
+
+    while i < len(query):
+        char = query[i]
+
+        if char == '$' and not in_string:
+            end_idx = query.find('$', i + 1)
+            if end_idx != -1:
+                dollar_tag = query[i:end_idx + 1]
+                current += dollar_tag
+                i = end_idx + 1
+                close_idx = query.find(dollar_tag, i)
+                if close_idx != -1:
+                    current += query[i:close_idx + len(dollar_tag)]
+                    i = close_idx + len(dollar_tag)
+                    continue
+
+        if char in ("'", '"') and not in_string:
+            in_string = True
+            string_char = char
+            current += char
+        elif char == string_char and in_string:
+            if i + 1 < len(query) and query[i + 1] == string_char:
+                current += char + string_char
+                i += 2
+                continue
+            in_string = False
+            string_char = None
+            current += char
+        elif char == ';' and not in_string:
+            stmt = current.strip()
+            if stmt:
+                statements.append(stmt)
+            current = ""
+        else:
+            current += char
+
+        i += 1
+
+    stmt = current.strip()
+    if stmt:
+        statements.append(stmt)
+
+    return statements
+
+
+def legacy_request(query: str) -> int:
+    query_lower = query.lower()
+    for pattern in DANGEROUS_PATTERNS:
+        re.search(pattern, query_lower, re.IGNORECASE)
+    re.search(r'\b(insert\s+into|update|delete\s+from|drop\s+table|truncate)\s+', query_lower)
+    query.strip().lower().startswith(('select', 'explain', 'show', 'describe', 'with'))
+
+    statements = legacy_split(query)
+    for stmt in legacy_split(query):
+        re.search(r'CREATE\s+TABLE', stmt, re.IGNORECASE)
+    for stmt in legacy_split(query):
+        re.search(r'DROP\s+TABLE\s+(?:IF\s+EXISTS\s+)?["\']?(\w+)["\']?', stmt, re.IGNORECASE)
+    return len(statements)
+
+
+def single_pass_request(query: str) -> int:
+    """Mirrors validate_query_security and is_read_only_query (the registry is synced by event triggers)."""
+    query_lower = query.lower()
+    for literal, pattern in DANGEROUS_REGEXES:
+        if literal in query_lower:
+            pattern.search(query_lower)
+    statements = split_statements(query)
+    for stmt in statements:
+        for name in (*stmt.written_tables(), *stmt.dropped_tables()):
+            any(part in PROTECTED_TABLES for part in name.split('.'))
+    all(stmt.is_read_only for stmt in statements)
+    return len(statements)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Fixture
+# ─────────────────────────────────────────────────────────────────────────────
+
+def build_script(size_bytes: int) -> str:
+    blocks = []
+    total = 0
+    n = 0
+    while total < size_bytes:
+        block = (
+            f"CREATE TABLE IF NOT EXISTS app_{n} (\n"
+            f"    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),\n"
+            f"    title VARCHAR(255) NOT NULL,\n"
+            f"    amount DECIMAL(10,2),\n"
+            f"    created_at TIMESTAMP WITH TIME ZONE DEFAULT now()\n"
+            f");\n"
+            f"INSERT INTO app_{n} (title, amount) VALUES "
+            + ", ".join(f"('row {n}.{k}; it''s \"quoted\"', {k}.50)" for k in range(20))
+            + ";\n"
+            f"CREATE OR REPLACE FUNCTION touch_{n}() RETURNS trigger AS $$\n"
+            f"BEGIN\n"
+            f"    NEW.created_at := now();\n"
+            f"    RETURN NEW;\n"
+            f"END;\n"
+            f"$$ LANGUAGE plpgsql;\n"
+            f"UPDATE app_{n} SET amount = amount * 2 WHERE title LIKE 'row%;%';\n"
+            f"DROP TABLE IF EXISTS old_app_{n};\n"
+        )
+        blocks.append(block)
+        total += len(block)
+        n += 1
+    return "".join(blocks)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Runner
+# ─────────────────────────────────────────────────────────────────────────────
+
+def best_of(fn, query: str, repeat: int) -> tuple[float, int]:
+    best = float("inf")
+    count = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        count = fn(query)
+        best = min(best, time.perf_counter() - start)
+    return best, count
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes-mb", type=float, nargs="+", default=[0.5, 1, 2, 5], help="Script sizes in MB (default: 0.5 1 2 5)")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per size, best time is reported (default: 3)")
+    parser.add_argument("--max-growth", type=float, default=2.0, help="Allowed growth of single-pass time per MB from smallest to largest size (default: 2.0)")
+    parser.add_argument("--skip-legacy", action="store_true", help="Only time the single-pass tokenizer")
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("  SQL TOKENIZER MICRO-BENCHMARK")
+    print("=" * 70)
+    print(f"  {'size':>8}  {'statements':>10}  {'legacy':>10}  {'single':>10}  {'single/MB':>10}  {'speedup':>8}")
+
+    failures = []
+    per_mb = []
+    for size_mb in sorted(args.sizes_mb):
+        query = build_script(int(size_mb * 1024 * 1024))
+        mb = len(query) / (1024 * 1024)
+
+        single_seconds, single_count = best_of(single_pass_request, query, args.repeat)
+        per_mb.append(single_seconds / mb)
+
+        if args.skip_legacy:
+            legacy_text, speedup = "-", "-"
+        else:
+            legacy_seconds, legacy_count = best_of(legacy_request, query, args.repeat)
+            legacy_text = f"{legacy_seconds * 1000:8.0f}ms"
+            speedup = f"{legacy_seconds / single_seconds:7.1f}x"
+            if legacy_count != single_count:
+                failures.append(f"{size_mb} MB: legacy found {legacy_count} statements, single-pass {single_count}")
+
+        print(
+            f"  {mb:6.1f}MB  {single_count:>10,}  {legacy_text:>10}  "
+            f"{single_seconds * 1000:8.0f}ms  {single_seconds / mb * 1000:8.1f}ms  {speedup:>8}"
+        )
+
+    growth = per_mb[-1] / per_mb[0]
+    print(f"\n  single-pass time per MB grew {growth:.2f}x from smallest to largest script")
+    if growth > args.max_growth:
+        failures.append(f"single-pass time per MB grew {growth:.2f}x (max {args.max_growth}x) - not linear")
+
+    if failures:
+        print("\nFailed:")
+        for failure in failures:
+            print(f"  - {failure}")
+        sys.exit(1)
+    print("\n✅ Single-pass tokenizer matched the legacy split and scaled linearly")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,8 @@
-from typing import AsyncGenerator
+from typing import Any, AsyncGenerator, Literal
 from pydantic_settings import BaseSettings, SettingsConfigDict
 import psycopg
 from psycopg.rows import dict_row
-from psycopg_pool import AsyncNullConnectionPool
+from psycopg_pool import AsyncConnectionPool, AsyncNullConnectionPool
 
 # ─────────────────────────────────────────────────────────────────────────────
 # Configuration
@@ -13,6 +13,51 @@ class Settings(BaseSettings):
     # In Docker: uses pgbouncer service name; Local dev: uses localhost
     DATABASE_URL: str  # Required - passed via docker-compose environment
     
+    # Client-side pool mode
+    # - "null": open/close a PgBouncer connection per request (default)
+    # - "pool": keep persistent connections to PgBouncer per worker
+    DB_POOL_MODE: Literal["null", "pool"] = "null"
+    DB_POOL_MIN_SIZE: int = 2  # Only used in "pool" mode
+    DB_POOL_MAX_SIZE: int = 100  # Per worker, applies to both modes
+    DB_POOL_MAX_IDLE: float = 300.0  # Seconds before an idle connection above min_size is closed
+    DB_POOL_MAX_LIFETIME: float = 1800.0  # Seconds before a connection is recycled
+    DB_POOL_TIMEOUT: float = 30.0  # Seconds a request waits for a free connection
+    DB_POOL_CHECK: bool = True  # Health-check connections when they are handed out
+    
+    # In-process metadata caches (services/cache_service.py), 0 disables
+    USER_CACHE_MAX_SIZE: int = 10000
+    USER_CACHE_TTL_SECONDS: float = 60.0
+    TABLE_CACHE_MAX_SIZE: int = 1000
+    TABLE_CACHE_TTL_SECONDS: float = 300.0
+    
+    # tables.row_count folding (services/row_count_service.py)
+    ROW_COUNT_FOLD_INTERVAL_SECONDS: float = 2.0  # How stale row_count may get
+    ROW_COUNT_FOLD_BATCH_SIZE: int = 10000  # Deltas folded per transaction
+    
+    # Result caps for read-only SQL queries (endpoints/sql.py)
+    SQL_MAX_ROWS: int = 10000  # POST /sql/query (buffered JSON)
+    SQL_MAX_RESULT_BYTES: int = 32 * 1024 * 1024
+    SQL_STREAM_MAX_ROWS: int = 1_000_000  # POST /sql/query/stream (NDJSON)
+    SQL_STREAM_MAX_RESULT_BYTES: int = 1024 * 1024 * 1024
+    
+    # Async SQL jobs (POST /sql/jobs)
+    SQL_JOB_MAX_CONCURRENT: int = 4  # Jobs running at once per worker, the rest queue
+    SQL_JOB_MAX_ROWS: int = 1_000_000  # Result rows stored per job
+    SQL_JOB_MAX_RESULT_BYTES: int = 256 * 1024 * 1024
+    SQL_JOB_RESULT_TTL_SECONDS: int = 86400  # How long finished jobs and results are kept
+    
+    # Buffered sql_history writes (services/sql_history_service.py)
+    SQL_HISTORY_BATCH_SIZE: int = 500  # Records written per COPY
+    SQL_HISTORY_FLUSH_INTERVAL_MS: int = 500  # Longest a record waits in the queue
+    SQL_HISTORY_QUEUE_MAX_SIZE: int = 10000  # Per worker; records beyond this are dropped
+    SQL_HISTORY_RETENTION_DAYS: int = 30  # 0 keeps history forever
+    SQL_HISTORY_PURGE_INTERVAL_SECONDS: float = 3600.0
+    
+    # Resumable uploads (POST /storage/files/uploads)
+    UPLOAD_SESSION_TTL_SECONDS: int = 86400  # Unfinished sessions are discarded after this
+    UPLOAD_CHUNK_SIZE: int = 8 * 1024 * 1024  # Suggested to clients
+    UPLOAD_MAX_CHUNK_SIZE: int = 64 * 1024 * 1024  # Larger chunk PUTs are rejected
+    
     # Backup configuration - passed via docker-compose environment
     BACKUP_RETENTION_DAYS: int
     BACKUP_SCHEDULE_CRON: str
@@ -35,35 +80,67 @@ settings = Settings()
 # Database Connection
 # ─────────────────────────────────────────────────────────────────────────────
 
-# Global pool variable - using NullConnectionPool for PgBouncer compatibility
-# NullConnectionPool creates connections on-demand and closes them immediately after use
-# This delegates all connection pooling to PgBouncer, avoiding double-pooling issues
-pool: AsyncNullConnectionPool | None = None
+# Global pool variable
+# - AsyncNullConnectionPool ("null" mode) creates connections on-demand and closes them
+#   immediately after use, delegating all connection pooling to PgBouncer
+# - AsyncConnectionPool ("pool" mode) keeps connections to PgBouncer open across requests,
+#   skipping the TCP + auth handshake on every request
+pool: AsyncConnectionPool | AsyncNullConnectionPool | None = None
+
+
+def _connection_kwargs() -> dict[str, Any]:
+    """Connection defaults shared by both pool modes."""
+    return {
+        "row_factory": dict_row,  # Return rows as dicts for easier access
+        "autocommit": False,
+        # Never create server-side prepared statements: a persistent connection can be
+        # handed a different backend by PgBouncer on every transaction
+        "prepare_threshold": None,
+    }
 
 
 async def init_db() -> None:
     """Initialize the database connection.
     
-    Using AsyncNullConnectionPool with PgBouncer:
+    Using AsyncNullConnectionPool with PgBouncer (DB_POOL_MODE=null, default):
     - No internal pooling - PgBouncer handles all connection management
     - Compatible with PgBouncer's transaction pooling mode
     - max_size limits concurrent connections to prevent overwhelming PgBouncer
-    - No prepared statement issues (psycopg3 doesn't use server-side prepared statements by default)
+    
+    Using AsyncConnectionPool with PgBouncer (DB_POOL_MODE=pool):
+    - Keeps DB_POOL_MIN_SIZE..DB_POOL_MAX_SIZE client connections open per worker
+    - Idle connections above min_size close after DB_POOL_MAX_IDLE seconds
+    - Connections are recycled after DB_POOL_MAX_LIFETIME seconds
+    - Connections are health-checked before use (DB_POOL_CHECK) so a PgBouncer
+      restart or a database restore doesn't hand out dead connections
+    - Still transaction-pooling safe: every request ends its transaction before the
+      connection is returned, session state is only set with is_local=TRUE, and
+      prepared statements are disabled
     
     Note: Table creation, indexes, and seeding are handled by PostgreSQL's
     /docker-entrypoint-initdb.d/ scripts. This function only sets up the connection.
     """
     global pool
-    pool = AsyncNullConnectionPool(
-        conninfo=settings.DATABASE_URL,
-        open=False,  # Don't open on creation, we'll open explicitly
-        max_size=100,  # Limit concurrent connections
-        # Configure connection defaults
-        kwargs={
-            "row_factory": dict_row,  # Return rows as dicts for easier access
-            "autocommit": False,
-        }
-    )
+    if settings.DB_POOL_MODE == "pool":
+        pool = AsyncConnectionPool(
+            conninfo=settings.DATABASE_URL,
+            open=False,  # Don't open on creation, we'll open explicitly
+            min_size=settings.DB_POOL_MIN_SIZE,
+            max_size=settings.DB_POOL_MAX_SIZE,
+            max_idle=settings.DB_POOL_MAX_IDLE,
+            max_lifetime=settings.DB_POOL_MAX_LIFETIME,
+            timeout=settings.DB_POOL_TIMEOUT,
+            check=AsyncConnectionPool.check_connection if settings.DB_POOL_CHECK else None,
+            kwargs=_connection_kwargs(),
+        )
+    else:
+        pool = AsyncNullConnectionPool(
+            conninfo=settings.DATABASE_URL,
+            open=False,  # Don't open on creation, we'll open explicitly
+            max_size=settings.DB_POOL_MAX_SIZE,  # Limit concurrent connections
+            timeout=settings.DB_POOL_TIMEOUT,
+            kwargs=_connection_kwargs(),
+        )
     await pool.open()
     
     # Verify database is initialized by checking if system_config table exists
@@ -98,6 +175,31 @@ async def get_db() -> AsyncGenerator[psycopg.AsyncConnection, None]:
         yield conn
 
 
+def get_pool_stats() -> dict[str, Any]:
+    """
+    Snapshot of the pool gauges for this worker, for tuning pool sizes.
+    
+    Returns the raw psycopg_pool counters plus derived values:
+    - connections_in_use: connections currently handed out to requests
+    - avg_wait_ms: mean time a request waited for a connection since startup
+    """
+    if pool is None:
+        raise RuntimeError("Database pool is not initialized")
+    
+    stats = pool.get_stats()
+    pool_size = stats.get("pool_size", 0)
+    pool_available = stats.get("pool_available", 0)
+    requests_num = stats.get("requests_num", 0)
+    requests_wait_ms = stats.get("requests_wait_ms", 0)
+    
+    return {
+        "mode": settings.DB_POOL_MODE,
+        "connections_in_use": max(pool_size - pool_available, 0),
+        "avg_wait_ms": (requests_wait_ms / requests_num) if requests_num else 0.0,
+        **stats,
+    }
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # RLS Helper Functions
 # ─────────────────────────────────────────────────────────────────────────────
@@ -135,3 +237,15 @@ async def set_jwt_claims(conn: psycopg.AsyncConnection, user_id: str | None, rol
         await conn.execute(
             "SELECT set_config('request.jwt.claims.role', '', TRUE)"
         )
+
+
+async def disable_registry_sync(conn: psycopg.AsyncConnection) -> None:
+    """
+    Turn off the DDL event triggers that sync the tables registry, for the
+    current transaction only.
+    
+    Used by the /tables endpoints, which write their own registry rows (with
+    the requested schema, visibility and owner) in the same transaction as
+    the DDL. See database/init/09_table_registry_sync.sql.
+    """
+    await conn.execute("SELECT set_config('selfdb.registry_sync', 'off', TRUE)")
@@ -4,13 +4,16 @@
 from uuid import UUID
 import uuid
 import re
-from typing import List, Annotated, Optional, Literal, Dict, Any
+from typing import List, Annotated, Optional, Literal, Dict, Any, Awaitable, Callable
 from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+import httpx
 import psycopg
 from psycopg import sql
 from psycopg.types.json import Json
 from fastapi import APIRouter, Depends, HTTPException, Query, Request, UploadFile, File, Form, Path, status
-from fastapi.responses import StreamingResponse
+from fastapi.responses import Response, StreamingResponse
+from starlette.background import BackgroundTask
 from pydantic import BaseModel
 
 from models.file import FileResponse, FileListResponse, FileUploadResponse, FileInDB
@@ -19,6 +22,7 @@ from db import get_db
 from security import get_current_active_user, get_optional_current_user
 from models.user import UserInDB
 from utils.validation import validate_search_term, SEARCH_TERM_REGEX
+from utils.counting import CountStrategy, COUNT_STRATEGY_DESCRIPTION, count_rows
 import storage_client
 
 router = APIRouter(prefix="/storage/files", tags=["storage-files"])
@@ -35,9 +39,11 @@ class ErrorResponse(BaseModel):
 class FileDataResponse(BaseModel):
     """Response model for file listing with metadata."""
     files: List[FileResponse]
-    total: int
+    total: Optional[int]  # None when count=none
     page: int
     page_size: int
+    has_more: bool = False
+    count_strategy: CountStrategy = "exact"  # Strategy that actually produced total
 
 
 RESP_ERRORS = {
@@ -102,7 +108,7 @@ async def get_file_from_db(
     db: psycopg.AsyncConnection
 ) -> FileInDB:
     """Get file from database by ID."""
-    result = await db.execute("SELECT * FROM files WHERE id = %s", (file_id,))
+    result = await db.execute("SELECT * FROM files WHERE id = %s /* selfdb:files.get_file_from_db */", (file_id,))
     record = await result.fetchone()
     if not record:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="File not found")
@@ -145,7 +151,7 @@ async def find_next_available_filename(
     """
     # Check if file exists
     result = await db.execute(
-        "SELECT id FROM files WHERE bucket_id = %s AND path = %s AND is_latest = TRUE AND deleted_at IS NULL",
+        "SELECT id FROM files WHERE bucket_id = %s AND path = %s AND is_latest = TRUE AND deleted_at IS NULL /* selfdb:files.find_next_available_filename */",
         (bucket_id, original_path)
     )
     if not await result.fetchone():
@@ -168,7 +174,7 @@ async def find_next_available_filename(
     # Get files in same directory with similar names
     pattern = f"{directory}{base_name}%{ext}"
     result = await db.execute(
-        "SELECT path FROM files WHERE bucket_id = %s AND path LIKE %s AND is_latest = TRUE AND deleted_at IS NULL",
+        "SELECT path FROM files WHERE bucket_id = %s AND path LIKE %s AND is_latest = TRUE AND deleted_at IS NULL /* selfdb:files.find_next_available_filename */",
         (bucket_id, pattern)
     )
     existing_files = [row['path'] for row in await result.fetchall()]
@@ -192,6 +198,84 @@ async def find_next_available_filename(
     return f"{directory}{base_name} ({next_num}){ext}"
 
 
+async def record_uploaded_file(
+    db: psycopg.AsyncConnection,
+    bucket: BucketInDB,
+    *,
+    file_id: UUID,
+    target_path: str,
+    initial_path: str,
+    content_type: str,
+    owner_id: UUID | None,
+    storage_result: Dict[str, Any],
+    upload_time: float,
+    publish: Callable[[], Awaitable[Any]] | None = None
+) -> FileUploadResponse:
+    """
+    Insert the files row for a blob the storage service has just written,
+    update the bucket stats and commit. Shared by single-request and
+    resumable uploads.
+
+    `publish`, if given, runs after the insert and before the commit: the
+    uncommitted row holds target_path in idx_files_unique_path meanwhile, so a
+    concurrent upload to the same path waits and then fails with UniqueViolation.
+    """
+    now = datetime.now(timezone.utc)
+    file_size = storage_result.get('file', {}).get('size', 0)
+    checksum = storage_result.get('file', {}).get('checksum_sha256')
+
+    await db.execute(
+        """
+        INSERT INTO files (id, bucket_id, name, path, size, mime_type, owner_id, metadata, checksum_sha256, version, is_latest, created_at, updated_at)
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+        /* selfdb:files.record_uploaded_file */
+        """,
+        (
+            file_id,
+            bucket.id,
+            target_path.split('/')[-1],  # Extract filename from path
+            target_path,
+            file_size,
+            content_type,
+            owner_id,
+            Json({}),
+            checksum,
+            1,
+            True,
+            now,
+            now
+        )
+    )
+
+    await db.execute(
+        "UPDATE buckets SET file_count = file_count + 1, total_size = total_size + %s, updated_at = %s WHERE id = %s /* selfdb:files.record_uploaded_file */",
+        (file_size, now, bucket.id)
+    )
+    if publish is not None:
+        await publish()
+    await db.commit()
+
+    response = FileUploadResponse(
+        success=True,
+        bucket=bucket.name,
+        path=target_path,
+        size=file_size,
+        file_id=file_id,
+        checksum_sha256=checksum,
+        upload_time=upload_time,
+        url=f"/api/storage/files/{bucket.name}/{target_path}"
+    )
+
+    # Include original path if file was auto-renamed
+    if target_path != initial_path:
+        response.original_path = initial_path
+        response.message = f"File uploaded successfully (renamed from '{initial_path}' to avoid overwrite)"
+    else:
+        response.message = "File uploaded successfully"
+
+    return response
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # STORAGE STATS ENDPOINT (Total files and storage across all buckets)
 # ─────────────────────────────────────────────────────────────────────────────
@@ -235,7 +319,7 @@ async def get_storage_stats(
                     COALESCE(SUM(total_size), 0) as total_size,
                     COUNT(*) as bucket_count
                 FROM buckets 
-                WHERE public = TRUE AND (name ILIKE %s OR description ILIKE %s)""",
+                WHERE public = TRUE AND (name ILIKE %s OR description ILIKE %s) /* selfdb:files.get_storage_stats */""",
                 (search_pattern, search_pattern)
             )
         else:
@@ -245,7 +329,7 @@ async def get_storage_stats(
                     COALESCE(SUM(total_size), 0) as total_size,
                     COUNT(*) as bucket_count
                 FROM buckets 
-                WHERE public = TRUE"""
+                WHERE public = TRUE /* selfdb:files.get_storage_stats */"""
             )
     else:
         # Authenticated users see ALL buckets
@@ -256,7 +340,7 @@ async def get_storage_stats(
                     COALESCE(SUM(total_size), 0) as total_size,
                     COUNT(*) as bucket_count
                 FROM buckets 
-                WHERE (name ILIKE %s OR description ILIKE %s)""",
+                WHERE (name ILIKE %s OR description ILIKE %s) /* selfdb:files.get_storage_stats */""",
                 (search_pattern, search_pattern)
             )
         else:
@@ -265,7 +349,7 @@ async def get_storage_stats(
                     COALESCE(SUM(file_count), 0) as total_files,
                     COALESCE(SUM(total_size), 0) as total_size,
                     COUNT(*) as bucket_count
-                FROM buckets"""
+                FROM buckets /* selfdb:files.get_storage_stats */"""
             )
 
     row = await result.fetchone()
@@ -309,7 +393,7 @@ async def get_total_file_count(
                    JOIN buckets b ON f.bucket_id = b.id
                    WHERE b.public = TRUE 
                    AND f.is_latest = TRUE AND f.deleted_at IS NULL
-                   AND (f.name ILIKE %s OR f.path ILIKE %s)""",
+                   AND (f.name ILIKE %s OR f.path ILIKE %s) /* selfdb:files.get_total_file_count */""",
                 (search_pattern, search_pattern)
             )
         else:
@@ -317,7 +401,7 @@ async def get_total_file_count(
                 """SELECT COUNT(*) FROM files f
                    JOIN buckets b ON f.bucket_id = b.id
                    WHERE b.public = TRUE 
-                   AND f.is_latest = TRUE AND f.deleted_at IS NULL"""
+                   AND f.is_latest = TRUE AND f.deleted_at IS NULL /* selfdb:files.get_total_file_count */"""
             )
     else:
         # Authenticated users - files in ALL buckets
@@ -325,13 +409,13 @@ async def get_total_file_count(
             result = await db.execute(
                 """SELECT COUNT(*) FROM files f
                    WHERE f.is_latest = TRUE AND f.deleted_at IS NULL
-                   AND (f.name ILIKE %s OR f.path ILIKE %s)""",
+                   AND (f.name ILIKE %s OR f.path ILIKE %s) /* selfdb:files.get_total_file_count */""",
                 (search_pattern, search_pattern)
             )
         else:
             result = await db.execute(
                 """SELECT COUNT(*) FROM files f
-                   WHERE f.is_latest = TRUE AND f.deleted_at IS NULL"""
+                   WHERE f.is_latest = TRUE AND f.deleted_at IS NULL /* selfdb:files.get_total_file_count */"""
             )
 
     row = await result.fetchone()
@@ -366,12 +450,12 @@ async def get_file_count(
         result = await db.execute(
             """SELECT COUNT(*) FROM files 
                WHERE bucket_id = %s AND is_latest = TRUE AND deleted_at IS NULL 
-               AND (name ILIKE %s OR path ILIKE %s)""",
+               AND (name ILIKE %s OR path ILIKE %s) /* selfdb:files.get_file_count */""",
             (bucket_id, search_pattern, search_pattern)
         )
     else:
         result = await db.execute(
-            "SELECT COUNT(*) FROM files WHERE bucket_id = %s AND is_latest = TRUE AND deleted_at IS NULL",
+            "SELECT COUNT(*) FROM files WHERE bucket_id = %s AND is_latest = TRUE AND deleted_at IS NULL /* selfdb:files.get_file_count */",
             (bucket_id,)
         )
 
@@ -432,7 +516,6 @@ async def upload_file(
     # Find next available filename (macOS-style auto-increment)
     target_path = await find_next_available_filename(bucket_id, initial_path, db)
     file_id = uuid.uuid4()
-    now = datetime.now(timezone.utc)
     
     # Get content length from header if available
     content_length = request.headers.get("content-length")
@@ -458,56 +541,20 @@ async def upload_file(
         )
         
         upload_time = time.time() - start_time
-        file_size = storage_result.get('file', {}).get('size', 0)
-
-        # 2. Insert metadata into database
-        await db.execute(
-            """
-            INSERT INTO files (id, bucket_id, name, path, size, mime_type, owner_id, metadata, version, is_latest, created_at, updated_at)
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-            """,
-            (
-                file_id,
-                bucket_id,
-                target_path.split('/')[-1],  # Extract filename from path
-                target_path,
-                file_size,
-                content_type,
-                current_user.id if current_user else None,
-                Json({}),
-                1,
-                True,
-                now,
-                now
-            )
-        )
-
-        # 3. Update bucket stats
-        await db.execute(
-            "UPDATE buckets SET file_count = file_count + 1, total_size = total_size + %s, updated_at = %s WHERE id = %s",
-            (file_size, now, bucket_id)
-        )
-        await db.commit()
 
-        response = FileUploadResponse(
-            success=True,
-            bucket=bucket.name,
-            path=target_path,
-            size=file_size,
+        # 2. Insert metadata and update bucket stats
+        return await record_uploaded_file(
+            db,
+            bucket,
             file_id=file_id,
-            upload_time=upload_time,
-            url=f"/api/storage/files/{bucket.name}/{target_path}"
+            target_path=target_path,
+            initial_path=initial_path,
+            content_type=content_type,
+            owner_id=current_user.id if current_user else None,
+            storage_result=storage_result,
+            upload_time=upload_time
         )
 
-        # Include original path if file was auto-renamed
-        if target_path != initial_path:
-            response.original_path = initial_path
-            response.message = f"File uploaded successfully (renamed from '{initial_path}' to avoid overwrite)"
-        else:
-            response.message = "File uploaded successfully"
-
-        return response
-
     except Exception as e:
         await db.rollback()
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
@@ -516,7 +563,7 @@ async def upload_file(
 @router.get(
     "/",
     response_model=FileDataResponse,
-    dependencies=[Depends(strict_query_params({"bucket_id", "page", "page_size", "search", "sort_by", "sort_order"}))],
+    dependencies=[Depends(strict_query_params({"bucket_id", "page", "page_size", "search", "sort_by", "sort_order", "count"}))],
     responses=RESP_ERRORS,
     summary="List Files"
 )
@@ -527,6 +574,7 @@ async def list_files(
     search: Annotated[str | None, Query(max_length=100, pattern=SEARCH_TERM_REGEX)] = None,
     sort_by: Annotated[Literal["created_at", "updated_at", "name", "size"], Query()] = "created_at",
     sort_order: Annotated[Literal["asc", "desc"], Query()] = "desc",
+    count: Annotated[CountStrategy, Query(description=COUNT_STRATEGY_DESCRIPTION)] = "exact",
     db: psycopg.AsyncConnection = Depends(get_db),
     current_user: UserInDB | None = Depends(get_optional_current_user)
 ):
@@ -535,6 +583,8 @@ async def list_files(
     
     - Public buckets: Accessible to anyone
     - Private buckets: Owner or admin only
+    - **count**: exact (default), planned, estimated (the bucket's file_count
+      counter when not searching) or none - see count_strategy in the response
     """
     bucket = await get_bucket_from_db(bucket_id, db)
     await check_bucket_access(bucket, current_user)
@@ -548,20 +598,25 @@ async def list_files(
 
     try:
         # Count query
-        if search:
-            count_result = await db.execute(
-                """SELECT COUNT(*) FROM files 
+        if count == "estimated" and not search:
+            # Maintained by upload/delete - no scan needed
+            total, count_strategy = bucket.file_count, "estimated"
+        elif search:
+            total, count_strategy = await count_rows(
+                db,
+                """FROM files 
                    WHERE bucket_id = %s AND is_latest = TRUE AND deleted_at IS NULL 
                    AND (name ILIKE %s OR path ILIKE %s)""",
-                (bucket_id, search_pattern, search_pattern)
+                (bucket_id, search_pattern, search_pattern),
+                count
             )
         else:
-            count_result = await db.execute(
-                "SELECT COUNT(*) FROM files WHERE bucket_id = %s AND is_latest = TRUE AND deleted_at IS NULL",
-                (bucket_id,)
+            total, count_strategy = await count_rows(
+                db,
+                "FROM files WHERE bucket_id = %s AND is_latest = TRUE AND deleted_at IS NULL",
+                (bucket_id,),
+                count
             )
-        count_row = await count_result.fetchone()
-        total = count_row['count'] if count_row else 0
 
         # Data query
         if search:
@@ -570,24 +625,29 @@ async def list_files(
                 WHERE bucket_id = %s AND is_latest = TRUE AND deleted_at IS NULL 
                 AND (name ILIKE %s OR path ILIKE %s)
                 {} LIMIT %s OFFSET %s
+                /* selfdb:files.list_files */
             """).format(order_by)
-            result = await db.execute(query, (bucket_id, search_pattern, search_pattern, page_size, offset))
+            result = await db.execute(query, (bucket_id, search_pattern, search_pattern, page_size + 1, offset))
         else:
             query = sql.SQL("""
                 SELECT * FROM files 
                 WHERE bucket_id = %s AND is_latest = TRUE AND deleted_at IS NULL
                 {} LIMIT %s OFFSET %s
+                /* selfdb:files.list_files */
             """).format(order_by)
-            result = await db.execute(query, (bucket_id, page_size, offset))
+            result = await db.execute(query, (bucket_id, page_size + 1, offset))
 
+        # One extra row was fetched to detect a next page
         records = await result.fetchall()
-        files = [FileResponse(**record) for record in records]
+        files = [FileResponse(**record) for record in records[:page_size]]
 
         return FileDataResponse(
             files=files,
             total=total,
             page=page,
-            page_size=page_size
+            page_size=page_size,
+            has_more=len(records) > page_size,
+            count_strategy=count_strategy
         )
 
     except psycopg.errors.DataError:
@@ -628,18 +688,75 @@ async def get_file_metadata(
     )
 
 
-@router.get(
+# Storage response headers passed through to the client
+DOWNLOAD_PASSTHROUGH_HEADERS = ("content-length", "content-range")
+
+
+def file_validators(file_record: Dict[str, Any]) -> tuple[str | None, str]:
+    """
+    (ETag, Last-Modified) of a file version. The ETag is the content SHA-256,
+    a strong validator; files uploaded before checksums were stored have none.
+    """
+    etag = f'"{file_record["checksum_sha256"]}"' if file_record.get("checksum_sha256") else None
+    return etag, format_datetime(file_record["updated_at"].astimezone(timezone.utc), usegmt=True)
+
+
+def etag_matches(header: str, etag: str | None) -> bool:
+    """If-None-Match comparison (weak: W/ prefixes are ignored)."""
+    if etag is None:
+        return False
+    if header.strip() == "*":
+        return True
+    return etag in (tag.strip().removeprefix("W/") for tag in header.split(","))
+
+
+def is_not_modified(request: Request, etag: str | None, updated_at: datetime) -> bool:
+    """
+    RFC 9110 §13.2.2: If-None-Match decides when present, otherwise
+    If-Modified-Since against the row's updated_at (HTTP dates have 1 s resolution).
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return etag_matches(if_none_match, etag)
+    if_modified_since = request.headers.get("if-modified-since")
+    if not if_modified_since:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        return False
+    return updated_at.replace(microsecond=0) <= since
+
+
+def if_range_allows(if_range: str | None, etag: str | None, last_modified: str) -> bool:
+    """If-Range: an ETag must match strongly, a date exactly."""
+    if if_range is None:
+        return True
+    if_range = if_range.strip()
+    if if_range.startswith(("W/", '"')):
+        return etag is not None and if_range == etag
+    return if_range == last_modified
+
+
+@router.api_route(
     "/download/{bucket_name}/{path:path}",
+    methods=["GET", "HEAD"],
     responses={
         200: {
             "description": "File content",
             "content": {"*/*": {"schema": {"type": "string", "format": "binary"}}}
         },
+        206: {"description": "Partial content (one range, or multipart/byteranges for several)"},
+        304: {"description": "Not modified (If-None-Match / If-Modified-Since)"},
+        416: {"model": ErrorResponse, "description": "Range Not Satisfiable"},
         **RESP_ERRORS
     },
     summary="Download File"
 )
 async def download_file(
+    request: Request,
     bucket_name: Annotated[str, Path(min_length=3, max_length=63, pattern=r'^[a-z0-9][a-z0-9\-]{1,61}[a-z0-9]$')],
     path: str,
     db: psycopg.AsyncConnection = Depends(get_db),
@@ -650,6 +767,14 @@ async def download_file(
     
     - Public buckets: Accessible to anyone
     - Private buckets: Owner or admin only
+    
+    `Range` is forwarded to the storage service and its 206 (or 416) is
+    passed through, so only the requested bytes cross both hops. HEAD returns
+    the headers without a body.
+    
+    ETag (content SHA-256) and Last-Modified come from the files row, so
+    If-None-Match / If-Modified-Since are answered with 304 and If-Range is
+    evaluated here, without a request to the storage service.
     """
     bucket = await get_bucket_by_name(bucket_name, db)
     if not bucket:
@@ -659,33 +784,69 @@ async def download_file(
 
     # Verify file exists in database
     result = await db.execute(
-        "SELECT * FROM files WHERE bucket_id = %s AND path = %s AND is_latest = TRUE AND deleted_at IS NULL",
+        "SELECT * FROM files WHERE bucket_id = %s AND path = %s AND is_latest = TRUE AND deleted_at IS NULL /* selfdb:files.download_file */",
         (bucket.id, path)
     )
     file_record = await result.fetchone()
     if not file_record:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="File not found")
 
-    try:
-        # Stream from storage service
-        response = await storage_client.download_file(bucket_name, path)
-        filename = path.split('/')[-1]
+    filename = path.split('/')[-1]
+    etag, last_modified = file_validators(file_record)
+    headers = {
+        "Content-Disposition": f'attachment; filename="{filename}"',
+        "Accept-Ranges": "bytes",
+        "Last-Modified": last_modified,
+    }
+    if etag:
+        headers["ETag"] = etag
 
-        async def stream_content():
-            async for chunk in response.aiter_bytes():
-                yield chunk
+    if is_not_modified(request, etag, file_record["updated_at"]):
+        headers.pop("Content-Disposition")
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
 
-        return StreamingResponse(
-            stream_content(),
-            media_type=file_record['mime_type'],
-            headers={
-                "Content-Disposition": f'attachment; filename="{filename}"',
-                "Content-Length": str(file_record['size'])
-            }
-        )
+    range_header = request.headers.get("range")
+    if not if_range_allows(request.headers.get("if-range"), etag, last_modified):
+        range_header = None
 
-    except Exception as e:
+    try:
+        # Stream from storage service
+        response = await storage_client.download_file(
+            bucket_name,
+            path,
+            method=request.method,
+            range_header=range_header
+        )
+    except httpx.HTTPStatusError as e:
+        if e.response.status_code == status.HTTP_416_RANGE_NOT_SATISFIABLE:
+            raise HTTPException(
+                status_code=status.HTTP_416_RANGE_NOT_SATISFIABLE,
+                detail="Requested range not satisfiable",
+                headers={"Content-Range": e.response.headers.get("content-range", f"bytes */{file_record['size']}")}
+            )
         raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Storage service unavailable")
+    except Exception:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Storage service unavailable")
+
+    for name in DOWNLOAD_PASSTHROUGH_HEADERS:
+        if name in response.headers:
+            headers[name] = response.headers[name]
+    # Several ranges come back as multipart/byteranges with the storage boundary
+    media_type = file_record['mime_type']
+    if response.headers.get("content-type", "").startswith("multipart/byteranges"):
+        media_type = response.headers["content-type"]
+
+    if request.method == "HEAD":
+        await response.aclose()
+        return Response(status_code=response.status_code, media_type=media_type, headers=headers)
+
+    return StreamingResponse(
+        response.aiter_raw(),
+        status_code=response.status_code,
+        media_type=media_type,
+        headers=headers,
+        background=BackgroundTask(response.aclose)
+    )
 
 
 @router.delete(
@@ -721,11 +882,11 @@ async def delete_file(
         pass  # Best effort - storage might already be deleted
 
     # 2. Delete from database
-    await db.execute("DELETE FROM files WHERE id = %s", (file_id,))
+    await db.execute("DELETE FROM files WHERE id = %s /* selfdb:files.delete_file */", (file_id,))
 
     # 3. Update bucket stats
     await db.execute(
-        "UPDATE buckets SET file_count = file_count - 1, total_size = total_size - %s, updated_at = %s WHERE id = %s",
+        "UPDATE buckets SET file_count = file_count - 1, total_size = total_size - %s, updated_at = %s WHERE id = %s /* selfdb:files.delete_file */",
         (file.size, datetime.now(timezone.utc), file.bucket_id)
     )
     await db.commit()
@@ -760,7 +921,7 @@ async def update_file_metadata(
 
     now = datetime.now(timezone.utc)
     result = await db.execute(
-        "UPDATE files SET metadata = %s, updated_at = %s WHERE id = %s RETURNING *",
+        "UPDATE files SET metadata = %s, updated_at = %s WHERE id = %s RETURNING * /* selfdb:files.update_file_metadata */",
         (Json(metadata), now, file_id)
     )
     updated = await result.fetchone()
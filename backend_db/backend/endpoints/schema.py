@@ -4,8 +4,8 @@ Schema visualization endpoint for exposing database schema structure.
 Provides table structure and foreign key relationships for the ReactFlow-based visualization.
 """
 
-from typing import List, Set
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import List, Optional, Set, Tuple
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from pydantic import BaseModel
 import psycopg
 
@@ -15,9 +15,11 @@ from models.schema import (
     SchemaColumn, 
     SchemaEdge
 )
+from models.table import TableStats
 from models.user import UserInDB
 from db import get_db
 from security import get_current_active_user
+from utils.table_stats import fetch_table_stats
 
 router = APIRouter(prefix="/schema", tags=["schema"])
 
@@ -65,6 +67,7 @@ SYSTEM_TABLES_TO_EXCLUDE: Set[str] = {
     "storage_objects",
     "pg_stat_statements",
     "tables_metadata",  # Internal metadata table
+    "schema_ddl_version",
 }
 
 # Core system tables to include in visualization (user-relevant system tables)
@@ -102,6 +105,111 @@ def is_system_table(table_name: str) -> bool:
     return False
 
 
+# ─────────────────────────────────────────────────────────────────────────────
+# Catalog Queries & Cache
+# ─────────────────────────────────────────────────────────────────────────────
+
+# data_type as information_schema.columns reports it: domains resolve to their
+# base type, arrays are 'ARRAY', types outside pg_catalog 'USER-DEFINED', and
+# CHAR(n) is 'character' (format_type says 'bpchar' when given no typmod)
+COLUMNS_SQL = """
+    SELECT
+        c.relname AS table_name,
+        a.attname AS column_name,
+        CASE
+            WHEN t.typelem <> 0 AND t.typlen = -1 THEN 'ARRAY'
+            WHEN t.oid = 'bpchar'::regtype THEN 'character'
+            WHEN t.typnamespace = 'pg_catalog'::regnamespace THEN format_type(t.oid, NULL)
+            ELSE 'USER-DEFINED'
+        END AS data_type,
+        pg_get_expr(d.adbin, d.adrelid) AS column_default,
+        COALESCE(a.attnum = ANY (pk.conkey), false) AS is_primary_key
+    FROM pg_class c
+    JOIN pg_attribute a ON a.attrelid = c.oid AND a.attnum > 0 AND NOT a.attisdropped
+    JOIN pg_type declared ON declared.oid = a.atttypid
+    JOIN pg_type t ON t.oid = CASE WHEN declared.typtype = 'd' THEN declared.typbasetype ELSE declared.oid END
+    LEFT JOIN pg_attrdef d ON d.adrelid = a.attrelid AND d.adnum = a.attnum AND a.attgenerated = ''
+    LEFT JOIN pg_constraint pk ON pk.conrelid = c.oid AND pk.contype = 'p'
+    WHERE c.relnamespace = 'public'::regnamespace
+      AND c.relkind IN ('r', 'p')
+    ORDER BY c.relname, a.attnum
+"""
+
+# One row per column pair, so composite keys pair up correctly
+FOREIGN_KEYS_SQL = """
+    SELECT
+        con.conname AS id,
+        src.relname AS source,
+        src_col.attname AS source_column,
+        tgt.relname AS target,
+        tgt_col.attname AS target_column
+    FROM pg_constraint con
+    JOIN pg_class src ON src.oid = con.conrelid
+    JOIN pg_class tgt ON tgt.oid = con.confrelid
+    CROSS JOIN LATERAL unnest(con.conkey, con.confkey) AS k(src_attnum, tgt_attnum)
+    JOIN pg_attribute src_col ON src_col.attrelid = con.conrelid AND src_col.attnum = k.src_attnum
+    JOIN pg_attribute tgt_col ON tgt_col.attrelid = con.confrelid AND tgt_col.attnum = k.tgt_attnum
+    WHERE con.contype = 'f'
+      AND src.relnamespace = 'public'::regnamespace
+      AND tgt.relnamespace = 'public'::regnamespace
+    ORDER BY src.relname, src_col.attname
+"""
+
+# (schema_ddl_version, response) of the last build in this worker. The counter
+# is bumped by event triggers on any DDL in public (10_schema_version.sql).
+_visualization_cache: Optional[Tuple[int, SchemaVisualizationResponse]] = None
+
+
+async def get_schema_version(db: psycopg.AsyncConnection) -> int:
+    """Current DDL counter of the public schema."""
+    result = await db.execute("SELECT version FROM schema_ddl_version WHERE id = 1 /* selfdb:schema.get_schema_version */")
+    row = await result.fetchone()
+    return row["version"] if row else 0
+
+
+async def build_schema_visualization(db: psycopg.AsyncConnection) -> SchemaVisualizationResponse:
+    """Build the visualization from pg_catalog: one query for columns, one for foreign keys."""
+    result = await db.execute(COLUMNS_SQL)
+    columns_data = await result.fetchall()
+    result = await db.execute(FOREIGN_KEYS_SQL)
+    fk_data = await result.fetchall()
+    
+    # Group columns by table, skipping system tables
+    nodes: dict[str, SchemaNode] = {}
+    for row in columns_data:
+        table_name = row["table_name"]
+        if is_system_table(table_name):
+            continue
+        
+        node = nodes.get(table_name)
+        if node is None:
+            node = nodes[table_name] = SchemaNode(id=table_name, label=table_name)
+        
+        node.columns.append(SchemaColumn(
+            column_name=row["column_name"],
+            data_type=row["data_type"],
+            column_default=row["column_default"],
+            is_primary_key=row["is_primary_key"]
+        ))
+        if row["is_primary_key"]:
+            node.primary_keys.append(row["column_name"])
+    
+    # Only include edges where both source and target are visible tables
+    edges = [
+        SchemaEdge(
+            id=row["id"],
+            source=row["source"],
+            target=row["target"],
+            source_column=row["source_column"],
+            target_column=row["target_column"]
+        )
+        for row in fk_data
+        if row["source"] in nodes and row["target"] in nodes
+    ]
+    
+    return SchemaVisualizationResponse(nodes=list(nodes.values()), edges=edges)
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # Schema Visualization Endpoint
 # ─────────────────────────────────────────────────────────────────────────────
@@ -124,6 +232,8 @@ def is_system_table(table_name: str) -> bool:
     - Primary key indicators
     
     Each edge represents a foreign key constraint connecting two tables.
+    
+    Built from pg_catalog and cached per worker until the next DDL in the public schema.
     """
 )
 async def get_schema_visualization(
@@ -133,140 +243,20 @@ async def get_schema_visualization(
     """
     Get schema visualization data including all tables and their foreign key relationships.
     
-    This endpoint queries the PostgreSQL information_schema to extract:
-    1. All user tables and their columns
-    2. Primary key information for each table
-    3. Foreign key relationships between tables
-    
-    The response is formatted for use with ReactFlow-based schema visualization.
+    The cached response is reused while schema_ddl_version is unchanged. The
+    version is read before the catalog, so a concurrent DDL can at worst make
+    the next request rebuild - never leave a stale schema cached.
     """
+    global _visualization_cache
     try:
-        # Step 1: Get all tables in the public schema
-        tables_query = """
-            SELECT table_name 
-            FROM information_schema.tables 
-            WHERE table_schema = 'public' 
-              AND table_type = 'BASE TABLE'
-            ORDER BY table_name
-        """
-        result = await db.execute(tables_query)
-        all_tables = await result.fetchall()
-        
-        # Filter out system tables
-        table_names = [
-            row["table_name"] 
-            for row in all_tables 
-            if not is_system_table(row["table_name"])
-        ]
+        version = await get_schema_version(db)
+        cached = _visualization_cache
+        if cached is not None and cached[0] == version:
+            return cached[1]
         
-        if not table_names:
-            return SchemaVisualizationResponse(nodes=[], edges=[])
-        
-        # Step 2: Get columns for all tables with primary key information
-        # Using a single query with subquery for efficiency
-        columns_query = """
-            SELECT 
-                c.table_name,
-                c.column_name,
-                c.data_type,
-                c.column_default,
-                c.ordinal_position,
-                COALESCE(
-                    (SELECT true
-                     FROM information_schema.table_constraints tc
-                     JOIN information_schema.key_column_usage kcu
-                       ON tc.constraint_name = kcu.constraint_name
-                      AND tc.table_schema = kcu.table_schema
-                     WHERE tc.constraint_type = 'PRIMARY KEY'
-                       AND tc.table_schema = 'public'
-                       AND tc.table_name = c.table_name
-                       AND kcu.column_name = c.column_name
-                    ), false
-                ) AS is_primary_key
-            FROM information_schema.columns c
-            WHERE c.table_schema = 'public'
-              AND c.table_name = ANY(%s)
-            ORDER BY c.table_name, c.ordinal_position
-        """
-        result = await db.execute(columns_query, (table_names,))
-        columns_data = await result.fetchall()
-        
-        # Step 3: Get foreign key relationships
-        fk_query = """
-            SELECT 
-                tc.constraint_name AS id,
-                tc.table_name AS source,
-                kcu.column_name AS source_column,
-                ccu.table_name AS target,
-                ccu.column_name AS target_column
-            FROM information_schema.table_constraints tc
-            JOIN information_schema.key_column_usage kcu
-              ON tc.constraint_name = kcu.constraint_name
-             AND tc.table_schema = kcu.table_schema
-            JOIN information_schema.constraint_column_usage ccu
-              ON ccu.constraint_name = tc.constraint_name
-             AND ccu.table_schema = tc.table_schema
-            WHERE tc.constraint_type = 'FOREIGN KEY'
-              AND tc.table_schema = 'public'
-              AND tc.table_name = ANY(%s)
-            ORDER BY tc.table_name, kcu.column_name
-        """
-        result = await db.execute(fk_query, (table_names,))
-        fk_data = await result.fetchall()
-        
-        # Step 4: Build nodes from columns data
-        # Group columns by table
-        table_columns: dict[str, List[SchemaColumn]] = {}
-        table_primary_keys: dict[str, List[str]] = {}
-        
-        for row in columns_data:
-            table_name = row["table_name"]
-            
-            if table_name not in table_columns:
-                table_columns[table_name] = []
-                table_primary_keys[table_name] = []
-            
-            column = SchemaColumn(
-                column_name=row["column_name"],
-                data_type=row["data_type"],
-                column_default=row["column_default"],
-                is_primary_key=row["is_primary_key"]
-            )
-            table_columns[table_name].append(column)
-            
-            if row["is_primary_key"]:
-                table_primary_keys[table_name].append(row["column_name"])
-        
-        # Create nodes
-        nodes: List[SchemaNode] = []
-        for table_name in table_names:
-            if table_name in table_columns:
-                node = SchemaNode(
-                    id=table_name,
-                    label=table_name,
-                    columns=table_columns[table_name],
-                    primary_keys=table_primary_keys.get(table_name, [])
-                )
-                nodes.append(node)
-        
-        # Step 5: Build edges from foreign key data
-        # Filter edges to only include relationships between visible tables
-        table_set = set(table_names)
-        edges: List[SchemaEdge] = []
-        
-        for row in fk_data:
-            # Only include edges where both source and target are in our table list
-            if row["source"] in table_set and row["target"] in table_set:
-                edge = SchemaEdge(
-                    id=row["id"],
-                    source=row["source"],
-                    target=row["target"],
-                    source_column=row["source_column"],
-                    target_column=row["target_column"]
-                )
-                edges.append(edge)
-        
-        return SchemaVisualizationResponse(nodes=nodes, edges=edges)
+        response = await build_schema_visualization(db)
+        _visualization_cache = (version, response)
+        return response
         
     except psycopg.Error as e:
         raise HTTPException(
@@ -317,3 +307,31 @@ async def list_schema_tables(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Database error: {str(e)}"
         )
+
+
+@router.get(
+    "/stats",
+    response_model=List[TableStats],
+    responses=RESP_ERRORS,
+    summary="Get Table Statistics",
+    description="Size, dead tuples, bloat estimate, scan counts and per-index usage of every table, largest first."
+)
+async def get_schema_stats(
+    include_system: bool = Query(False, description="Also include SelfDB system tables (sql_history, ...)"),
+    db: psycopg.AsyncConnection = Depends(get_db),
+    current_user: UserInDB = Depends(require_admin),
+) -> List[TableStats]:
+    """
+    Statistics of all tables in the public schema, from a single catalog query.
+    Counters (scans, tuples) are cumulative since the last statistics reset.
+    """
+    try:
+        stats = await fetch_table_stats(db)
+    except psycopg.Error as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Database error: {str(e)}"
+        )
+    if include_system:
+        return stats
+    return [table for table in stats if not is_system_table(table.name)]
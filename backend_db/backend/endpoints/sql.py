@@ -1,20 +1,34 @@
 # sql.py
 """SQL execution endpoints for SelfDB."""
 
+import asyncio
 import time
 import re
+import json
 import uuid
 from uuid import UUID
-from typing import List, Dict, Any, Annotated, Optional, Tuple
+from contextlib import aclosing
+from typing import List, Dict, Any, Annotated, AsyncIterator, Literal, Optional, Tuple
 from datetime import datetime, timezone
 import psycopg
 from psycopg import sql as psycopg_sql
+from psycopg.types.json import Jsonb
 from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
 from models.sql import (
     SqlQueryRequest,
+    SqlExplainRequest,
     SqlExecutionResult,
+    SqlStatementResult,
+    SqlExplainResult,
+    SqlPlanNode,
+    SqlInsightsResponse,
+    SqlQueryInsight,
+    SqlJobRead,
+    SqlJobResult,
+    SqlJobStatus,
     SqlHistoryRead,
     SqlHistoryListResponse,
     SqlSnippetCreate,
@@ -22,353 +36,13 @@ from models.sql import (
     SqlSnippetListResponse,
 )
 from models.user import UserInDB
-from db import get_db
+import db as database
+from db import get_db, settings
 from security import get_current_active_user
+from services.sql_history_service import record_sql_history
+from utils.sql_tokenizer import SqlStatement, split_statements
 
 
-# ─────────────────────────────────────────────────────────────────────────────
-# CREATE TABLE Detection and Metadata Registration
-# ─────────────────────────────────────────────────────────────────────────────
-
-# System tables that should NOT be registered in the tables metadata
-SYSTEM_TABLES = {
-    'system_config', 'users', 'tables', 'sql_history', 'sql_snippets',
-    'buckets', 'files', 'functions', 'function_executions', 'function_logs',
-    'webhooks', 'webhook_deliveries', 'refresh_tokens',
-    'pg_catalog', 'information_schema',
-}
-
-# PostgreSQL type mapping for schema extraction
-PG_TYPE_MAPPING = {
-    'text': 'TEXT',
-    'varchar': 'TEXT',
-    'character varying': 'TEXT',
-    'char': 'TEXT',
-    'character': 'TEXT',
-    'int': 'INTEGER',
-    'int4': 'INTEGER',
-    'integer': 'INTEGER',
-    'int8': 'BIGINT',
-    'bigint': 'BIGINT',
-    'smallint': 'INTEGER',
-    'int2': 'INTEGER',
-    'serial': 'INTEGER',
-    'bigserial': 'BIGINT',
-    'decimal': 'DECIMAL',
-    'numeric': 'DECIMAL',
-    'real': 'FLOAT',
-    'float': 'FLOAT',
-    'float4': 'FLOAT',
-    'float8': 'FLOAT',
-    'double precision': 'FLOAT',
-    'boolean': 'BOOLEAN',
-    'bool': 'BOOLEAN',
-    'date': 'DATE',
-    'time': 'TIMESTAMP',
-    'timestamp': 'TIMESTAMP',
-    'timestamp with time zone': 'TIMESTAMP',
-    'timestamp without time zone': 'TIMESTAMP',
-    'timestamptz': 'TIMESTAMP',
-    'json': 'JSON',
-    'jsonb': 'JSONB',
-    'uuid': 'UUID',
-    'bytea': 'TEXT',
-}
-
-
-def split_sql_statements(query: str) -> List[str]:
-    """
-    Split SQL into individual statements, respecting quoted strings.
-    Handles single quotes, double quotes, and dollar-quoted strings.
-    """
-    statements = []
-    current = ""
-    in_string = False
-    string_char = None
-    i = 0
-    
-    while i < len(query):
-        char = query[i]
-        
-        # Handle dollar quoting ($$...$$)
-        if char == '$' and not in_string:
-            # Look for $$ or $tag$
-            end_idx = query.find('$', i + 1)
-            if end_idx != -1:
-                dollar_tag = query[i:end_idx + 1]
-                current += dollar_tag
-                i = end_idx + 1
-                # Find the closing dollar tag
-                close_idx = query.find(dollar_tag, i)
-                if close_idx != -1:
-                    current += query[i:close_idx + len(dollar_tag)]
-                    i = close_idx + len(dollar_tag)
-                    continue
-        
-        if char in ("'", '"') and not in_string:
-            in_string = True
-            string_char = char
-            current += char
-        elif char == string_char and in_string:
-            # Check for escaped quote (doubled)
-            if i + 1 < len(query) and query[i + 1] == string_char:
-                current += char + string_char
-                i += 2
-                continue
-            in_string = False
-            string_char = None
-            current += char
-        elif char == ';' and not in_string:
-            stmt = current.strip()
-            if stmt:
-                statements.append(stmt)
-            current = ""
-        else:
-            current += char
-        
-        i += 1
-    
-    # Don't forget the last statement (might not end with ;)
-    stmt = current.strip()
-    if stmt:
-        statements.append(stmt)
-    
-    return statements
-
-
-def parse_single_create_table(stmt: str) -> Optional[Tuple[str, Dict[str, Any]]]:
-    """
-    Parse a single CREATE TABLE statement to extract table name and column definitions.
-    
-    Returns:
-        Tuple of (table_name, schema_dict) if successful, None otherwise.
-        schema_dict format: {column_name: {type: str, nullable: bool}}
-    """
-    # Match CREATE TABLE pattern (with optional IF NOT EXISTS)
-    # Use non-greedy matching to stop at the first complete parentheses block
-    create_pattern = r'CREATE\s+TABLE\s+(?:IF\s+NOT\s+EXISTS\s+)?["\']?(\w+)["\']?\s*\('
-    match = re.search(create_pattern, stmt, re.IGNORECASE)
-    
-    if not match:
-        return None
-    
-    table_name = match.group(1).lower()
-    
-    # Skip system tables
-    if table_name in SYSTEM_TABLES:
-        return None
-    
-    # Find the matching closing parenthesis for the column definitions
-    start_paren = match.end() - 1  # Position of the opening (
-    paren_depth = 0
-    columns_start = start_paren + 1
-    columns_end = None
-    
-    for i in range(start_paren, len(stmt)):
-        if stmt[i] == '(':
-            paren_depth += 1
-        elif stmt[i] == ')':
-            paren_depth -= 1
-            if paren_depth == 0:
-                columns_end = i
-                break
-    
-    if columns_end is None:
-        return None
-    
-    columns_str = stmt[columns_start:columns_end]
-    
-    # Parse column definitions
-    schema = {}
-    
-    # Split by commas, but be careful with complex types like DECIMAL(10,2)
-    # and constraints like FOREIGN KEY(..., ...)
-    columns = []
-    paren_depth = 0
-    current = ""
-    
-    for char in columns_str:
-        if char == '(':
-            paren_depth += 1
-            current += char
-        elif char == ')':
-            paren_depth -= 1
-            current += char
-        elif char == ',' and paren_depth == 0:
-            columns.append(current.strip())
-            current = ""
-        else:
-            current += char
-    
-    if current.strip():
-        columns.append(current.strip())
-    
-    for col_def in columns:
-        col_def = col_def.strip()
-        
-        # Skip constraints (PRIMARY KEY, FOREIGN KEY, UNIQUE, CHECK, CONSTRAINT)
-        if re.match(r'^\s*(PRIMARY\s+KEY|FOREIGN\s+KEY|UNIQUE|CHECK|CONSTRAINT)', col_def, re.IGNORECASE):
-            continue
-        
-        # Parse column: column_name TYPE [constraints...]
-        col_match = re.match(r'["\']?(\w+)["\']?\s+(\w+(?:\s*\([^)]*\))?)', col_def, re.IGNORECASE)
-        if col_match:
-            col_name = col_match.group(1).lower()
-            col_type_raw = col_match.group(2).lower()
-            
-            # Extract base type (without size specification)
-            base_type = re.sub(r'\s*\([^)]*\)', '', col_type_raw).strip()
-            
-            # Map to our standard types
-            mapped_type = PG_TYPE_MAPPING.get(base_type, 'TEXT')
-            
-            # Check for NOT NULL constraint
-            nullable = 'not null' not in col_def.lower()
-            
-            schema[col_name] = {
-                'type': mapped_type,
-                'nullable': nullable
-            }
-    
-    return (table_name, schema) if schema else None
-
-
-def parse_create_table_statements(query: str) -> List[Tuple[str, Dict[str, Any]]]:
-    """
-    Parse all CREATE TABLE statements in a multi-statement SQL query.
-    
-    Returns:
-        List of tuples (table_name, schema_dict) for each CREATE TABLE found.
-    """
-    statements = split_sql_statements(query)
-    results = []
-    
-    for stmt in statements:
-        # Only process statements that look like CREATE TABLE
-        if re.search(r'CREATE\s+TABLE', stmt, re.IGNORECASE):
-            result = parse_single_create_table(stmt)
-            if result:
-                results.append(result)
-    
-    return results
-
-
-def parse_create_table_statement(query: str) -> Optional[Tuple[str, Dict[str, Any]]]:
-    """
-    Parse CREATE TABLE statement(s) to extract table name and column definitions.
-    For backwards compatibility, returns the first CREATE TABLE found.
-    
-    Returns:
-        Tuple of (table_name, schema_dict) if successful, None otherwise.
-        schema_dict format: {column_name: {type: str, nullable: bool}}
-    """
-    results = parse_create_table_statements(query)
-    return results[0] if results else None
-
-
-def parse_drop_table_statements(query: str) -> List[str]:
-    """
-    Parse all DROP TABLE statements in a multi-statement SQL query.
-    
-    Returns:
-        List of table names to be dropped.
-    """
-    statements = split_sql_statements(query)
-    results = []
-    
-    drop_pattern = r'DROP\s+TABLE\s+(?:IF\s+EXISTS\s+)?["\']?(\w+)["\']?'
-    
-    for stmt in statements:
-        match = re.search(drop_pattern, stmt, re.IGNORECASE)
-        if match:
-            table_name = match.group(1).lower()
-            # Skip system tables
-            if table_name not in SYSTEM_TABLES:
-                results.append(table_name)
-    
-    return results
-
-
-def parse_drop_table_statement(query: str) -> Optional[str]:
-    """
-    Parse DROP TABLE statement(s) to extract table name.
-    For backwards compatibility, returns the first DROP TABLE found.
-    
-    Returns:
-        Table name if successful, None otherwise.
-    """
-    results = parse_drop_table_statements(query)
-    return results[0] if results else None
-
-
-async def register_table_metadata(
-    db: psycopg.AsyncConnection,
-    table_name: str,
-    table_schema: Dict[str, Any],
-    owner_id: UUID
-) -> None:
-    """
-    Register a table in the tables metadata table.
-    This is called after a CREATE TABLE statement is successfully executed.
-    """
-    table_id = uuid.uuid4()
-    now = datetime.now(timezone.utc)
-    
-    try:
-        # Check if table already exists in metadata
-        result = await db.execute(
-            "SELECT id FROM tables WHERE name = %s",
-            (table_name,)
-        )
-        existing = await result.fetchone()
-        
-        if existing:
-            # Table already registered, skip
-            return
-        
-        # Insert into tables metadata
-        await db.execute(
-            """
-            INSERT INTO tables (id, name, table_schema, public, owner_id, description, metadata, row_count, created_at, updated_at)
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-            """,
-            (
-                table_id,
-                table_name,
-                psycopg.types.json.Json(table_schema),
-                False,  # Default to private
-                owner_id,
-                f"Table created via SQL Editor",
-                psycopg.types.json.Json({}),
-                0,
-                now,
-                now
-            )
-        )
-        await db.commit()
-    except Exception:
-        # Don't fail the main query if metadata registration fails
-        await db.rollback()
-
-
-async def unregister_table_metadata(
-    db: psycopg.AsyncConnection,
-    table_name: str
-) -> None:
-    """
-    Remove a table from the tables metadata table.
-    This is called after a DROP TABLE statement is successfully executed.
-    """
-    try:
-        await db.execute(
-            "DELETE FROM tables WHERE name = %s",
-            (table_name,)
-        )
-        await db.commit()
-    except Exception:
-        # Don't fail the main query if metadata unregistration fails
-        await db.rollback()
-
 router = APIRouter(prefix="/sql", tags=["sql"])
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -388,6 +62,7 @@ RESP_ERRORS = {
     405: {"model": ErrorResponse, "description": "Method Not Allowed"},
     406: {"model": ErrorResponse, "description": "Not Acceptable"},
     409: {"model": ErrorResponse, "description": "Conflict"},
+    503: {"model": ErrorResponse, "description": "Service Unavailable"},
 }
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -410,64 +85,338 @@ def require_admin(current_user: UserInDB = Depends(get_current_active_user)) ->
 # Security Patterns - Dangerous SQL patterns to block
 # ─────────────────────────────────────────────────────────────────────────────
 
-# Patterns that should be blocked for security reasons
+# Patterns that should be blocked for security reasons, each paired with a
+# literal every match contains. A leading \b disables re's fast literal search,
+# so a substring test skips the regex for the (usual) queries without it.
 DANGEROUS_PATTERNS = [
-    r'\bpg_read_file\b',
-    r'\bpg_write_file\b',
-    r'\bpg_ls_dir\b',
-    r'\blo_import\b',
-    r'\blo_export\b',
-    r'\bcopy\s+.*\s+to\s+program\b',
-    r'\bcopy\s+.*\s+from\s+program\b',
-    r'\bexecute\s+format\b',
-    r';\s*--',  # SQL comment injection
+    ('pg_read_file', r'\bpg_read_file\b'),
+    ('pg_write_file', r'\bpg_write_file\b'),
+    ('pg_ls_dir', r'\bpg_ls_dir\b'),
+    ('lo_import', r'\blo_import\b'),
+    ('lo_export', r'\blo_export\b'),
+    ('program', r'\bcopy\s+.*\s+to\s+program\b'),
+    ('program', r'\bcopy\s+.*\s+from\s+program\b'),
+    ('format', r'\bexecute\s+format\b'),
+    ('--', r';\s*--'),  # SQL comment injection
 ]
+DANGEROUS_REGEXES = [(literal, re.compile(pattern)) for literal, pattern in DANGEROUS_PATTERNS]
 
 # System tables that should not be modified
 PROTECTED_TABLES = {
     'system_config',
     'sql_history',
     'sql_snippets',
+    'sql_jobs',
+    'sql_job_results',
+    'schema_ddl_version',
     'pg_catalog',
     'information_schema',
 }
 
-def validate_query_security(query: str) -> None:
+def validate_query_security(query: str, statements: List[SqlStatement]) -> None:
     """Validate query for dangerous patterns."""
     query_lower = query.lower()
     
     # Check for dangerous patterns
-    for pattern in DANGEROUS_PATTERNS:
-        if re.search(pattern, query_lower, re.IGNORECASE):
+    for literal, pattern in DANGEROUS_REGEXES:
+        if literal in query_lower and pattern.search(query_lower):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"Query contains prohibited pattern for security reasons"
             )
     
     # Check for modifications to protected tables
-    # Look for INSERT, UPDATE, DELETE, DROP, TRUNCATE on protected tables
-    modification_patterns = [
-        r'\b(insert\s+into|update|delete\s+from|drop\s+table|truncate)\s+',
-    ]
-    
-    for pattern in modification_patterns:
-        match = re.search(pattern, query_lower)
-        if match:
-            # Extract table name after the modification keyword
-            remaining = query_lower[match.end():]
-            for protected in PROTECTED_TABLES:
-                if remaining.strip().startswith(protected):
+    # Look for INSERT, UPDATE, DELETE, DROP, TRUNCATE on protected tables in every statement
+    for stmt in statements:
+        for qualified_name in (*stmt.written_tables(), *stmt.dropped_tables()):
+            # Either part of schema.table may be protected (e.g. pg_catalog)
+            for name in qualified_name.split('.'):
+                if name in PROTECTED_TABLES:
                     raise HTTPException(
                         status_code=status.HTTP_400_BAD_REQUEST,
-                        detail=f"Cannot modify protected system table: {protected}"
+                        detail=f"Cannot modify protected system table: {name}"
                     )
 
 
-def is_read_only_query(query: str) -> bool:
-    """Determine if a query is read-only (SELECT, EXPLAIN, etc.)."""
-    query_stripped = query.strip().lower()
-    read_only_prefixes = ('select', 'explain', 'show', 'describe', 'with')
-    return query_stripped.startswith(read_only_prefixes)
+def is_read_only_query(statements: List[SqlStatement]) -> bool:
+    """Determine if every statement of a query is read-only (SELECT, EXPLAIN, etc.)."""
+    return bool(statements) and all(stmt.is_read_only for stmt in statements)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Read-Only Result Fetching
+# ─────────────────────────────────────────────────────────────────────────────
+
+# Rows pulled from PostgreSQL per round trip
+SQL_FETCH_SIZE = 1000
+
+# Statements DECLARE CURSOR accepts (data-modifying CTEs are rejected in cursors)
+CURSOR_KEYWORDS = {'select', 'with', 'values', 'table'}
+DATA_MODIFYING_PATTERN = re.compile(r'\b(insert|update|delete|merge)\b')
+
+
+def reads_through_cursor(stmt: SqlStatement) -> bool:
+    """Whether a statement can be declared as a server-side cursor (a plain query)."""
+    return (
+        stmt.keyword in CURSOR_KEYWORDS
+        and not DATA_MODIFYING_PATTERN.search(stmt.code)
+        and not stmt.selects_into()
+    )
+
+
+def result_row_limit(requested: Optional[int], server_limit: int) -> int:
+    """Apply the server-side row cap to a requested max_rows."""
+    return min(requested, server_limit) if requested else server_limit
+
+
+async def iter_result_batches(
+    db: psycopg.AsyncConnection,
+    statements: List[SqlStatement]
+) -> AsyncIterator[Tuple[List[str], List[Dict[str, Any]]]]:
+    """
+    Execute a read-only query (split_statements output, at least one statement)
+    and yield (columns, rows) batches of at most SQL_FETCH_SIZE rows. The first
+    batch is always yielded, even when empty.
+    
+    In a multi-statement query every statement but the last is run as-is and
+    the last one supplies the result. SELECT-like statements are read through
+    a server-side cursor, so only one batch is ever held in memory; EXPLAIN,
+    SHOW and data-modifying CTEs can't be declared as cursors and are read from
+    a regular one. Close the generator early (aclose) to release the cursor.
+    """
+    async with db.cursor() as cur:
+        for stmt in statements[:-1]:
+            await cur.execute(stmt.text)
+    
+    last = statements[-1]
+    if reads_through_cursor(last):
+        cursor = db.cursor(name=f"sql_query_{uuid.uuid4().hex}")
+    else:
+        cursor = db.cursor()
+    
+    async with cursor as cur:
+        await cur.execute(last.text)
+        if not cur.description:
+            yield [], []
+            return
+        columns = [desc.name for desc in cur.description]
+        rows = await cur.fetchmany(SQL_FETCH_SIZE)
+        yield columns, rows
+        while len(rows) == SQL_FETCH_SIZE:
+            rows = await cur.fetchmany(SQL_FETCH_SIZE)
+            if rows:
+                yield columns, rows
+
+
+def encode_rows_within_limits(
+    rows: List[Dict[str, Any]],
+    rows_left: int,
+    bytes_left: int
+) -> Tuple[List[str], bool]:
+    """
+    JSON-encode rows until the row or byte budget runs out.
+    
+    Returns:
+        (encoded rows, whether the budget cut the batch short)
+    """
+    encoded = []
+    for row in rows:
+        line = json.dumps(row, default=str)
+        if len(encoded) >= rows_left or len(line) > bytes_left:
+            return encoded, True
+        bytes_left -= len(line)
+        encoded.append(line)
+    return encoded, False
+
+
+async def fetch_capped_result(
+    db: psycopg.AsyncConnection,
+    statements: List[SqlStatement],
+    max_rows: int,
+    max_bytes: int
+) -> Tuple[List[str], List[Dict[str, Any]], bool]:
+    """
+    Read a read-only result up to max_rows / max_bytes of JSON.
+    
+    Returns:
+        (columns, rows, truncated)
+    """
+    columns: List[str] = []
+    data: List[Dict[str, Any]] = []
+    size = 0
+    async with aclosing(iter_result_batches(db, statements)) as batches:
+        async for columns, rows in batches:
+            encoded, truncated = encode_rows_within_limits(rows, max_rows - len(data), max_bytes - size)
+            data.extend(rows[:len(encoded)])
+            size += sum(len(line) for line in encoded)
+            if truncated:
+                return columns, data, True
+    return columns, data, False
+
+
+async def execute_write_query(
+    db: psycopg.AsyncConnection,
+    query: str,
+    user_id: UUID
+) -> int:
+    """
+    Execute and commit a write query.
+    
+    The tables registry follows any DDL in the same transaction through the
+    event triggers in database/init/09_table_registry_sync.sql; the JWT claims
+    make auth.uid() the owner of tables the query creates.
+    
+    Returns:
+        Number of rows affected
+    """
+    await database.set_jwt_claims(db, str(user_id), "ADMIN")
+    async with db.cursor() as cur:
+        await cur.execute(query)
+        
+        # For non-SELECT queries, get rowcount
+        row_count = cur.rowcount if cur.rowcount >= 0 else 0
+        await db.commit()
+    
+    return row_count
+
+
+class StatementFailed(Exception):
+    """A statement of a per_statement script failed; the whole script was rolled back."""
+    
+    def __init__(self, index: int, error: Exception):
+        super().__init__(f"Statement {index + 1} failed: {error}")
+        self.index = index
+
+
+async def execute_statements_pipelined(
+    db: psycopg.AsyncConnection,
+    statements: List[SqlStatement],
+    user_id: UUID,
+    max_rows: int,
+    max_bytes: int
+) -> List[SqlStatementResult]:
+    """
+    Run a script statement by statement in one transaction. Commits only if
+    every statement succeeded.
+    
+    Runs of consecutive statements are sent as one pipeline, so a script of
+    writes still costs one round trip, and a `SELECT clock_timestamp()` queued
+    between them times each one on the server. Pipeline results arrive whole,
+    so SELECT-like statements are run between pipelines through a server-side
+    cursor instead: only max_rows / max_bytes (shared by the script) are
+    fetched and the rest is counted with MOVE. Results of statements that
+    can't be cursors (RETURNING, EXPLAIN, SHOW) are still read whole.
+    """
+    results: List[SqlStatementResult] = []
+    rows_left, bytes_left = max_rows, max_bytes
+    pending: List[int] = []
+    claims_set = False
+    
+    async def run_pipeline() -> None:
+        nonlocal rows_left, bytes_left, claims_set
+        if not pending:
+            if not claims_set:
+                await database.set_jwt_claims(db, str(user_id), "ADMIN")
+                claims_set = True
+            return
+        
+        cursors: List[psycopg.AsyncCursor] = []
+        clocks: List[psycopg.AsyncCursor] = []
+        
+        async def queue_clock() -> None:
+            clock = db.cursor()
+            await clock.execute("SELECT clock_timestamp() AS at")
+            clocks.append(clock)
+        
+        try:
+            async with db.pipeline():
+                if not claims_set:
+                    await database.set_jwt_claims(db, str(user_id), "ADMIN")
+                await queue_clock()
+                for index in pending:
+                    cur = db.cursor()
+                    cursors.append(cur)
+                    await cur.execute(statements[index].text)
+                    await queue_clock()
+        except psycopg.Error as e:
+            # The failed statement and those after it (aborted) never got a result
+            failed = next((i for i, cur in enumerate(cursors) if cur.pgresult is None), len(cursors) - 1)
+            raise StatementFailed(pending[max(failed, 0)], e) from e
+        claims_set = True
+        
+        times = [(await clock.fetchone())['at'] for clock in clocks]
+        for position, (index, cur) in enumerate(zip(pending, cursors)):
+            stmt = statements[index]
+            result = SqlStatementResult(
+                index=index,
+                statement=stmt.text,
+                is_read_only=stmt.is_read_only,
+                execution_time=(times[position + 1] - times[position]).total_seconds(),
+                row_count=max(cur.rowcount, 0)
+            )
+            if cur.description is not None:
+                rows = await cur.fetchall()
+                encoded, result.truncated = encode_rows_within_limits(rows, rows_left, bytes_left)
+                rows_left -= len(encoded)
+                bytes_left -= sum(len(line) for line in encoded)
+                result.columns = [desc.name for desc in cur.description]
+                result.data = rows[:len(encoded)]
+                result.row_count = len(rows)
+            results.append(result)
+        pending.clear()
+    
+    async def run_cursor(index: int) -> None:
+        nonlocal rows_left, bytes_left
+        stmt = statements[index]
+        start_time = time.time()
+        data: List[Dict[str, Any]] = []
+        row_count = 0
+        truncated = False
+        try:
+            async with db.cursor(name=f"sql_query_{uuid.uuid4().hex}") as cur:
+                await cur.execute(stmt.text)
+                columns = [desc.name for desc in cur.description]
+                while True:
+                    rows = await cur.fetchmany(SQL_FETCH_SIZE)
+                    row_count += len(rows)
+                    encoded, truncated = encode_rows_within_limits(rows, rows_left, bytes_left)
+                    rows_left -= len(encoded)
+                    bytes_left -= sum(len(line) for line in encoded)
+                    data.extend(rows[:len(encoded)])
+                    if truncated or len(rows) < SQL_FETCH_SIZE:
+                        break
+                if truncated:
+                    # Count the rest of the result without transferring it
+                    moved = await db.execute(
+                        psycopg_sql.SQL("MOVE FORWARD ALL FROM {}").format(psycopg_sql.Identifier(cur.name))
+                    )
+                    row_count += max(moved.rowcount, 0)
+        except psycopg.Error as e:
+            raise StatementFailed(index, e) from e
+        results.append(SqlStatementResult(
+            index=index,
+            statement=stmt.text,
+            is_read_only=stmt.is_read_only,
+            execution_time=time.time() - start_time,
+            row_count=row_count,
+            columns=columns,
+            data=data,
+            truncated=truncated
+        ))
+    
+    try:
+        for index, stmt in enumerate(statements):
+            if reads_through_cursor(stmt):
+                await run_pipeline()
+                await run_cursor(index)
+            else:
+                pending.append(index)
+        await run_pipeline()
+    except Exception:
+        await db.rollback()
+        raise
+    await db.commit()
+    return results
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -491,80 +440,79 @@ async def execute_query(
     query = request.query.strip()
     
     # Security validation
-    validate_query_security(query)
+    statements = split_statements(query)
+    validate_query_security(query, statements)
     
     # Track execution time
     start_time = time.time()
-    is_read_only = is_read_only_query(query)
+    is_read_only = is_read_only_query(statements)
     
     try:
-        async with db.cursor() as cur:
-            await cur.execute(query)
+        if request.per_statement:
+            statement_results = await execute_statements_pipelined(
+                db,
+                statements,
+                current_user.id,
+                max_rows=result_row_limit(request.max_rows, settings.SQL_MAX_ROWS),
+                max_bytes=settings.SQL_MAX_RESULT_BYTES
+            )
             execution_time = time.time() - start_time
             
-            # Get results for SELECT queries
-            if is_read_only and cur.description:
-                columns = [desc.name for desc in cur.description]
-                rows = await cur.fetchall()
-                data = [dict(zip(columns, row.values())) if hasattr(row, 'values') else dict(zip(columns, row)) for row in rows]
-                row_count = len(data)
-                
-                result = SqlExecutionResult(
-                    success=True,
-                    is_read_only=True,
-                    execution_time=execution_time,
-                    row_count=row_count,
-                    columns=columns,
-                    data=data,
-                    message=f"Query returned {row_count} row(s)"
-                )
-            else:
-                # For non-SELECT queries, get rowcount
-                row_count = cur.rowcount if cur.rowcount >= 0 else 0
-                await db.commit()
-                
-                # Auto-detect CREATE TABLE statements and register ALL in metadata
-                create_table_infos = parse_create_table_statements(query)
-                for table_name, table_schema in create_table_infos:
-                    try:
-                        await register_table_metadata(
-                            db=db,
-                            table_name=table_name,
-                            table_schema=table_schema,
-                            owner_id=current_user.id
-                        )
-                    except Exception:
-                        pass  # Don't fail if metadata registration fails
-                
-                # Auto-detect DROP TABLE statements and unregister ALL from metadata
-                dropped_tables = parse_drop_table_statements(query)
-                for dropped_table in dropped_tables:
-                    try:
-                        await unregister_table_metadata(db=db, table_name=dropped_table)
-                    except Exception:
-                        pass  # Don't fail if metadata unregistration fails
-                
-                result = SqlExecutionResult(
-                    success=True,
-                    is_read_only=False,
-                    execution_time=execution_time,
-                    row_count=row_count,
-                    message=f"Query executed successfully. {row_count} row(s) affected."
-                )
-        
-        # Save to history (don't fail if history save fails)
-        try:
-            await _save_history(
-                db=db,
-                query=query,
+            result = SqlExecutionResult(
+                success=True,
                 is_read_only=is_read_only,
                 execution_time=execution_time,
-                row_count=result.row_count or 0,
-                error=None,
-                user_id=current_user.id
+                row_count=sum(statement.row_count for statement in statement_results),
+                message=f"Executed {len(statement_results)} statement(s)",
+                truncated=any(statement.truncated for statement in statement_results),
+                statements=statement_results
+            )
+        elif is_read_only:
+            # Read at most SQL_MAX_ROWS / SQL_MAX_RESULT_BYTES; larger results belong on /sql/query/stream
+            columns, data, truncated = await fetch_capped_result(
+                db,
+                statements,
+                max_rows=result_row_limit(request.max_rows, settings.SQL_MAX_ROWS),
+                max_bytes=settings.SQL_MAX_RESULT_BYTES
             )
-        except Exception:
-            pass  # Don't fail the request if history save fails
+            # "Read-only" statements can still write (data-modifying CTEs, setval, functions)
+            await db.commit()
+            execution_time = time.time() - start_time
+            row_count = len(data)
+            
+            result = SqlExecutionResult(
+                success=True,
+                is_read_only=True,
+                execution_time=execution_time,
+                row_count=row_count,
+                columns=columns,
+                data=data,
+                message=(
+                    f"Query returned more rows than the limit; showing the first {row_count}"
+                    if truncated else f"Query returned {row_count} row(s)"
+                ),
+                truncated=truncated
+            )
+        else:
+            row_count = await execute_write_query(db, query, current_user.id)
+            execution_time = time.time() - start_time
+            
+            result = SqlExecutionResult(
+                success=True,
+                is_read_only=False,
+                execution_time=execution_time,
+                row_count=row_count,
+                message=f"Query executed successfully. {row_count} row(s) affected."
+            )
+        
+        record_sql_history(
+            query=query,
+            is_read_only=is_read_only,
+            execution_time=execution_time,
+            row_count=result.row_count or 0,
+            error=None,
+            user_id=current_user.id
+        )
         
         return result
         
@@ -573,46 +521,748 @@ async def execute_query(
         error_msg = str(e)
         
         # Save failed query to history
+        record_sql_history(
+            query=query,
+            is_read_only=is_read_only,
+            execution_time=execution_time,
+            row_count=0,
+            error=error_msg,
+            user_id=current_user.id
+        )
+        
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=error_msg
+        )
+
+
+@router.post(
+    "/query/stream",
+    responses={
+        **RESP_ERRORS,
+        200: {"content": {"application/x-ndjson": {}}, "description": "NDJSON result events"},
+    },
+    summary="Stream SQL Query Results",
+    description="Stream a read-only query's rows as NDJSON from a server-side cursor. Only ADMIN users can execute queries. Requires authentication and API key."
+)
+async def stream_query(
+    request: SqlQueryRequest,
+    db: psycopg.AsyncConnection = Depends(get_db),
+    current_user: UserInDB = Depends(require_admin),
+):
+    """
+    Stream a read-only query result (ADMIN only).
+    
+    Rows are fetched SQL_FETCH_SIZE at a time from a server-side cursor and
+    written straight to the response, so memory use does not grow with the
+    result. The body is one JSON object per line:
+    
+    - {"type": "columns", "columns": [...]}
+    - {"type": "rows", "rows": [{...}, ...]}  (zero or more)
+    - {"type": "end", "row_count": N, "truncated": bool, "execution_time": s}
+      or {"type": "error", "error": "...", "row_count": N} if the query fails mid-stream
+    
+    Reading stops at max_rows (capped by SQL_STREAM_MAX_ROWS) or
+    SQL_STREAM_MAX_RESULT_BYTES of row JSON, with truncated set to true.
+    """
+    query = request.query.strip()
+    statements = split_statements(query)
+    validate_query_security(query, statements)
+    
+    if not is_read_only_query(statements):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Only read-only queries can be streamed; use POST /sql/query"
+        )
+    
+    max_rows = result_row_limit(request.max_rows, settings.SQL_STREAM_MAX_ROWS)
+    max_bytes = settings.SQL_STREAM_MAX_RESULT_BYTES
+    start_time = time.time()
+    
+    # Run the query before sending headers so SQL errors still map to a status code
+    batches = iter_result_batches(db, statements)
+    try:
+        columns, first_rows = await anext(batches)
+    except Exception as e:
+        await batches.aclose()
+        record_sql_history(
+            query=query,
+            is_read_only=True,
+            execution_time=time.time() - start_time,
+            row_count=0,
+            error=str(e),
+            user_id=current_user.id
+        )
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
+    async def stream_content():
+        row_count = 0
+        size = 0
+        truncated = False
+        error = None
         try:
-            await _save_history(
-                db=db,
+            yield json.dumps({"type": "columns", "columns": columns}) + "\n"
+            rows = first_rows
+            while True:
+                encoded, truncated = encode_rows_within_limits(rows, max_rows - row_count, max_bytes - size)
+                if encoded:
+                    row_count += len(encoded)
+                    size += sum(len(line) for line in encoded)
+                    yield '{"type": "rows", "rows": [' + ", ".join(encoded) + ']}\n'
+                if truncated:
+                    break
+                batch = await anext(batches, None)
+                if batch is None:
+                    break
+                _, rows = batch
+            # Release the cursor and keep any writes the statements made before reporting success
+            await batches.aclose()
+            await db.commit()
+            yield json.dumps({
+                "type": "end",
+                "row_count": row_count,
+                "truncated": truncated,
+                "execution_time": time.time() - start_time,
+            }) + "\n"
+        except psycopg.Error as e:
+            error = str(e)
+            yield json.dumps({"type": "error", "error": error, "row_count": row_count}) + "\n"
+        finally:
+            # Closes the server-side cursor if the result was cut short or the client went away
+            await batches.aclose()
+            record_sql_history(
                 query=query,
-                is_read_only=is_read_only,
-                execution_time=execution_time,
-                row_count=0,
-                error=error_msg,
+                is_read_only=True,
+                execution_time=time.time() - start_time,
+                row_count=row_count,
+                error=error,
                 user_id=current_user.id
             )
-        except Exception:
-            pass
-        
+    
+    return StreamingResponse(stream_content(), media_type="application/x-ndjson")
+
+# ─────────────────────────────────────────────────────────────────────────────
+# QUERY PLANS
+# ─────────────────────────────────────────────────────────────────────────────
+
+EXPLAIN_PREFIX = "EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) "
+
+
+def build_plan_node(node: Dict[str, Any]) -> SqlPlanNode:
+    """Convert one node of an EXPLAIN (ANALYZE, FORMAT JSON) plan, recursively."""
+    children = [build_plan_node(child) for child in node.get("Plans", [])]
+    loops = node.get("Actual Loops", 0)
+    plan_rows = node.get("Plan Rows", 0)
+    actual_rows = node.get("Actual Rows", 0)
+    # Actual times are per loop; over all loops is what adds up to the query's time
+    total_time = node.get("Actual Total Time", 0.0) * loops
+    return SqlPlanNode(
+        node_type=node["Node Type"],
+        relation_name=node.get("Relation Name"),
+        index_name=node.get("Index Name"),
+        join_type=node.get("Join Type"),
+        startup_cost=node.get("Startup Cost", 0.0),
+        total_cost=node.get("Total Cost", 0.0),
+        plan_rows=plan_rows,
+        actual_rows=actual_rows,
+        row_estimate_error=max(actual_rows, 1) / max(plan_rows, 1),
+        loops=loops,
+        never_executed=loops == 0,
+        total_time=total_time,
+        self_time=max(total_time - sum(child.total_time for child in children), 0.0),
+        shared_hit_blocks=node.get("Shared Hit Blocks", 0),
+        shared_read_blocks=node.get("Shared Read Blocks", 0),
+        temp_read_blocks=node.get("Temp Read Blocks", 0),
+        temp_written_blocks=node.get("Temp Written Blocks", 0),
+        children=children
+    )
+
+
+def build_explain_result(query: str, document: Dict[str, Any], history_id: UUID | None) -> SqlExplainResult:
+    """Structure one EXPLAIN (FORMAT JSON) document (the single element of its array)."""
+    return SqlExplainResult(
+        history_id=history_id,
+        query=query,
+        planning_time=document.get("Planning Time", 0.0),
+        execution_time=document.get("Execution Time", 0.0),
+        plan=build_plan_node(document["Plan"]),
+        raw_plan=document
+    )
+
+
+@router.post(
+    "/explain",
+    response_model=SqlExplainResult,
+    responses=RESP_ERRORS,
+    summary="Explain SQL Query",
+    description="Run one statement under EXPLAIN (ANALYZE, BUFFERS) in a rolled-back transaction and return its plan tree. Only ADMIN users can execute queries. Requires authentication and API key."
+)
+async def explain_query(
+    request: SqlExplainRequest,
+    db: psycopg.AsyncConnection = Depends(get_db),
+    current_user: UserInDB = Depends(require_admin),
+) -> SqlExplainResult:
+    """
+    Profile a statement (ADMIN only).
+    
+    The statement really runs - that is what ANALYZE measures - but inside a
+    transaction that is always rolled back, so writes are discarded (sequence
+    increments are not). The plan is stored with the statement's sql_history
+    entry so later runs can be compared against it.
+    """
+    query = request.query.strip()
+    statements = split_statements(query)
+    validate_query_security(query, statements)
+    if len(statements) != 1:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=error_msg
+            detail="EXPLAIN takes exactly one statement"
+        )
+    statement = statements[0]
+    
+    start_time = time.time()
+    try:
+        result = await db.execute(EXPLAIN_PREFIX + statement.text)
+        row = await result.fetchone()
+        document = row["QUERY PLAN"][0]
+        explain = build_explain_result(statement.text, document, None)
+    except Exception as e:
+        record_sql_history(
+            query=statement.text,
+            is_read_only=statement.is_read_only,
+            execution_time=time.time() - start_time,
+            row_count=0,
+            error=str(e),
+            user_id=current_user.id
         )
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    finally:
+        await db.rollback()
+    
+    explain.history_id = record_sql_history(
+        query=statement.text,
+        is_read_only=statement.is_read_only,
+        execution_time=time.time() - start_time,
+        row_count=round(explain.plan.actual_rows * explain.plan.loops),
+        error=None,
+        user_id=current_user.id,
+        plan=document
+    )
+    return explain
 
+# ─────────────────────────────────────────────────────────────────────────────
+# QUERY INSIGHTS
+# ─────────────────────────────────────────────────────────────────────────────
 
-async def _save_history(
-    db: psycopg.AsyncConnection,
+# Sort keys of GET /sql/insights and the pg_stat_statements column behind each
+INSIGHT_SORT_COLUMNS = {
+    "total_time": "total_exec_time",
+    "mean_time": "mean_exec_time",
+    "calls": "calls",
+    "rows": "rows",
+    "shared_blks_read": "shared_blks_read",
+}
+
+# Backend queries end in /* selfdb:module.function */, which pg_stat_statements
+# keeps in the normalized text (constants are replaced, comments are not). The
+# queryid ignores comments, though: statements that differ only in their tag are
+# one entry, shown with the first text seen. Only statements whose text is unique
+# to their call site are tagged, so `source` is the first-seen tag per queryid.
+INSIGHTS_SQL = r"""
+    WITH statements AS (
+        SELECT queryid, query,
+               substring(query from '/\* selfdb:([A-Za-z0-9_.]+) \*/') AS source,
+               calls, total_exec_time, mean_exec_time, rows, shared_blks_hit, shared_blks_read
+        FROM pg_stat_statements
+        WHERE dbid = (SELECT oid FROM pg_database WHERE datname = current_database())
+    )
+    SELECT queryid, query, source, calls,
+           total_exec_time AS total_time, mean_exec_time AS mean_time,
+           rows, shared_blks_hit, shared_blks_read
+    FROM statements
+    WHERE %(source)s::text IS NULL OR starts_with(source, %(source)s)
+    ORDER BY {} DESC
+    LIMIT %(limit)s
+"""
+
+STATS_UNAVAILABLE_ERRORS = (
+    psycopg.errors.UndefinedTable,                  # extension not created
+    psycopg.errors.ObjectNotInPrerequisiteState,    # library not preloaded
+)
+
+
+def _stats_unavailable(e: Exception) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail=f"pg_stat_statements is not available ({e}). "
+               "It needs shared_preload_libraries=pg_stat_statements and CREATE EXTENSION pg_stat_statements."
+    )
+
+
+@router.get(
+    "/insights",
+    response_model=SqlInsightsResponse,
+    responses=RESP_ERRORS,
+    summary="Get Query Insights",
+    description="Top statements run against this database, from pg_stat_statements. Admin only. Requires authentication and API key."
+)
+async def get_query_insights(
+    sort_by: Annotated[Literal["total_time", "mean_time", "calls", "rows", "shared_blks_read"], Query(description="Counter to rank statements by")] = "total_time",
+    limit: Annotated[int, Query(ge=1, le=500, description="Number of statements to return")] = 20,
+    source: Annotated[Optional[str], Query(max_length=100, description="Only statements tagged with this call site prefix, e.g. 'tables.' or 'security.'")] = None,
+    db: psycopg.AsyncConnection = Depends(get_db),
+    current_user: UserInDB = Depends(require_admin),
+) -> SqlInsightsResponse:
+    """
+    Rank statements by cumulative cost (ADMIN only).
+    
+    Counters cover every client of the database (backend, functions, SQL
+    editor) since the last reset. Queries issued by the backend carry a
+    /* selfdb:module.function */ tag, reported as `source`; per-table queries
+    from the tables API share a tag but not a queryid. pg_stat_statements keeps
+    the first text seen per queryid, so `source` is that text's tag; identical
+    statements from other call sites are counted under it.
+    """
+    query = psycopg_sql.SQL(INSIGHTS_SQL).format(psycopg_sql.Identifier(INSIGHT_SORT_COLUMNS[sort_by]))
+    try:
+        result = await db.execute(query, {"source": source, "limit": limit})
+        records = await result.fetchall()
+        result = await db.execute("SELECT stats_reset FROM pg_stat_statements_info")
+        info = await result.fetchone()
+    except STATS_UNAVAILABLE_ERRORS as e:
+        raise _stats_unavailable(e)
+    
+    return SqlInsightsResponse(
+        sort_by=sort_by,
+        stats_since=info['stats_reset'] if info else None,
+        queries=[SqlQueryInsight(**record) for record in records]
+    )
+
+
+@router.post(
+    "/insights/reset",
+    status_code=status.HTTP_204_NO_CONTENT,
+    responses=RESP_ERRORS,
+    summary="Reset Query Insights",
+    description="Discard all pg_stat_statements counters, e.g. before measuring a change. Admin only. Requires authentication and API key."
+)
+async def reset_query_insights(
+    db: psycopg.AsyncConnection = Depends(get_db),
+    current_user: UserInDB = Depends(require_admin),
+) -> None:
+    """Reset pg_stat_statements for every database and user."""
+    try:
+        await db.execute("SELECT pg_stat_statements_reset()")
+        await db.commit()
+    except STATS_UNAVAILABLE_ERRORS as e:
+        raise _stats_unavailable(e)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# SQL JOBS
+# ─────────────────────────────────────────────────────────────────────────────
+
+SQL_JOB_COLUMNS = """
+    id, query, is_read_only, status, columns, row_count, truncated, error,
+    created_at, started_at, finished_at, expires_at
+"""
+
+# Runner tasks of this worker's jobs, until they finish
+_job_tasks: Dict[UUID, asyncio.Task] = {}
+_job_slots: asyncio.Semaphore | None = None
+
+
+class SqlJobCancelled(Exception):
+    """Raised in a job runner when the job was cancelled between result batches."""
+
+
+def _job_semaphore() -> asyncio.Semaphore:
+    global _job_slots
+    if _job_slots is None:
+        _job_slots = asyncio.Semaphore(settings.SQL_JOB_MAX_CONCURRENT)
+    return _job_slots
+
+
+def _job_read(record: Dict[str, Any]) -> SqlJobRead:
+    started_at, finished_at = record['started_at'], record['finished_at']
+    execution_time = (finished_at - started_at).total_seconds() if started_at and finished_at else None
+    return SqlJobRead(**record, execution_time=execution_time)
+
+
+async def _get_job(db: psycopg.AsyncConnection, job_id: UUID, user_id: UUID) -> Dict[str, Any]:
+    result = await db.execute(
+        f"SELECT {SQL_JOB_COLUMNS} FROM sql_jobs WHERE id = %s AND user_id = %s AND expires_at > now()",
+        (job_id, user_id)
+    )
+    record = await result.fetchone()
+    if not record:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="SQL job not found")
+    return record
+
+
+async def _store_job_result(
+    conn: psycopg.AsyncConnection,
+    book: psycopg.AsyncConnection,
+    job_id: UUID,
+    statements: List[SqlStatement],
+    max_rows: int
+) -> Tuple[int, bool]:
+    """
+    Run a read-only job query on conn and store its rows batch by batch through
+    book, committing each batch so progress and partial results are visible
+    while the query runs.
+    
+    Returns:
+        (row_count, truncated)
+    """
+    row_count = 0
+    size = 0
+    truncated = False
+    async with aclosing(iter_result_batches(conn, statements)) as batches:
+        async for columns, rows in batches:
+            encoded, truncated = encode_rows_within_limits(
+                rows, max_rows - row_count, settings.SQL_JOB_MAX_RESULT_BYTES - size
+            )
+            if encoded:
+                await book.execute(
+                    "INSERT INTO sql_job_results (job_id, first_row, row_count, rows) VALUES (%s, %s, %s, %s::jsonb)",
+                    (job_id, row_count, len(encoded), "[" + ", ".join(encoded) + "]")
+                )
+                row_count += len(encoded)
+                size += sum(len(line) for line in encoded)
+            result = await book.execute(
+                "UPDATE sql_jobs SET columns = %s, row_count = %s, truncated = %s WHERE id = %s RETURNING status",
+                (Jsonb(columns), row_count, truncated, job_id)
+            )
+            job = await result.fetchone()
+            await book.commit()
+            
+            # pg_cancel_backend only interrupts a statement in flight, so also stop between batches
+            if job is None or job['status'] == SqlJobStatus.CANCELLING.value:
+                raise SqlJobCancelled("Job was cancelled")
+            if truncated:
+                break
+    return row_count, truncated
+
+
+async def _finish_job(
+    book: psycopg.AsyncConnection,
+    job_id: UUID,
     query: str,
     is_read_only: bool,
-    execution_time: float,
-    row_count: int,
+    user_id: UUID,
+    job_status: SqlJobStatus,
+    row_count: int | None,
+    truncated: bool,
     error: str | None,
+    execution_time: float
+) -> None:
+    """Record the job outcome and its timing in sql_history."""
+    try:
+        await book.rollback()
+        await book.execute(
+            """
+            UPDATE sql_jobs
+            SET status = %s, row_count = COALESCE(%s, row_count), truncated = %s, error = %s,
+                finished_at = now(), expires_at = now() + make_interval(secs => %s)
+            WHERE id = %s
+            """,
+            (job_status.value, row_count, truncated, error, settings.SQL_JOB_RESULT_TTL_SECONDS, job_id)
+        )
+        await book.commit()
+        record_sql_history(
+            query=query,
+            is_read_only=is_read_only,
+            execution_time=execution_time,
+            row_count=row_count or 0,
+            error=error,
+            user_id=user_id,
+            job_id=job_id
+        )
+    except Exception as e:
+        print(f"[{datetime.now()}] Failed to record SQL job {job_id}: {e}")
+
+
+async def _run_sql_job(
+    job_id: UUID,
+    query: str,
+    statements: List[SqlStatement],
+    is_read_only: bool,
+    max_rows: int,
     user_id: UUID
 ) -> None:
-    """Save query execution to history."""
-    history_id = uuid.uuid4()
+    """Run a submitted job once one of this worker's SQL_JOB_MAX_CONCURRENT slots is free."""
+    async with _job_semaphore():
+        async with database.pool.connection() as book, database.pool.connection() as conn:
+            # The job runs in a single transaction, so PgBouncer keeps it on one backend.
+            # Its pid plus the transaction start (xact_start) let cancel target exactly this run.
+            result = await conn.execute("SELECT pg_backend_pid() AS pid, now() AS started_at")
+            backend = await result.fetchone()
+            result = await book.execute(
+                """
+                UPDATE sql_jobs
+                SET status = 'running', backend_pid = %s, started_at = %s
+                WHERE id = %s AND status = 'queued'
+                RETURNING id
+                """,
+                (backend['pid'], backend['started_at'], job_id)
+            )
+            claimed = await result.fetchone()
+            await book.commit()
+            if claimed is None:
+                # Cancelled (or expired) while queued
+                await conn.rollback()
+                return
+            
+            start_time = time.time()
+            job_status = SqlJobStatus.FAILED
+            row_count = None
+            truncated = False
+            error = "Server shut down before the job finished"
+            try:
+                if is_read_only:
+                    row_count, truncated = await _store_job_result(conn, book, job_id, statements, max_rows)
+                    await conn.commit()
+                else:
+                    row_count = await execute_write_query(conn, query, user_id)
+                job_status, error = SqlJobStatus.SUCCEEDED, None
+            except (SqlJobCancelled, psycopg.errors.QueryCanceled) as e:
+                job_status, error = SqlJobStatus.CANCELLED, str(e)
+            except Exception as e:
+                error = str(e)
+            finally:
+                if job_status != SqlJobStatus.SUCCEEDED:
+                    try:
+                        await conn.rollback()
+                    except Exception:
+                        pass
+                await _finish_job(
+                    book, job_id, query, is_read_only, user_id,
+                    job_status, row_count, truncated, error, time.time() - start_time
+                )
+
+
+async def _fail_orphaned_jobs(db: psycopg.AsyncConnection) -> None:
+    """
+    Finish running jobs whose runner is gone (worker killed or OOM): their
+    recorded backend is no longer inside the job's transaction. A runner that
+    has just committed gets its real outcome written by _finish_job anyway.
+    """
     await db.execute(
         """
-        INSERT INTO sql_history (id, query, is_read_only, execution_time, row_count, error, user_id, executed_at)
-        VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+        UPDATE sql_jobs j
+        SET status = CASE WHEN j.status = 'cancelling' THEN 'cancelled' ELSE 'failed' END,
+            error = 'Job runner stopped before the job finished',
+            finished_at = now(), expires_at = now() + make_interval(secs => %s)
+        WHERE j.status IN ('running', 'cancelling')
+          AND NOT EXISTS (
+              SELECT 1 FROM pg_stat_activity a
+              WHERE a.pid = j.backend_pid AND a.xact_start = j.started_at
+          )
         """,
-        (history_id, query, is_read_only, execution_time, row_count, error, user_id, datetime.now(timezone.utc))
+        (settings.SQL_JOB_RESULT_TTL_SECONDS,)
     )
+
+
+async def recover_sql_jobs() -> None:
+    """Mark jobs left running by a dead worker as failed (on startup)."""
+    try:
+        async with database.pool.connection() as conn:
+            await _fail_orphaned_jobs(conn)
+    except Exception as e:
+        print(f"[{datetime.now()}] Failed to recover orphaned SQL jobs: {e}")
+
+
+async def stop_sql_jobs() -> None:
+    """Cancel this worker's SQL jobs on shutdown and mark them failed."""
+    job_ids = list(_job_tasks)
+    tasks = list(_job_tasks.values())
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    
+    if not job_ids:
+        return
+    try:
+        # Jobs still waiting for a slot never reached their runner's bookkeeping
+        async with database.pool.connection() as conn:
+            await conn.execute(
+                """
+                UPDATE sql_jobs
+                SET status = 'failed', error = 'Server shut down before the job started', finished_at = now()
+                WHERE id = ANY(%s) AND status = 'queued'
+                """,
+                (job_ids,)
+            )
+    except Exception as e:
+        print(f"[{datetime.now()}] Failed to mark queued SQL jobs as failed: {e}")
+
+
+@router.post(
+    "/jobs",
+    response_model=SqlJobRead,
+    status_code=status.HTTP_202_ACCEPTED,
+    responses=RESP_ERRORS,
+    summary="Submit SQL Job",
+    description="Run a SQL query in the background and return a job id to poll. Only ADMIN users can execute queries. Requires authentication and API key."
+)
+async def submit_sql_job(
+    request: SqlQueryRequest,
+    db: psycopg.AsyncConnection = Depends(get_db),
+    current_user: UserInDB = Depends(require_admin),
+) -> SqlJobRead:
+    """
+    Submit a long-running query as an async job (ADMIN only).
+    
+    The query runs on this worker outside the HTTP request, so proxies and
+    client timeouts don't apply. Read-only results are stored in batches as
+    they are fetched (up to max_rows, capped by SQL_JOB_MAX_ROWS) and can be
+    paged through while the job is still running. Jobs and their results are
+    kept for SQL_JOB_RESULT_TTL_SECONDS after they finish.
+    """
+    query = request.query.strip()
+    statements = split_statements(query)
+    validate_query_security(query, statements)
+    is_read_only = is_read_only_query(statements)
+    
+    # Purge expired jobs (their results cascade) and orphaned ones before adding a new one
+    await db.execute("DELETE FROM sql_jobs WHERE expires_at < now()")
+    await _fail_orphaned_jobs(db)
+    
+    job_id = uuid.uuid4()
+    result = await db.execute(
+        f"""
+        INSERT INTO sql_jobs (id, query, is_read_only, user_id, expires_at)
+        VALUES (%s, %s, %s, %s, now() + make_interval(secs => %s))
+        RETURNING {SQL_JOB_COLUMNS}
+        """,
+        (job_id, query, is_read_only, current_user.id, settings.SQL_JOB_RESULT_TTL_SECONDS)
+    )
+    record = await result.fetchone()
     await db.commit()
+    
+    max_rows = result_row_limit(request.max_rows, settings.SQL_JOB_MAX_ROWS)
+    task = asyncio.create_task(_run_sql_job(job_id, query, statements, is_read_only, max_rows, current_user.id))
+    _job_tasks[job_id] = task
+    task.add_done_callback(lambda _: _job_tasks.pop(job_id, None))
+    
+    return _job_read(record)
+
+
+@router.get(
+    "/jobs/{job_id}",
+    response_model=SqlJobRead,
+    responses=RESP_ERRORS,
+    summary="Get SQL Job",
+    description="Get the status of an async SQL job. Only ADMIN users can access. Requires authentication and API key."
+)
+async def get_sql_job(
+    job_id: UUID,
+    db: psycopg.AsyncConnection = Depends(get_db),
+    current_user: UserInDB = Depends(require_admin),
+) -> SqlJobRead:
+    """Get an async SQL job's status and progress."""
+    return _job_read(await _get_job(db, job_id, current_user.id))
+
+
+@router.get(
+    "/jobs/{job_id}/result",
+    response_model=SqlJobResult,
+    responses=RESP_ERRORS,
+    summary="Get SQL Job Result",
+    description="Page through the rows stored for an async SQL job, including partial results of a running job. Only ADMIN users can access. Requires authentication and API key."
+)
+async def get_sql_job_result(
+    job_id: UUID,
+    offset: Annotated[int, Query(ge=0, description="Index of the first row to return")] = 0,
+    limit: Annotated[int, Query(ge=1, le=10000, description="Maximum number of rows to return")] = 1000,
+    db: psycopg.AsyncConnection = Depends(get_db),
+    current_user: UserInDB = Depends(require_admin),
+) -> SqlJobResult:
+    """Get a page of an async SQL job's result rows."""
+    job = await _get_job(db, job_id, current_user.id)
+    
+    # Only the stored batches overlapping [offset, offset + limit) are read
+    result = await db.execute(
+        """
+        SELECT first_row, rows
+        FROM sql_job_results
+        WHERE job_id = %s AND first_row < %s AND first_row + row_count > %s
+        ORDER BY first_row
+        """,
+        (job_id, offset + limit, offset)
+    )
+    batches = await result.fetchall()
+    
+    data: List[Dict[str, Any]] = []
+    if batches:
+        skip = offset - batches[0]['first_row']
+        data = [row for batch in batches for row in batch['rows']][skip:skip + limit]
+    
+    return SqlJobResult(
+        id=job['id'],
+        status=job['status'],
+        columns=job['columns'],
+        data=data,
+        offset=offset,
+        row_count=job['row_count'],
+        truncated=job['truncated'],
+        has_more=offset + len(data) < job['row_count']
+    )
 
 
+@router.post(
+    "/jobs/{job_id}/cancel",
+    response_model=SqlJobRead,
+    responses=RESP_ERRORS,
+    summary="Cancel SQL Job",
+    description="Cancel a queued or running async SQL job. Only ADMIN users can access. Requires authentication and API key."
+)
+async def cancel_sql_job(
+    job_id: UUID,
+    db: psycopg.AsyncConnection = Depends(get_db),
+    current_user: UserInDB = Depends(require_admin),
+) -> SqlJobRead:
+    """
+    Cancel an async SQL job.
+    
+    A queued job is cancelled immediately. A running job is marked cancelling
+    and its statement is interrupted with pg_cancel_backend - only if that pid
+    is still inside the job's own transaction, so a reused pid is never hit.
+    The job reports cancelled once its runner has rolled back.
+    """
+    result = await db.execute(
+        f"""
+        UPDATE sql_jobs
+        SET status = CASE WHEN status = 'queued' THEN 'cancelled' ELSE 'cancelling' END,
+            finished_at = CASE WHEN status = 'queued' THEN now() ELSE finished_at END
+        WHERE id = %s AND user_id = %s AND expires_at > now() AND status IN ('queued', 'running')
+        RETURNING backend_pid, {SQL_JOB_COLUMNS}
+        """,
+        (job_id, current_user.id)
+    )
+    record = await result.fetchone()
+    
+    if record is None:
+        job = await _get_job(db, job_id, current_user.id)
+        if job['status'] == SqlJobStatus.CANCELLING.value:
+            return _job_read(job)
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="SQL job has already finished")
+    
+    backend_pid = record.pop('backend_pid')
+    if record['status'] == SqlJobStatus.CANCELLING.value:
+        await db.execute(
+            """
+            SELECT pg_cancel_backend(pid)
+            FROM pg_stat_activity
+            WHERE pid = %s AND xact_start = %s
+            """,
+            (backend_pid, record['started_at'])
+        )
+    await db.commit()
+    
+    return _job_read(record)
+
 # ─────────────────────────────────────────────────────────────────────────────
 # SQL HISTORY
 # ─────────────────────────────────────────────────────────────────────────────
@@ -633,7 +1283,8 @@ async def get_query_history(
     
     result = await db.execute(
         """
-        SELECT id, query, is_read_only, execution_time, row_count, error, executed_at
+        SELECT id, query, is_read_only, execution_time, row_count, error, job_id,
+               plan IS NOT NULL AS has_plan, executed_at
         FROM sql_history
         WHERE user_id = %s
         ORDER BY executed_at DESC
@@ -648,6 +1299,34 @@ async def get_query_history(
     return SqlHistoryListResponse(history=history)
 
 
+@router.get(
+    "/history/{history_id}/plan",
+    response_model=SqlExplainResult,
+    responses=RESP_ERRORS,
+    summary="Get Stored Query Plan",
+    description="Get the EXPLAIN plan stored with a history entry by POST /sql/explain. Admin only. Requires authentication and API key."
+)
+async def get_history_plan(
+    history_id: UUID,
+    db: psycopg.AsyncConnection = Depends(get_db),
+    current_user: UserInDB = Depends(require_admin),
+) -> SqlExplainResult:
+    """Get a stored plan, structured like the POST /sql/explain response."""
+    
+    result = await db.execute(
+        "SELECT query, plan FROM sql_history WHERE id = %s AND user_id = %s AND plan IS NOT NULL",
+        (history_id, current_user.id)
+    )
+    record = await result.fetchone()
+    if not record:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No plan stored for this history entry"
+        )
+    
+    return build_explain_result(record['query'], record['plan'], history_id)
+
+
 @router.delete(
     "/history",
     status_code=status.HTTP_204_NO_CONTENT,
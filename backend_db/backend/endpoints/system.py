@@ -1,10 +1,14 @@
 # system.py
-from fastapi import APIRouter, Depends
+from typing import Literal
+from fastapi import APIRouter, Depends, HTTPException, status
 from pydantic import BaseModel
 import psycopg
 
-from db import get_db
+from db import get_db, get_pool_stats
+from models.user import UserInDB
+from security import get_current_active_user
 from services.backup_service import get_system_initialized
+from services.cache_service import get_cache_stats
 
 router = APIRouter(prefix="/system", tags=["system"])
 
@@ -16,6 +20,41 @@ class SystemStatus(BaseModel):
     initialized: bool
     version: str
 
+class DbPoolStats(BaseModel):
+    mode: Literal["null", "pool"]
+    pool_min: int
+    pool_max: int
+    pool_size: int
+    pool_available: int
+    connections_in_use: int
+    requests_waiting: int
+    requests_num: int = 0
+    requests_queued: int = 0
+    requests_wait_ms: int = 0
+    requests_errors: int = 0
+    requests_timeouts: int = 0
+    avg_wait_ms: float
+    connections_num: int = 0
+    connections_ms: int = 0
+    connections_errors: int = 0
+    connections_lost: int = 0
+
+class CacheStats(BaseModel):
+    enabled: bool
+    size: int
+    max_size: int
+    ttl_seconds: float
+    hits: int
+    misses: int
+    hit_ratio: float
+    evictions: int
+    expirations: int
+    invalidations: int
+
+class CacheStatsResponse(BaseModel):
+    listener_connected: bool
+    caches: dict[str, CacheStats]
+
 class ErrorResponse(BaseModel):
     detail: str
 
@@ -29,6 +68,14 @@ RESP_ERRORS = {
     406: {"model": ErrorResponse, "description": "Not Acceptable"},
 }
 
+def require_admin(current_user: UserInDB) -> None:
+    """Raise 403 unless the user is an admin."""
+    if current_user.role != "ADMIN":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin access required"
+        )
+
 # ─────────────────────────────────────────────────────────────────────────────
 # Endpoints
 # ─────────────────────────────────────────────────────────────────────────────
@@ -58,3 +105,49 @@ async def get_system_status(
         initialized=initialized,
         version="1.0.0"
     )
+
+
+@router.get(
+    "/db-pool",
+    response_model=DbPoolStats,
+    responses=RESP_ERRORS,
+    summary="Get Database Pool Stats",
+    description="Returns connection pool gauges for this worker. Requires API key and admin role."
+)
+async def get_db_pool_stats(
+    current_user: UserInDB = Depends(get_current_active_user)
+) -> DbPoolStats:
+    """
+    Connection pool gauges for the worker that served the request.
+    
+    - **mode**: "null" (connection per request) or "pool" (persistent connections)
+    - **connections_in_use**: connections currently checked out by requests
+    - **requests_waiting**: requests queued for a free connection right now
+    - **avg_wait_ms**: mean time spent waiting for a connection since startup
+    
+    Counters are per worker process and reset on restart.
+    """
+    require_admin(current_user)
+    return DbPoolStats(**get_pool_stats())
+
+
+@router.get(
+    "/cache-stats",
+    response_model=CacheStatsResponse,
+    responses=RESP_ERRORS,
+    summary="Get Cache Stats",
+    description="Returns in-process cache counters for this worker. Requires API key and admin role."
+)
+async def get_system_cache_stats(
+    current_user: UserInDB = Depends(get_current_active_user)
+) -> CacheStatsResponse:
+    """
+    Hit, miss and eviction counters of the in-process metadata caches.
+    
+    - **listener_connected**: False while the LISTEN connection is down; caches are bypassed
+    - **caches**: Counters per cache (e.g. "users")
+    
+    Counters are per worker process and reset on restart.
+    """
+    require_admin(current_user)
+    return CacheStatsResponse(**get_cache_stats())
@@ -2,19 +2,38 @@
 from uuid import UUID
 import uuid
 import json
+import base64
+import binascii
+import csv
+import time
+from dataclasses import dataclass
 from typing import List, Annotated, Dict, Any, Optional, Literal
 from datetime import datetime, timezone
 import psycopg
 from psycopg import sql
 from psycopg.errors import UniqueViolation, UndefinedColumn, DuplicateColumn
 from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
-from pydantic import BaseModel
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
 
-from models.table import TableCreate, TableRead, TableUpdate, TableInDB, TableDeleteResponse, RowDeleteResponse
-from db import get_db
+from models.table import TableCreate, TableRead, TableUpdate, TableInDB, TableDeleteResponse, RowDeleteResponse, TableStats
+from db import get_db, disable_registry_sync
 from security import get_current_active_user, get_optional_current_user
 from models.user import UserInDB
 from utils.validation import validate_search_term, SEARCH_TERM_REGEX
+from services.cache_service import table_cache
+from services.row_count_service import record_row_delta
+from utils.counting import CountStrategy, COUNT_STRATEGY_DESCRIPTION, count_rows
+from utils.ingest import BulkFormat, iter_records, copy_error_index
+from utils.export import ExportFormat, EXPORT_MEDIA_TYPES, stream_export
+from utils.table_stats import fetch_table_stats
+from utils.search import (
+    SearchMethod,
+    TS_CONFIG_PATTERN,
+    ilike_clause,
+    fulltext_clause,
+    search_index_ddl,
+)
 
 router = APIRouter(prefix="/tables", tags=["tables"])
 
@@ -54,12 +73,51 @@ class ColumnUpdate(BaseModel):
     nullable: Optional[bool] = None
     default: Optional[str] = None
 
+class SearchIndexCreate(BaseModel):
+    """Model for creating a table's search index."""
+    method: SearchMethod  # "trigram" (substring, pg_trgm) or "fulltext" (word search, tsvector)
+    columns: Optional[List[str]] = None  # Defaults to all text columns
+    language: str = Field(default="simple", max_length=63)  # Text search configuration (fulltext only)
+
+class SearchIndexResponse(BaseModel):
+    """Search index configuration of a table."""
+    method: Literal["ilike", "trigram", "fulltext"]
+    columns: List[str]
+    language: Optional[str] = None
+    indexes: List[str] = []
+
 class TableDataResponse(BaseModel):
     """Response model for table data with metadata."""
     data: List[Dict[str, Any]]
-    total: int
+    total: Optional[int]  # None when count=none
     page: int
     page_size: int
+    has_more: bool = False
+    count_strategy: CountStrategy = "exact"  # Strategy that actually produced total
+    next_cursor: Optional[str] = None  # Cursor pagination only - None on the last page
+
+class BulkBatchResult(BaseModel):
+    """Outcome of one COPY batch of a bulk insert."""
+    batch: int
+    first_row: int
+    last_row: int
+    inserted: int
+    failed: int
+    duration_ms: float
+
+class BulkRowError(BaseModel):
+    """A rejected row of a bulk insert."""
+    row: Optional[int]  # 1-based data row (CSV header not counted), None if not tied to a row
+    detail: str
+
+class BulkInsertResponse(BaseModel):
+    """Response model for bulk inserts."""
+    status: Literal["completed", "aborted"]
+    inserted: int
+    failed: int
+    batches: List[BulkBatchResult]
+    errors: List[BulkRowError]
+    duration_ms: float
 
 # ─────────────────────────────────────────────────────────────────────────────
 # Helper Functions
@@ -94,12 +152,182 @@ async def get_table_from_db(
     table_id: UUID, 
     db: psycopg.AsyncConnection = Depends(get_db)
 ) -> TableInDB:
-    result = await db.execute("SELECT * FROM tables WHERE id = %s", (table_id,))
+    result = await db.execute("SELECT * FROM tables WHERE id = %s /* selfdb:tables.get_table_from_db */", (table_id,))
     record = await result.fetchone()
     if not record:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Table not found")
     return TableInDB(**record)
 
+
+async def save_table_schema(db: psycopg.AsyncConnection, table_id: UUID, schema: Dict[str, Any]) -> None:
+    """Write a table's edited column schema to the registry (caller commits)."""
+    await db.execute(
+        "UPDATE tables SET table_schema = %s, updated_at = %s WHERE id = %s /* selfdb:tables.save_table_schema */",
+        (psycopg.types.json.Json(schema), datetime.now(timezone.utc), table_id)
+    )
+
+
+TEXT_COLUMN_TYPES = ('TEXT', 'VARCHAR', 'CHAR', 'STRING')
+
+
+def strip_reserved_metadata(metadata: Dict[str, Any] | None) -> Dict[str, Any]:
+    """Drop search_index from client-supplied metadata - only the search-index endpoints write it."""
+    return {k: v for k, v in (metadata or {}).items() if k != "search_index"}
+
+
+@dataclass(frozen=True)
+class TableMeta:
+    """A table registry row plus the column metadata derived from its schema."""
+    table: TableInDB
+    valid_columns: tuple[str, ...]
+    valid_column_set: frozenset[str]
+    text_columns: tuple[str, ...]
+    id_type: str | None  # Lowercased type of the "id" column, if any
+    search_method: Literal["ilike", "trigram", "fulltext"]  # How search is served
+    search_columns: tuple[str, ...]  # Columns the search clause covers
+    search_clause: str  # Prebuilt WHERE predicate with %s placeholders, "" if no searchable columns
+
+    def search_params(self, search: str) -> list[Any]:
+        """Parameters for search_clause."""
+        if self.search_method == "fulltext":
+            return [search]
+        return [f"%{search}%"] * len(self.search_columns)
+
+    @classmethod
+    def from_table(cls, table: TableInDB) -> "TableMeta":
+        schema = table.table_schema or {}
+        valid_columns = []
+        text_columns = []
+        for col_name, col_def in schema.items():
+            valid_columns.append(col_name)
+            if isinstance(col_def, dict):
+                col_type = col_def.get('type', '').upper()
+            else:
+                col_type = str(col_def).upper()
+            # Include text-like columns for search
+            if any(t in col_type for t in TEXT_COLUMN_TYPES):
+                text_columns.append(col_name)
+        
+        id_type = None
+        if 'id' in schema:
+            id_type = schema['id'].get('type', '').lower() if isinstance(schema['id'], dict) else str(schema['id']).lower()
+        
+        # Use the table's search index when one is configured and all of its
+        # columns still exist, otherwise fall back to ILIKE over text columns
+        search_method = "ilike"
+        search_columns = tuple(text_columns)
+        search_clause = ilike_clause(search_columns)
+        index = (table.metadata or {}).get("search_index") or {}
+        index_columns = tuple(index.get("columns") or ())
+        if index_columns and all(col in schema for col in index_columns):
+            if index.get("method") == "trigram":
+                search_method = "trigram"
+                search_columns = index_columns
+                search_clause = ilike_clause(index_columns)
+            elif index.get("method") == "fulltext" and TS_CONFIG_PATTERN.match(str(index.get("language", "simple"))):
+                # The language is spliced into the SQL (it must match the index
+                # expression), so anything but a plain identifier falls back to ILIKE
+                search_method = "fulltext"
+                search_columns = index_columns
+                search_clause = fulltext_clause(index_columns, index.get("language", "simple"))
+        
+        return cls(
+            table=table,
+            valid_columns=tuple(valid_columns),
+            valid_column_set=frozenset(valid_columns),
+            text_columns=tuple(text_columns),
+            id_type=id_type,
+            search_method=search_method,
+            search_columns=search_columns,
+            search_clause=search_clause,
+        )
+
+
+async def get_table_meta(
+    table_id: UUID,
+    db: psycopg.AsyncConnection = Depends(get_db)
+) -> TableMeta:
+    """
+    Cached variant of get_table_from_db for the row data endpoints.
+    
+    Entries are invalidated by the tables_realtime_notify triggers whenever the
+    table is renamed, deleted or its schema/visibility changes. row_count is
+    not refreshed on cache hits, so endpoints that return the registry row or
+    modify it keep using get_table_from_db.
+    """
+    key = str(table_id)
+    meta = table_cache.get(key)
+    if meta is not None:
+        return meta
+    
+    generation = table_cache.generation
+    meta = TableMeta.from_table(await get_table_from_db(table_id, db))
+    table_cache.set(key, meta, generation)
+    return meta
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Keyset (Cursor) Pagination Helpers
+# ─────────────────────────────────────────────────────────────────────────────
+
+# Tie-breaker column for keyset pagination - must be unique per row
+CURSOR_KEY_COLUMN = "id"
+
+
+def encode_cursor(sort_by: str, sort_order: str, row: Dict[str, Any]) -> str:
+    """Build the opaque next-page token from the last row of a page."""
+    payload = {
+        "s": sort_by,
+        "o": sort_order,
+        "v": row.get(sort_by),
+        "k": row.get(CURSOR_KEY_COLUMN),
+    }
+    raw = json.dumps(payload, default=str, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_by: str, sort_order: str) -> tuple[Any, Any]:
+    """Return (sort value, key value) from a token, rejecting tokens from another sort."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        value, key = payload["v"], payload["k"]
+        cursor_sort = (payload["s"], payload["o"])
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+    
+    if cursor_sort != (sort_by, sort_order) or key is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cursor does not match the requested sort_by/sort_order"
+        )
+    if isinstance(value, (dict, list)):
+        value = psycopg.types.json.Jsonb(value)
+    return value, key
+
+
+def build_keyset_condition(sort_by: str, sort_order: str, value: Any, key: Any) -> tuple[str, list[Any]]:
+    """
+    WHERE fragment seeking past (value, key) in ORDER BY sort_by, id.
+    
+    Matches Postgres' default NULL placement (NULLS LAST for ASC, NULLS FIRST
+    for DESC) so rows with a NULL sort value are neither skipped nor repeated.
+    """
+    key_col = f'"{CURSOR_KEY_COLUMN}"'
+    if sort_by == CURSOR_KEY_COLUMN:
+        op = ">" if sort_order == "asc" else "<"
+        return f"{key_col} {op} %s", [key]
+    
+    col = f'"{sort_by}"'
+    if sort_order == "asc":
+        if value is None:
+            return f"({col} IS NULL AND {key_col} > %s)", [key]
+        return f"(({col}, {key_col}) > (%s, %s) OR {col} IS NULL)", [value, key]
+    
+    if value is None:
+        return f"(({col} IS NULL AND {key_col} < %s) OR {col} IS NOT NULL)", [key]
+    return f"({col}, {key_col}) < (%s, %s)", [value, key]
+
+
 async def require_table_owner(
     table: TableInDB = Depends(get_table_from_db),
     current_user: UserInDB = Depends(get_current_active_user)
@@ -119,41 +347,44 @@ async def require_table_owner(
 @router.get(
     "/count",
     response_model=int,
-    dependencies=[Depends(strict_query_params({"search"}))],
+    dependencies=[Depends(strict_query_params({"search", "count"}))],
     responses=RESP_ERRORS,
     summary="Get Table Count"
 )
 async def get_table_count(
+    response: Response,
     search: Annotated[str | None, Query(max_length=100, pattern=SEARCH_TERM_REGEX, description="Search term for filtering by name or description")] = None,
+    count: Annotated[Literal["exact", "planned", "estimated"], Query(description=COUNT_STRATEGY_DESCRIPTION)] = "exact",
     db: psycopg.AsyncConnection = Depends(get_db),
     current_user: UserInDB | None = Depends(get_optional_current_user)
 ) -> int:
-    """Get total number of tables accessible to the user, optionally filtered by search term."""
+    """
+    Get total number of tables accessible to the user, optionally filtered by search term.
+    
+    The X-Count-Strategy response header names the strategy that produced the count.
+    """
     # Validate search term for safe characters
     search = validate_search_term(search)
     search_pattern = f"%{search}%" if search else None
     
     if current_user is None:
         if search:
-            result = await db.execute(
-                "SELECT COUNT(*) FROM tables WHERE public = TRUE AND (name ILIKE %s OR description ILIKE %s)",
-                (search_pattern, search_pattern)
-            )
+            from_clause = "FROM tables WHERE public = TRUE AND (name ILIKE %s OR description ILIKE %s)"
+            params = (search_pattern, search_pattern)
         else:
-            result = await db.execute("SELECT COUNT(*) FROM tables WHERE public = TRUE")
+            from_clause = "FROM tables WHERE public = TRUE"
+            params = None
     else:
         if search:
-            result = await db.execute(
-                "SELECT COUNT(*) FROM tables WHERE (public = TRUE OR owner_id = %s) AND (name ILIKE %s OR description ILIKE %s)",
-                (current_user.id, search_pattern, search_pattern)
-            )
+            from_clause = "FROM tables WHERE (public = TRUE OR owner_id = %s) AND (name ILIKE %s OR description ILIKE %s)"
+            params = (current_user.id, search_pattern, search_pattern)
         else:
-            result = await db.execute(
-                "SELECT COUNT(*) FROM tables WHERE public = TRUE OR owner_id = %s",
-                (current_user.id,)
-            )
-    row = await result.fetchone()
-    return row['count'] if row else 0
+            from_clause = "FROM tables WHERE public = TRUE OR owner_id = %s"
+            params = (current_user.id,)
+    
+    total, count_strategy = await count_rows(db, from_clause, params, count)
+    response.headers["X-Count-Strategy"] = count_strategy
+    return total
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -219,14 +450,16 @@ async def create_table(
         # Create the user's data table
         columns_sql = ', '.join(column_defs) if column_defs else 'id SERIAL PRIMARY KEY'
         create_table_sql = f'CREATE TABLE IF NOT EXISTS "{table_data["name"]}" ({columns_sql})'
+        await disable_registry_sync(db)
         await db.execute(create_table_sql)
         
         # Then insert metadata into the tables registry
         # psycopg3 handles JSON automatically with Json adapter
         await db.execute(
             """
-            INSERT INTO tables (id, name, table_schema, public, owner_id, description, metadata, row_count, created_at, updated_at)
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+            INSERT INTO tables (id, name, table_schema, public, owner_id, description, metadata, row_count, table_oid, created_at, updated_at)
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, to_regclass(%s), %s, %s)
+            /* selfdb:tables.create_table */
             """,
             (
                 table_id,
@@ -235,22 +468,21 @@ async def create_table(
                 table_data['public'],
                 current_user.id,
                 table_data.get('description'),
-                psycopg.types.json.Json(table_data.get('metadata', {})),
+                psycopg.types.json.Json(strip_reserved_metadata(table_data.get('metadata'))),
                 0,
+                f'"{table_data["name"]}"',
                 now,
                 now
             )
         )
         await db.commit()
         
-        result = await db.execute("SELECT * FROM tables WHERE id = %s", (table_id,))
-        created_record = await result.fetchone()
-        return TableInDB(**created_record)
+        return await get_table_from_db(table_id, db)
 
     except UniqueViolation:
         await db.rollback()
         # Idempotency: If exact table exists, return it
-        result = await db.execute("SELECT * FROM tables WHERE name = %s", (table.name,))
+        result = await db.execute("SELECT * FROM tables WHERE name = %s /* selfdb:tables.create_table */", (table.name,))
         existing = await result.fetchone()
         if existing:
             return TableInDB(**existing)
@@ -308,6 +540,7 @@ async def read_tables(
                     WHERE public = TRUE AND (name ILIKE %s OR description ILIKE %s)
                     {} 
                     LIMIT %s OFFSET %s
+                    /* selfdb:tables.read_tables */
                 """).format(order_by)
                 result = await db.execute(query, (search_pattern, search_pattern, limit, skip))
             else:
@@ -316,6 +549,7 @@ async def read_tables(
                     WHERE public = TRUE 
                     {} 
                     LIMIT %s OFFSET %s
+                    /* selfdb:tables.read_tables */
                 """).format(order_by)
                 result = await db.execute(query, (limit, skip))
         else:
@@ -326,6 +560,7 @@ async def read_tables(
                     WHERE (name ILIKE %s OR description ILIKE %s)
                     {} 
                     LIMIT %s OFFSET %s
+                    /* selfdb:tables.read_tables */
                 """).format(order_by)
                 result = await db.execute(query, (search_pattern, search_pattern, limit, skip))
             else:
@@ -333,6 +568,7 @@ async def read_tables(
                     SELECT * FROM tables 
                     {} 
                     LIMIT %s OFFSET %s
+                    /* selfdb:tables.read_tables */
                 """).format(order_by)
                 result = await db.execute(query, (limit, skip))
         
@@ -397,6 +633,13 @@ async def update_table(
     # Strip whitespace from table name if being updated
     if 'name' in update_data:
         update_data['name'] = strip_name(update_data['name'])
+    
+    # Metadata is replaced whole, except the search index key, which is kept as is
+    if 'metadata' in update_data:
+        update_data['metadata'] = strip_reserved_metadata(update_data['metadata'])
+        search_index = (table_in_db.metadata or {}).get("search_index")
+        if search_index is not None:
+            update_data['metadata']['search_index'] = search_index
 
     if not update_data:
         return table_in_db
@@ -408,7 +651,7 @@ async def update_table(
             # Enable realtime - create trigger
             try:
                 await db.execute(
-                    "SELECT enable_realtime_for_table(%s)",
+                    "SELECT enable_realtime_for_table(%s) /* selfdb:tables.update_table */",
                     (table_name,)
                 )
             except Exception as e:
@@ -420,7 +663,7 @@ async def update_table(
             # Disable realtime - drop trigger
             try:
                 await db.execute(
-                    "SELECT disable_realtime_for_table(%s)",
+                    "SELECT disable_realtime_for_table(%s) /* selfdb:tables.update_table */",
                     (table_in_db.name,)  # Use old name in case it's being renamed
                 )
             except Exception as e:
@@ -434,13 +677,14 @@ async def update_table(
         old_name = table_in_db.name
         new_name = update_data['name']
         try:
+            await disable_registry_sync(db)
             await db.execute(f'ALTER TABLE "{old_name}" RENAME TO "{new_name}"')
             
             # If realtime is enabled, we need to recreate the trigger with the new table name
             # (the trigger name references the table name)
             if table_in_db.realtime_enabled or update_data.get('realtime_enabled', False):
-                await db.execute("SELECT disable_realtime_for_table(%s)", (old_name,))
-                await db.execute("SELECT enable_realtime_for_table(%s)", (new_name,))
+                await db.execute("SELECT disable_realtime_for_table(%s) /* selfdb:tables.update_table */", (old_name,))
+                await db.execute("SELECT enable_realtime_for_table(%s) /* selfdb:tables.update_table */", (new_name,))
         except Exception as e:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -457,12 +701,14 @@ async def update_table(
         values.append(value)
     
     values.append(table_id)
-    query = f"UPDATE tables SET {', '.join(set_clauses)} WHERE id = %s RETURNING *"
+    query = f"UPDATE tables SET {', '.join(set_clauses)} WHERE id = %s RETURNING * /* selfdb:tables.update_table */"
     
     try:
         result = await db.execute(query, tuple(values))
         updated_record = await result.fetchone()
         await db.commit()
+        # Other workers are invalidated by the tables_realtime_notify triggers
+        table_cache.invalidate(str(table_id))
         if not updated_record:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Table not found")
         return TableInDB(**updated_record)
@@ -486,11 +732,13 @@ async def delete_table(
     table_in_db, _ = owner_check
     
     # Drop the actual PostgreSQL table
+    await disable_registry_sync(db)
     await db.execute(f'DROP TABLE IF EXISTS "{table_in_db.name}"')
     
     # Delete from tables registry
-    result = await db.execute("DELETE FROM tables WHERE id = %s", (table_id,))
+    result = await db.execute("DELETE FROM tables WHERE id = %s /* selfdb:tables.delete_table */", (table_id,))
     await db.commit()
+    table_cache.invalidate(str(table_id))
     if result.rowcount == 0:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Table not found")
     return TableDeleteResponse(status="table_deleted", id=table_id, name=table_in_db.name)
@@ -527,6 +775,7 @@ async def add_column(
     """
     
     try:
+        await disable_registry_sync(db)
         await db.execute(alter_sql)
         
         # Update table schema metadata - use key-value format matching initial schema structure
@@ -543,11 +792,9 @@ async def add_column(
         if column.default:
             schema[column_name]["default"] = column.default
         
-        await db.execute(
-            "UPDATE tables SET table_schema = %s, updated_at = %s WHERE id = %s",
-            (psycopg.types.json.Json(schema), datetime.now(timezone.utc), table_id)
-        )
+        await save_table_schema(db, table_id, schema)
         await db.commit()
+        table_cache.invalidate(str(table_id))
         
         return {"status": "column_added", "column": column_name}
     except DuplicateColumn:
@@ -586,6 +833,8 @@ async def update_column(
     schema = dict(table_in_db.table_schema)
     
     try:
+        await disable_registry_sync(db)
+        
         # Rename column if new_name provided
         if "new_name" in updates and updates["new_name"]:
             await db.execute(
@@ -626,11 +875,9 @@ async def update_column(
                 if column_name in schema and "default" in schema[column_name]:
                     del schema[column_name]["default"]
         
-        await db.execute(
-            "UPDATE tables SET table_schema = %s, updated_at = %s WHERE id = %s",
-            (psycopg.types.json.Json(schema), datetime.now(timezone.utc), table_id)
-        )
+        await save_table_schema(db, table_id, schema)
         await db.commit()
+        table_cache.invalidate(str(table_id))
         
         return {"status": "column_updated", "column": column_name}
     except Exception as e:
@@ -656,6 +903,7 @@ async def delete_column(
     column_name = strip_name(column_name)
     
     try:
+        await disable_registry_sync(db)
         await db.execute(f'ALTER TABLE "{table_in_db.name}" DROP COLUMN "{column_name}"')
         
         # Update schema metadata - remove the column from schema
@@ -668,11 +916,9 @@ async def delete_column(
             if not schema["columns"]:
                 del schema["columns"]
         
-        await db.execute(
-            "UPDATE tables SET table_schema = %s, updated_at = %s WHERE id = %s",
-            (psycopg.types.json.Json(schema), datetime.now(timezone.utc), table_id)
-        )
+        await save_table_schema(db, table_id, schema)
         await db.commit()
+        table_cache.invalidate(str(table_id))
         
         return {"status": "column_deleted", "column": column_name}
     except UndefinedColumn:
@@ -683,6 +929,199 @@ async def delete_column(
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
 
+# ─────────────────────────────────────────────────────────────────────────────
+# SEARCH INDEX ENDPOINTS
+# ─────────────────────────────────────────────────────────────────────────────
+
+def _search_index_response(table: TableInDB) -> SearchIndexResponse:
+    meta = TableMeta.from_table(table)
+    index = (table.metadata or {}).get("search_index") or {}
+    return SearchIndexResponse(
+        method=meta.search_method,
+        columns=list(meta.search_columns),
+        language=index.get("language") if meta.search_method == "fulltext" else None,
+        indexes=index.get("indexes", []) if meta.search_method != "ilike" else [],
+    )
+
+
+async def _drop_search_indexes(db: psycopg.AsyncConnection, index_names: List[str]) -> None:
+    for name in index_names:
+        await db.execute(f'DROP INDEX CONCURRENTLY IF EXISTS "{name}"')
+
+
+@router.get(
+    "/{table_id:uuid}/search-index",
+    response_model=SearchIndexResponse,
+    responses=RESP_ERRORS,
+    summary="Get Search Index"
+)
+async def get_search_index(
+    table: TableInDB = Depends(get_table_from_db),
+    current_user: UserInDB | None = Depends(get_optional_current_user)
+) -> SearchIndexResponse:
+    """
+    Get how `search` on GET /tables/{table_id}/data is served for this table.
+    
+    - **ilike**: No search index - sequential scan over all text columns
+    - **trigram** / **fulltext**: Served by the table's search index
+    """
+    if not table.public and current_user is None:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Authentication required")
+    return _search_index_response(table)
+
+
+@router.put(
+    "/{table_id:uuid}/search-index",
+    response_model=SearchIndexResponse,
+    responses=RESP_ERRORS,
+    summary="Create Search Index"
+)
+async def create_search_index(
+    table_id: UUID,
+    index: SearchIndexCreate,
+    db: psycopg.AsyncConnection = Depends(get_db),
+    owner_check: tuple[TableInDB, UserInDB] = Depends(require_table_owner)
+) -> SearchIndexResponse:
+    """
+    Create (or replace) the table's search index. Only owner or admin.
+    
+    - **trigram**: pg_trgm GIN index per column. Keeps ILIKE substring semantics;
+      effective for search terms of 3+ characters
+    - **fulltext**: one GIN index on to_tsvector(language, columns). Matches
+      words (websearch syntax: "quoted phrase", -exclude, or)
+    
+    Indexes are built with CREATE INDEX CONCURRENTLY, so the table stays
+    writable while they build. Search only covers the indexed columns.
+    """
+    table_in_db, _ = owner_check
+    meta = TableMeta.from_table(table_in_db)
+    
+    columns = [strip_name(c) for c in index.columns] if index.columns else list(meta.text_columns)
+    if not columns:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Table has no text columns to index")
+    unknown = [c for c in columns if c not in meta.valid_column_set]
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown columns: {', '.join(unknown)}"
+        )
+    
+    language = index.language.strip().lower()
+    if index.method == "fulltext":
+        result = await db.execute("SELECT 1 FROM pg_ts_config WHERE cfgname = %s /* selfdb:tables.create_search_index */", (language,))
+        if not TS_CONFIG_PATTERN.match(language) or not await result.fetchone():
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown text search configuration: '{language}'"
+            )
+    
+    statements = search_index_ddl(table_in_db.name, columns, index.method, language)
+    old_indexes = ((table_in_db.metadata or {}).get("search_index") or {}).get("indexes", [])
+    new_indexes = [name for name, _ in statements]
+    
+    # CREATE/DROP INDEX CONCURRENTLY can't run inside a transaction block
+    await db.commit()
+    await db.set_autocommit(True)
+    try:
+        for name, ddl in statements:
+            try:
+                await db.execute(ddl)
+            except Exception as e:
+                # A failed concurrent build leaves an INVALID index behind
+                await _drop_search_indexes(db, [name])
+                await _drop_search_indexes(db, [n for n in new_indexes if n not in old_indexes])
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Failed to create search index: {str(e)}"
+                )
+        await _drop_search_indexes(db, [n for n in old_indexes if n not in new_indexes])
+    finally:
+        await db.set_autocommit(False)
+    
+    search_index = {
+        "method": index.method,
+        "columns": columns,
+        "language": language,
+        "indexes": new_indexes,
+    }
+    # Only the search_index key is written; other metadata keys are left as they are
+    result = await db.execute(
+        """
+        UPDATE tables SET metadata = COALESCE(metadata, '{}'::jsonb) || jsonb_build_object('search_index', %s::jsonb),
+                          updated_at = %s
+        WHERE id = %s RETURNING *
+        /* selfdb:tables.create_search_index */
+        """,
+        (psycopg.types.json.Json(search_index), datetime.now(timezone.utc), table_id)
+    )
+    updated_record = await result.fetchone()
+    await db.commit()
+    table_cache.invalidate(str(table_id))
+    
+    return _search_index_response(TableInDB(**updated_record))
+
+
+@router.delete(
+    "/{table_id:uuid}/search-index",
+    response_model=SearchIndexResponse,
+    responses=RESP_ERRORS,
+    summary="Delete Search Index"
+)
+async def delete_search_index(
+    table_id: UUID,
+    db: psycopg.AsyncConnection = Depends(get_db),
+    owner_check: tuple[TableInDB, UserInDB] = Depends(require_table_owner)
+) -> SearchIndexResponse:
+    """Drop the table's search index; search falls back to ILIKE. Only owner or admin."""
+    table_in_db, _ = owner_check
+    
+    index = (table_in_db.metadata or {}).get("search_index") or {}
+    
+    await db.commit()
+    await db.set_autocommit(True)
+    try:
+        await _drop_search_indexes(db, index.get("indexes", []))
+    finally:
+        await db.set_autocommit(False)
+    
+    result = await db.execute(
+        "UPDATE tables SET metadata = metadata - 'search_index', updated_at = %s WHERE id = %s RETURNING * /* selfdb:tables.delete_search_index */",
+        (datetime.now(timezone.utc), table_id)
+    )
+    updated_record = await result.fetchone()
+    await db.commit()
+    table_cache.invalidate(str(table_id))
+    
+    return _search_index_response(TableInDB(**updated_record))
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# TABLE STATISTICS ENDPOINT
+# ─────────────────────────────────────────────────────────────────────────────
+
+@router.get(
+    "/{table_id:uuid}/stats",
+    response_model=TableStats,
+    responses=RESP_ERRORS,
+    summary="Get Table Statistics"
+)
+async def get_table_stats(
+    table_and_user: tuple[TableInDB, UserInDB] = Depends(require_table_owner),
+    db: psycopg.AsyncConnection = Depends(get_db)
+) -> TableStats:
+    """
+    Size, vacuum/analyze and scan statistics of a table and its indexes.
+    
+    Many `seq_scan`s reading many rows (`seq_tup_read`) on a large table point
+    to a missing index; `unused` indexes only cost writes. Owner or admin only.
+    """
+    table, _ = table_and_user
+    stats = await fetch_table_stats(db, table.name)
+    if not stats:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Table not found in database")
+    return stats[0]
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # TABLE DATA (ROW) MANAGEMENT ENDPOINTS
 # ─────────────────────────────────────────────────────────────────────────────
@@ -690,7 +1129,7 @@ async def delete_column(
 @router.get(
     "/{table_id:uuid}/data",
     response_model=TableDataResponse,
-    dependencies=[Depends(strict_query_params({"page", "page_size", "search", "sort_by", "sort_order"}))],
+    dependencies=[Depends(strict_query_params({"page", "page_size", "search", "sort_by", "sort_order", "pagination", "cursor", "count"}))],
     responses=RESP_ERRORS,
     summary="Get Table Data"
 )
@@ -701,8 +1140,11 @@ async def get_table_data(
     search: Annotated[str | None, Query(max_length=100, pattern=SEARCH_TERM_REGEX, description="Search term for filtering across all text columns")] = None,
     sort_by: Annotated[str | None, Query(max_length=100, description="Column name to sort by")] = None,
     sort_order: Annotated[Literal["asc", "desc"], Query(description="Sort order (ascending or descending)")] = "desc",
+    pagination: Annotated[Literal["page", "cursor"], Query(description="Pagination mode: page (page/page_size) or cursor (keyset)")] = "page",
+    cursor: Annotated[str | None, Query(max_length=2048, description="Opaque next_cursor from the previous response (implies pagination=cursor)")] = None,
+    count: Annotated[CountStrategy, Query(description=COUNT_STRATEGY_DESCRIPTION)] = "exact",
     db: psycopg.AsyncConnection = Depends(get_db),
-    table: TableInDB = Depends(get_table_from_db),
+    meta: TableMeta = Depends(get_table_meta),
     current_user: UserInDB | None = Depends(get_optional_current_user)
 ):
     """
@@ -711,11 +1153,22 @@ async def get_table_data(
     - **search**: Filter rows by searching across all text/varchar columns (case-insensitive)
     - **sort_by**: Column name to sort by (must be a valid column in the table)
     - **sort_order**: Sort direction (asc or desc, default: desc)
+    - **pagination**: "page" (default) uses page/page_size; "cursor" seeks on
+      (sort_by, id) and returns **next_cursor** for the following page
+    - **cursor**: Token from a previous response's next_cursor
+    - **count**: exact (default), planned, estimated or none - see count_strategy
+      in the response for the strategy that produced total
+    
+    Cursor pagination needs an "id" column with unique values. Its cost doesn't
+    grow with the page depth and pages stay stable under concurrent inserts.
+    With sort_by set, an index on (sort_by, id) keeps each page an index seek.
     
     Access:
     - Public tables: Accessible to anyone
     - Private tables: Requires authentication (any authenticated user can read)
     """
+    table = meta.table
+    
     # Check access
     if not table.public:
         if current_user is None:
@@ -725,70 +1178,163 @@ async def get_table_data(
     
     # Validate search term for safe characters
     search = validate_search_term(search)
-    search_pattern = f"%{search}%" if search else None
-    
-    # Get text columns from schema for search
-    schema = table.table_schema or {}
-    text_columns = []
-    valid_columns = []
-    for col_name, col_def in schema.items():
-        valid_columns.append(col_name)
-        if isinstance(col_def, dict):
-            col_type = col_def.get('type', '').upper()
-        else:
-            col_type = str(col_def).upper()
-        # Include text-like columns for search
-        if any(t in col_type for t in ['TEXT', 'VARCHAR', 'CHAR', 'STRING']):
-            text_columns.append(col_name)
     
     # Validate sort_by column
     if sort_by:
         sort_by = strip_name(sort_by)
-        if sort_by not in valid_columns:
+        if sort_by not in meta.valid_column_set:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Invalid sort_by column: '{sort_by}'. Valid columns: {', '.join(valid_columns)}"
+                detail=f"Invalid sort_by column: '{sort_by}'. Valid columns: {', '.join(meta.valid_columns)}"
             )
     
+    use_cursor = pagination == "cursor" or cursor is not None
+    keyset_clause = ""
+    keyset_params: list[Any] = []
+    if use_cursor:
+        if CURSOR_KEY_COLUMN not in meta.valid_column_set:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Cursor pagination requires an '{CURSOR_KEY_COLUMN}' column"
+            )
+        sort_by = sort_by or CURSOR_KEY_COLUMN
+        if cursor:
+            value, key = decode_cursor(cursor, sort_by, sort_order)
+            keyset_clause, keyset_params = build_keyset_condition(sort_by, sort_order, value, key)
+    
     try:
-        # Build WHERE clause for search
+        # Build WHERE clause for search (precomputed in TableMeta - uses the
+        # table's search index when configured, ILIKE over text columns otherwise)
         where_clause = ""
         where_params = []
-        if search and text_columns:
-            search_conditions = [f'"{col}"::text ILIKE %s' for col in text_columns]
-            where_clause = "WHERE " + " OR ".join(search_conditions)
-            where_params = [search_pattern] * len(text_columns)
+        if search and meta.search_clause:
+            # Parenthesized so an appended keyset condition covers every OR term
+            where_clause = f"WHERE ({meta.search_clause})"
+            where_params = meta.search_params(search)
         
         # Build ORDER BY clause
         order_clause = ""
         if sort_by:
             order_direction = "DESC" if sort_order == "desc" else "ASC"
             order_clause = f'ORDER BY "{sort_by}" {order_direction}'
+            if use_cursor and sort_by != CURSOR_KEY_COLUMN:
+                # Unique tie-breaker so the seek position is unambiguous
+                order_clause += f', "{CURSOR_KEY_COLUMN}" {order_direction}'
         
         # Get total count (with search filter)
-        count_sql = f'SELECT COUNT(*) FROM "{table.name}" {where_clause}'
-        count_result = await db.execute(count_sql, tuple(where_params) if where_params else None)
-        count_row = await count_result.fetchone()
-        total = count_row['count'] if count_row else 0
-        
-        # Get paginated data (with search and sort)
-        data_sql = f'SELECT * FROM "{table.name}" {where_clause} {order_clause} LIMIT %s OFFSET %s'
-        data_params = tuple(where_params + [page_size, offset]) if where_params else (page_size, offset)
+        total, count_strategy = await count_rows(
+            db,
+            f'FROM "{table.name}" {where_clause}',
+            where_params,
+            count,
+            relation=None if where_clause else table.name,
+        )
+        
+        if use_cursor:
+            # Seek past the cursor instead of OFFSET; fetch one extra row to detect a next page
+            if keyset_clause:
+                seek_where = f"{where_clause} AND {keyset_clause}" if where_clause else f"WHERE {keyset_clause}"
+            else:
+                seek_where = where_clause
+            data_sql = f'SELECT * FROM "{table.name}" {seek_where} {order_clause} LIMIT %s /* selfdb:tables.get_table_data */'
+            result = await db.execute(data_sql, tuple(where_params + keyset_params + [page_size + 1]))
+            rows = await result.fetchall()
+            
+            has_more = len(rows) > page_size
+            data = [dict(row) for row in rows[:page_size]]
+            next_cursor = encode_cursor(sort_by, sort_order, data[-1]) if has_more else None
+            
+            return TableDataResponse(
+                data=data,
+                total=total,
+                page=page,
+                page_size=page_size,
+                has_more=has_more,
+                count_strategy=count_strategy,
+                next_cursor=next_cursor
+            )
+        
+        # Get paginated data (with search and sort), one extra row to detect a next page
+        data_sql = f'SELECT * FROM "{table.name}" {where_clause} {order_clause} LIMIT %s OFFSET %s /* selfdb:tables.get_table_data */'
+        data_params = tuple(where_params + [page_size + 1, offset])
         result = await db.execute(data_sql, data_params)
         rows = await result.fetchall()
         
-        data = [dict(row) for row in rows]
+        data = [dict(row) for row in rows[:page_size]]
         
         return TableDataResponse(
             data=data,
             total=total,
             page=page,
-            page_size=page_size
+            page_size=page_size,
+            has_more=len(rows) > page_size,
+            count_strategy=count_strategy
         )
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
 
+@router.get(
+    "/{table_id:uuid}/export",
+    dependencies=[Depends(strict_query_params({"format"}))],
+    responses={
+        200: {
+            "description": "Table rows as CSV or NDJSON",
+            "content": {
+                "text/csv": {"schema": {"type": "string"}},
+                "application/x-ndjson": {"schema": {"type": "string"}},
+            }
+        },
+        **RESP_ERRORS
+    },
+    summary="Export Table Data"
+)
+async def export_table_data(
+    data_format: Annotated[ExportFormat, Query(alias="format", description="csv (with header) or ndjson")] = "csv",
+    db: psycopg.AsyncConnection = Depends(get_db),
+    meta: TableMeta = Depends(get_table_meta),
+    current_user: UserInDB | None = Depends(get_optional_current_user)
+):
+    """
+    Stream every row of the table as CSV or NDJSON.
+    
+    Rows are streamed with COPY ... TO STDOUT from a single snapshot, so memory
+    use stays flat regardless of table size and no COUNT(*) is run.
+    
+    Access:
+    - Public tables: Accessible to anyone
+    - Private tables: Requires authentication (any authenticated user can read)
+    """
+    table = meta.table
+    
+    if not table.public:
+        if current_user is None:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Authentication required")
+    
+    # Start the COPY before sending headers so setup errors still map to a status code
+    chunks = stream_export(db, table.name, data_format)
+    try:
+        first_chunk = await anext(chunks, b"")
+    except psycopg.Error as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
+    async def stream_content():
+        try:
+            if first_chunk:
+                yield first_chunk
+            async for chunk in chunks:
+                yield chunk
+        finally:
+            # Ends the COPY and its snapshot if the client disconnects mid-stream
+            await chunks.aclose()
+    
+    return StreamingResponse(
+        stream_content(),
+        media_type=EXPORT_MEDIA_TYPES[data_format],
+        headers={"Content-Disposition": f'attachment; filename="{table.name}.{data_format}"'}
+    )
+
+
 @router.post(
     "/{table_id:uuid}/data",
     responses=RESP_ERRORS,
@@ -798,7 +1344,7 @@ async def insert_row(
     table_id: UUID,
     row_data: Dict[str, Any],
     db: psycopg.AsyncConnection = Depends(get_db),
-    table: TableInDB = Depends(get_table_from_db),
+    meta: TableMeta = Depends(get_table_meta),
     current_user: UserInDB | None = Depends(get_optional_current_user)
 ):
     """
@@ -806,6 +1352,8 @@ async def insert_row(
     - Public tables: Anyone can insert (with or without authentication) - useful for blog comments, likes, feedback
     - Private tables: Requires authentication (any authenticated user can insert)
     """
+    table = meta.table
+    
     # Check access for private tables
     if not table.public:
         if current_user is None:
@@ -821,11 +1369,8 @@ async def insert_row(
     row_data = strip_dict_keys(row_data)
     
     # Auto-generate UUID for id column if it's a UUID type and not provided
-    schema = table.table_schema or {}
-    if 'id' in schema:
-        id_type = schema['id'].get('type', '').lower() if isinstance(schema['id'], dict) else str(schema['id']).lower()
-        if 'uuid' in id_type and ('id' not in row_data or not row_data.get('id')):
-            row_data['id'] = str(uuid.uuid4())
+    if meta.id_type and 'uuid' in meta.id_type and not row_data.get('id'):
+        row_data['id'] = str(uuid.uuid4())
     
     try:
         columns = list(row_data.keys())
@@ -833,15 +1378,12 @@ async def insert_row(
         placeholders = ", ".join(["%s"] * len(values))
         columns_str = ", ".join(columns)
         
-        insert_sql = f'INSERT INTO "{table.name}" ({columns_str}) VALUES ({placeholders}) RETURNING *'
+        insert_sql = f'INSERT INTO "{table.name}" ({columns_str}) VALUES ({placeholders}) RETURNING * /* selfdb:tables.insert_row */'
         result = await db.execute(insert_sql, tuple(values))
         inserted_row = await result.fetchone()
         
-        # Update row count
-        await db.execute(
-            "UPDATE tables SET row_count = row_count + 1, updated_at = %s WHERE id = %s",
-            (datetime.now(timezone.utc), table_id)
-        )
+        # Update row count (folded into the registry asynchronously)
+        await record_row_delta(db, table_id, 1)
         await db.commit()
         
         return {"status": "row_inserted", "data": dict(inserted_row)}
@@ -850,6 +1392,271 @@ async def insert_row(
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
 
+# Rows held across a bulk load's per-column-set batches, in multiples of batch_size
+BULK_MAX_PENDING_BATCHES = 4
+
+
+def _bulk_value(value: Any) -> Any:
+    """Adapt a decoded JSON value for COPY - nested objects/arrays go in as JSON text."""
+    if isinstance(value, (dict, list)):
+        return json.dumps(value)
+    return value
+
+
+def _ndjson_row(record: str) -> Dict[str, Any]:
+    row = json.loads(record)
+    if not isinstance(row, dict):
+        raise ValueError("expected a JSON object")
+    return strip_dict_keys(row)
+
+
+async def _copy_rows(
+    db: psycopg.AsyncConnection,
+    copy_sql: str,
+    data_format: BulkFormat,
+    rows: List[tuple[int, Any]],
+) -> None:
+    async with db.cursor() as cur:
+        async with cur.copy(copy_sql) as copy:
+            for _, payload in rows:
+                if data_format == "csv":
+                    await copy.write(payload + "\n")
+                else:
+                    await copy.write_row(payload)
+
+
+async def _copy_batch(
+    db: psycopg.AsyncConnection,
+    table_id: UUID,
+    copy_sql: str,
+    data_format: BulkFormat,
+    number: int,
+    rows: List[tuple[int, Any]],
+    error_budget: int,
+) -> tuple[BulkBatchResult, List[BulkRowError], bool]:
+    """
+    COPY one batch in its own transaction and record its row count delta once.
+    
+    Each COPY runs under a savepoint. When one rejects a row, the rows before it
+    were accepted, so they are copied again on their own and the load resumes
+    after the rejected row: every row is sent at most about twice, however many
+    are rejected. Stops when error_budget is used up, discarding the batch.
+    
+    Returns:
+        (batch result, rejected rows, whether the load must abort)
+    """
+    started = time.perf_counter()
+    # Slices of rows still to load, taken from the end
+    segments = [(0, len(rows))]
+    inserted = 0
+    errors: List[BulkRowError] = []
+    abort = False
+    
+    while segments:
+        start, end = segments.pop()
+        await db.execute("SAVEPOINT bulk_copy")
+        try:
+            # COPY numbers records, not physical lines: a quoted CSV field
+            # spanning lines is still one "line" in its errors
+            await _copy_rows(db, copy_sql, data_format, rows[start:end])
+        except psycopg.Error as e:
+            await db.execute("ROLLBACK TO SAVEPOINT bulk_copy")
+            index = copy_error_index(e.diag.context, range(1, end - start + 1))
+            errors.append(BulkRowError(
+                row=rows[start + index][0] if index is not None else None,
+                detail=e.diag.message_primary or str(e)
+            ))
+            if index is None or len(errors) > error_budget:
+                abort = True
+                break
+            segments.append((start + index + 1, end))
+            if index:
+                segments.append((start, start + index))
+            continue
+        await db.execute("RELEASE SAVEPOINT bulk_copy")
+        inserted += end - start
+    
+    if abort:
+        await db.rollback()
+        inserted = 0
+    else:
+        try:
+            if inserted:
+                await record_row_delta(db, table_id, inserted)
+            await db.commit()
+        except psycopg.Error as e:
+            # Deferred constraints are only checked here, for the whole batch
+            await db.rollback()
+            errors.append(BulkRowError(row=None, detail=e.diag.message_primary or str(e)))
+            inserted = 0
+            abort = True
+    
+    result = BulkBatchResult(
+        batch=number,
+        first_row=rows[0][0],
+        last_row=rows[-1][0],
+        inserted=inserted,
+        failed=len(rows) - inserted,
+        duration_ms=round((time.perf_counter() - started) * 1000, 3),
+    )
+    return result, errors, abort
+
+
+@router.post(
+    "/{table_id:uuid}/data/bulk",
+    response_model=BulkInsertResponse,
+    dependencies=[Depends(strict_query_params({"format", "batch_size", "max_errors"}))],
+    responses=RESP_ERRORS,
+    summary="Bulk Insert Rows"
+)
+async def bulk_insert_rows(
+    table_id: UUID,
+    request: Request,
+    data_format: Annotated[BulkFormat | None, Query(alias="format", description="ndjson or csv (default: csv for a text/csv Content-Type, else ndjson)")] = None,
+    batch_size: Annotated[int, Query(ge=1, le=50000, description="Rows per COPY batch (one transaction each)")] = 5000,
+    max_errors: Annotated[int, Query(ge=0, le=10000, description="Rejected rows to skip before aborting (0 aborts on the first)")] = 0,
+    db: psycopg.AsyncConnection = Depends(get_db),
+    meta: TableMeta = Depends(get_table_meta),
+    current_user: UserInDB = Depends(get_current_active_user)
+) -> BulkInsertResponse:
+    """
+    Stream rows into the table with COPY FROM STDIN.
+    
+    - **ndjson**: One JSON object per line. The first object defines the columns;
+      later objects may leave columns out (they get the column DEFAULT; rows
+      are batched per column set)
+    - **csv**: The first line is a header naming the columns
+    
+    The body is read as it arrives and loaded in batches of **batch_size** rows.
+    Each batch is its own transaction and records one row_count delta. Rejected rows
+    are reported by their 1-based row number and skipped until more than
+    **max_errors** have been rejected; the load then stops with status "aborted",
+    keeping the batches already committed. A UUID `id` column missing from the
+    input is generated, as in Insert Row.
+    
+    Requires authentication; any authenticated user can load public and private tables.
+    """
+    table = meta.table
+    if data_format is None:
+        data_format = "csv" if "csv" in request.headers.get("content-type", "") else "ndjson"
+    auto_id = bool(meta.id_type and 'uuid' in meta.id_type)
+    
+    started = time.perf_counter()
+    copy_columns: List[str] = []
+    copy_column_set: frozenset[str] = frozenset()
+    prepend_id = False
+    copy_statements: Dict[tuple[str, ...], str] = {}
+    # Rows waiting to be copied, one batch per column set (NDJSON rows may omit columns)
+    pending: Dict[tuple[str, ...], List[tuple[int, Any]]] = {}
+    pending_rows = 0
+    batches: List[BulkBatchResult] = []
+    errors: List[BulkRowError] = []
+    row_number = 0
+    aborted = False
+    
+    def copy_statement(columns: tuple[str, ...]) -> str:
+        statement = copy_statements.get(columns)
+        if statement is None:
+            columns_str = ", ".join(f'"{c}"' for c in columns)
+            statement = f'COPY "{table.name}" ({columns_str}) FROM STDIN /* selfdb:tables.bulk_insert_rows */'
+            if data_format == "csv":
+                statement += " (FORMAT csv)"
+            copy_statements[columns] = statement
+        return statement
+    
+    async def flush(columns: tuple[str, ...]) -> bool:
+        nonlocal pending_rows
+        batch = pending.pop(columns)
+        pending_rows -= len(batch)
+        result, batch_errors, abort = await _copy_batch(
+            db, table_id, copy_statement(columns), data_format, len(batches) + 1, batch, max_errors - len(errors)
+        )
+        batches.append(result)
+        errors.extend(batch_errors)
+        return abort
+    
+    try:
+        async for record in iter_records(request.stream(), data_format):
+            if not copy_columns:
+                # The CSV header / first NDJSON object defines the columns
+                if data_format == "csv":
+                    columns = [strip_name(c) for c in next(csv.reader([record]))]
+                else:
+                    try:
+                        columns = list(_ndjson_row(record).keys())
+                    except ValueError as e:
+                        raise HTTPException(
+                            status_code=status.HTTP_400_BAD_REQUEST,
+                            detail=f"First NDJSON record must be a JSON object: {e}"
+                        )
+                unknown = [c for c in columns if c not in meta.valid_column_set]
+                if not columns or unknown or len(set(columns)) != len(columns):
+                    raise HTTPException(
+                        status_code=status.HTTP_400_BAD_REQUEST,
+                        detail=f"Invalid columns: {', '.join(unknown) if unknown else ', '.join(columns) or '(none)'}"
+                    )
+                prepend_id = auto_id and "id" not in columns
+                copy_columns = (["id"] if prepend_id else []) + columns
+                copy_column_set = frozenset(copy_columns)
+                if data_format == "csv":
+                    continue
+            
+            row_number += 1
+            if data_format == "csv":
+                row_columns = tuple(copy_columns)
+                payload = f"{uuid.uuid4()},{record}" if prepend_id else record
+            else:
+                try:
+                    row = _ndjson_row(record)
+                    if not row:
+                        raise ValueError("empty object")
+                    extra = [k for k in row if k not in copy_column_set]
+                    if extra:
+                        raise ValueError(f"unexpected columns {', '.join(extra)}")
+                except ValueError as e:
+                    errors.append(BulkRowError(row=row_number, detail=f"Invalid row: {e}"))
+                    if len(errors) > max_errors:
+                        aborted = True
+                        break
+                    continue
+                if auto_id and not row.get("id"):
+                    row["id"] = str(uuid.uuid4())
+                # Omitted columns stay out of the COPY so they get their DEFAULT
+                # rather than NULL; rows with another column set go in another batch
+                row_columns = tuple(c for c in copy_columns if c in row)
+                payload = tuple(_bulk_value(row[c]) for c in row_columns)
+            
+            batch = pending.setdefault(row_columns, [])
+            batch.append((row_number, payload))
+            pending_rows += 1
+            if len(batch) >= batch_size:
+                full = row_columns
+            elif pending_rows >= BULK_MAX_PENDING_BATCHES * batch_size:
+                # Many column sets: bound memory by loading the largest batch early
+                full = max(pending, key=lambda c: len(pending[c]))
+            else:
+                continue
+            if await flush(full):
+                aborted = True
+                break
+    except ValueError as e:
+        # Body framing errors (invalid UTF-8, unterminated quote, oversized record)
+        errors.append(BulkRowError(row=None, detail=str(e)))
+        aborted = True
+    
+    while pending and not aborted:
+        aborted = await flush(next(iter(pending)))
+    
+    return BulkInsertResponse(
+        status="aborted" if aborted else "completed",
+        inserted=sum(b.inserted for b in batches),
+        failed=len(errors),
+        batches=batches,
+        errors=errors,
+        duration_ms=round((time.perf_counter() - started) * 1000, 3),
+    )
+
+
 @router.patch(
     "/{table_id:uuid}/data/{row_id}",
     responses=RESP_ERRORS,
@@ -861,7 +1668,7 @@ async def update_row(
     updates: Dict[str, Any],
     id_column: Annotated[str, Query()] = "id",
     db: psycopg.AsyncConnection = Depends(get_db),
-    table: TableInDB = Depends(get_table_from_db),
+    meta: TableMeta = Depends(get_table_meta),
     current_user: UserInDB = Depends(get_current_active_user)
 ):
     """
@@ -870,6 +1677,8 @@ async def update_row(
     - Private tables: Authenticated users can update rows they own (user_id = current_user.id)
     - Admin users can update any row
     """
+    table = meta.table
+    
     if not updates:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Update data cannot be empty")
     
@@ -887,11 +1696,11 @@ async def update_row(
         if current_user.role == "ADMIN":
             # Admin can update any row
             values.append(row_id)
-            update_sql = f'UPDATE "{table.name}" SET {", ".join(set_clauses)} WHERE "{id_column}" = %s RETURNING *'
+            update_sql = f'UPDATE "{table.name}" SET {", ".join(set_clauses)} WHERE "{id_column}" = %s RETURNING * /* selfdb:tables.update_row */'
         else:
             # Regular users can only update rows where user_id matches their id
             values.extend([row_id, str(current_user.id)])
-            update_sql = f'UPDATE "{table.name}" SET {", ".join(set_clauses)} WHERE "{id_column}" = %s AND user_id = %s RETURNING *'
+            update_sql = f'UPDATE "{table.name}" SET {", ".join(set_clauses)} WHERE "{id_column}" = %s AND user_id = %s RETURNING * /* selfdb:tables.update_row */'
         
         result = await db.execute(update_sql, tuple(values))
         updated_row = await result.fetchone()
@@ -901,10 +1710,8 @@ async def update_row(
                 detail="Row not found or you don't have permission to update it"
             )
         
-        await db.execute(
-            "UPDATE tables SET updated_at = %s WHERE id = %s",
-            (datetime.now(timezone.utc), table_id)
-        )
+        # Marks the table as modified without locking its registry row
+        await record_row_delta(db, table_id, 0)
         await db.commit()
         
         return {"status": "row_updated", "data": dict(updated_row)}
@@ -926,7 +1733,7 @@ async def delete_row(
     row_id: str,
     id_column: Annotated[str, Query()] = "id",
     db: psycopg.AsyncConnection = Depends(get_db),
-    table: TableInDB = Depends(get_table_from_db),
+    meta: TableMeta = Depends(get_table_meta),
     current_user: UserInDB = Depends(get_current_active_user)
 ) -> RowDeleteResponse:
     """
@@ -935,15 +1742,17 @@ async def delete_row(
     - Private tables: Authenticated users can delete rows they own (user_id = current_user.id)
     - Admin users can delete any row
     """
+    table = meta.table
+    
     try:
         # Build WHERE clause: admin can delete any row, others only their own
         if current_user.role == "ADMIN":
             # Admin can delete any row
-            delete_sql = f'DELETE FROM "{table.name}" WHERE "{id_column}" = %s'
+            delete_sql = f'DELETE FROM "{table.name}" WHERE "{id_column}" = %s /* selfdb:tables.delete_row */'
             result = await db.execute(delete_sql, (row_id,))
         else:
             # Regular users can only delete rows where user_id matches their id
-            delete_sql = f'DELETE FROM "{table.name}" WHERE "{id_column}" = %s AND user_id = %s'
+            delete_sql = f'DELETE FROM "{table.name}" WHERE "{id_column}" = %s AND user_id = %s /* selfdb:tables.delete_row */'
             result = await db.execute(delete_sql, (row_id, str(current_user.id)))
         
         if result.rowcount == 0:
@@ -952,11 +1761,8 @@ async def delete_row(
                 detail="Row not found or you don't have permission to delete it"
             )
         
-        # Update row count
-        await db.execute(
-            "UPDATE tables SET row_count = row_count - 1, updated_at = %s WHERE id = %s",
-            (datetime.now(timezone.utc), table_id)
-        )
+        # Update row count (folded into the registry asynchronously)
+        await record_row_delta(db, table_id, -1)
         await db.commit()
         
         return RowDeleteResponse(status="row_deleted", table_id=table_id, row_id=row_id)
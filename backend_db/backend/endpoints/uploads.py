@@ -0,0 +1,305 @@
+# uploads.py - Resumable chunked uploads
+# Session state lives in the storage service; the database is only touched when
+# a session is created and when it is completed
+
+import time
+import uuid
+from datetime import datetime
+from typing import Annotated, Optional, Dict, Any
+from uuid import UUID
+import httpx
+import psycopg
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, status
+
+import db as database
+from db import get_db, settings
+from endpoints.files import (
+    ErrorResponse,
+    RESP_ERRORS,
+    check_bucket_access,
+    find_next_available_filename,
+    get_bucket_from_db,
+    record_uploaded_file,
+    strict_query_params,
+    strip_name,
+)
+from models.file import FileUploadResponse, UploadSessionResponse, UploadStatusResponse
+from models.user import UserInDB
+from security import create_upload_token, decode_upload_token, get_optional_current_user
+import storage_client
+
+router = APIRouter(prefix="/storage/files/uploads", tags=["storage-files"])
+
+# Free paths tried when concurrent uploads keep taking the one just found
+COMPLETE_PATH_ATTEMPTS = 5
+
+UPLOAD_ERRORS = {
+    **RESP_ERRORS,
+    409: {"model": ErrorResponse, "description": "Upload Incomplete"},
+    411: {"model": ErrorResponse, "description": "Content-Length Required"},
+    503: {"model": ErrorResponse, "description": "Storage Service Unavailable"},
+}
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Helpers
+# ─────────────────────────────────────────────────────────────────────────────
+
+async def get_upload_claims(
+    upload_id: UUID,
+    x_upload_token: Annotated[Optional[str], Header(alias="X-Upload-Token")] = None
+) -> Dict[str, Any]:
+    """
+    Authorize a request on an upload session by its upload token alone - no
+    user lookup, so chunk requests never take a database connection.
+    """
+    claims = decode_upload_token(x_upload_token) if x_upload_token else None
+    if claims is None or claims.get("upload_id") != str(upload_id):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or expired upload token"
+        )
+    return claims
+
+
+def storage_error(e: Exception) -> HTTPException:
+    """Pass the storage service's client errors through; anything else is a 503."""
+    if isinstance(e, httpx.HTTPStatusError) and e.response.status_code in (400, 404, 409, 422):
+        try:
+            detail = e.response.json().get("detail")
+        except ValueError:
+            detail = None
+        return HTTPException(status_code=e.response.status_code, detail=detail or "Upload failed")
+    return HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Storage service unavailable")
+
+
+def upload_status(session: Dict[str, Any]) -> UploadStatusResponse:
+    """Map the storage service's session status to the API model."""
+    return UploadStatusResponse(
+        upload_id=session["session_id"],
+        size=session["size"],
+        offset=session["offset"],
+        received_bytes=session["received_bytes"],
+        ranges=session["ranges"],
+        complete=session["complete"],
+        expires_at=session["expires_at"]
+    )
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# RESUMABLE UPLOAD ENDPOINTS
+# ─────────────────────────────────────────────────────────────────────────────
+
+@router.post(
+    "",
+    response_model=UploadSessionResponse,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(strict_query_params({"bucket_id", "filename", "size", "path", "content_type"}))],
+    responses=UPLOAD_ERRORS,
+    summary="Create Resumable Upload"
+)
+async def create_upload(
+    bucket_id: Annotated[UUID, Query(description="Target bucket ID")],
+    filename: Annotated[str, Query(description="Original filename")],
+    size: Annotated[int, Query(ge=1, description="Total file size in bytes")],
+    path: Annotated[Optional[str], Query(description="Target path within bucket")] = None,
+    content_type: Annotated[str, Query(description="MIME type of the file")] = "application/octet-stream",
+    db: psycopg.AsyncConnection = Depends(get_db),
+    current_user: UserInDB | None = Depends(get_optional_current_user)
+):
+    """
+    Start a resumable upload. Access is checked here, as for a single-request
+    upload; the returned `upload_token` then authorizes the session's other
+    requests (send it as `X-Upload-Token`):
+
+    - `PUT /storage/files/uploads/{upload_id}?offset=N` - raw chunk bytes; chunks
+      may be sent in any order and in parallel, and a failed chunk is simply sent again
+    - `GET /storage/files/uploads/{upload_id}` - received ranges and the offset to resume from
+    - `POST /storage/files/uploads/{upload_id}/complete` - assemble the file atomically
+    - `DELETE /storage/files/uploads/{upload_id}` - abort
+
+    Unfinished sessions expire after UPLOAD_SESSION_TTL_SECONDS.
+    """
+    bucket = await get_bucket_from_db(bucket_id, db)
+    await check_bucket_access(bucket, current_user, require_write=True)
+
+    initial_path = strip_name(path or filename or "unnamed")
+
+    try:
+        session = await storage_client.create_upload_session(size, settings.UPLOAD_SESSION_TTL_SECONDS)
+    except Exception as e:
+        raise storage_error(e)
+
+    upload_token = create_upload_token(
+        {
+            "upload_id": session["session_id"],
+            "bucket_id": bucket.id,
+            "owner_id": current_user.id if current_user else None,
+            "filename": filename,
+            "path": initial_path,
+            "content_type": content_type,
+            "size": size,
+        },
+        datetime.fromisoformat(session["expires_at"])
+    )
+
+    return UploadSessionResponse(
+        **upload_status(session).model_dump(),
+        upload_token=upload_token,
+        bucket_id=bucket.id,
+        path=initial_path,
+        chunk_size=settings.UPLOAD_CHUNK_SIZE,
+        max_chunk_size=settings.UPLOAD_MAX_CHUNK_SIZE
+    )
+
+
+@router.get(
+    "/{upload_id:uuid}",
+    response_model=UploadStatusResponse,
+    responses=UPLOAD_ERRORS,
+    summary="Get Resumable Upload Status"
+)
+async def get_upload_status(
+    upload_id: UUID,
+    claims: Dict[str, Any] = Depends(get_upload_claims)
+):
+    """Received byte ranges; `offset` is where a serial upload resumes."""
+    try:
+        session = await storage_client.get_upload_session(str(upload_id))
+    except Exception as e:
+        raise storage_error(e)
+    return upload_status(session)
+
+
+@router.put(
+    "/{upload_id:uuid}",
+    response_model=UploadStatusResponse,
+    dependencies=[Depends(strict_query_params({"offset"}))],
+    responses=UPLOAD_ERRORS,
+    summary="Upload Chunk"
+)
+async def upload_chunk(
+    request: Request,
+    upload_id: UUID,
+    offset: Annotated[int, Query(ge=0, description="Byte offset of the chunk within the file")],
+    claims: Dict[str, Any] = Depends(get_upload_claims)
+):
+    """
+    Stream one chunk (raw bytes, Content-Length required) to the storage service.
+
+    A chunk only counts once fully received; sending it again replaces it.
+    """
+    content_length = request.headers.get("content-length")
+    # str.isdigit also accepts e.g. '²', which int() rejects
+    if not content_length or not (content_length.isascii() and content_length.isdigit()):
+        raise HTTPException(status_code=status.HTTP_411_LENGTH_REQUIRED, detail="Content-Length header required")
+    chunk_length = int(content_length)
+    if chunk_length > settings.UPLOAD_MAX_CHUNK_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Chunks are limited to {settings.UPLOAD_MAX_CHUNK_SIZE} bytes"
+        )
+    if offset + chunk_length > claims["size"]:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Chunk extends past the declared upload size")
+
+    async def stream_body():
+        async for chunk in request.stream():
+            yield chunk
+
+    try:
+        session = await storage_client.upload_chunk(str(upload_id), offset, stream_body(), chunk_length)
+    except Exception as e:
+        raise storage_error(e)
+    return upload_status(session)
+
+
+@router.post(
+    "/{upload_id:uuid}/complete",
+    response_model=FileUploadResponse,
+    status_code=status.HTTP_201_CREATED,
+    responses=UPLOAD_ERRORS,
+    summary="Complete Resumable Upload"
+)
+async def complete_upload(
+    upload_id: UUID,
+    claims: Dict[str, Any] = Depends(get_upload_claims)
+):
+    """
+    Assemble the chunks into the file and record it, like a single-request
+    upload (auto-rename, checksum, bucket stats). 409 while bytes are missing.
+
+    The storage service assembles into a staged file first, with no connection
+    held. The file is only moved to its path while the new files row, not yet
+    committed, holds that path. A concurrent upload that picked the same free
+    name therefore waits on the unique index and then retries with the next
+    name, instead of overwriting this file.
+    """
+    bucket_id = UUID(claims["bucket_id"])
+    initial_path = claims["path"]
+
+    # 1. Resolve the bucket
+    async with database.pool.connection() as db:
+        bucket = await get_bucket_from_db(bucket_id, db)
+
+    # 2. Assemble in storage - nothing is visible in the bucket yet
+    start_time = time.time()
+    try:
+        assembled = await storage_client.assemble_upload_session(str(upload_id))
+    except Exception as e:
+        raise storage_error(e)
+    upload_time = time.time() - start_time
+    storage_result = {"file": {"size": assembled["size"], "checksum_sha256": assembled["checksum_sha256"]}}
+
+    # 3. Reserve a free path with the files row, publish the file into it, commit
+    for _ in range(COMPLETE_PATH_ATTEMPTS):
+        async with database.pool.connection() as db:
+            target_path = await find_next_available_filename(bucket_id, initial_path, db)
+
+            async def publish() -> None:
+                await storage_client.complete_upload_session(
+                    str(upload_id), bucket.name, target_path, claims["content_type"]
+                )
+
+            try:
+                return await record_uploaded_file(
+                    db,
+                    bucket,
+                    file_id=uuid.uuid4(),
+                    target_path=target_path,
+                    initial_path=initial_path,
+                    content_type=claims["content_type"],
+                    owner_id=UUID(claims["owner_id"]) if claims.get("owner_id") else None,
+                    storage_result=storage_result,
+                    upload_time=upload_time,
+                    publish=publish
+                )
+            except psycopg.errors.UniqueViolation:
+                # Taken by a concurrent upload since it was found free; nothing was published
+                await db.rollback()
+            except httpx.HTTPError as e:
+                # Not published: the assembled file stays in the session, complete can be retried
+                await db.rollback()
+                raise storage_error(e)
+            except Exception as e:
+                # Never delete the path here: it may hold another upload's committed file
+                await db.rollback()
+                raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
+
+    raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Could not reserve a free path, try again")
+
+
+@router.delete(
+    "/{upload_id:uuid}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    responses=UPLOAD_ERRORS,
+    summary="Abort Resumable Upload"
+)
+async def abort_upload(
+    upload_id: UUID,
+    claims: Dict[str, Any] = Depends(get_upload_claims)
+):
+    """Discard the session and the chunks received so far."""
+    try:
+        await storage_client.abort_upload_session(str(upload_id))
+    except Exception as e:
+        raise storage_error(e)
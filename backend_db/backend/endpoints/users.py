@@ -6,7 +6,7 @@ from datetime import timedelta
 import psycopg
 from psycopg import sql
 from psycopg.errors import UniqueViolation
-from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from fastapi.security import OAuth2PasswordRequestForm
 from pydantic import BaseModel
 
@@ -27,7 +27,9 @@ from security import (
     revoke_all_user_tokens
 )
 from utils.validation import validate_search_term, SEARCH_TERM_REGEX
+from utils.counting import COUNT_STRATEGY_DESCRIPTION, count_rows
 from services.backup_service import get_system_initialized, set_system_initialized
+from services.cache_service import user_cache
 
 router = APIRouter(prefix="/users", tags=["users"])
 
@@ -254,29 +256,37 @@ async def read_users_me(
 @router.get(
     "/count",
     response_model=int,
-    dependencies=[Depends(strict_query_params({"search"}))],
+    dependencies=[Depends(strict_query_params({"search", "count"}))],
     responses=RESP_ERRORS,
     summary="Get User Count"
 )
 async def get_user_count(
+    response: Response,
     search: Annotated[str | None, Query(max_length=100, pattern=SEARCH_TERM_REGEX, description="Search term for filtering by email, first name, or last name")] = None,
+    count: Annotated[Literal["exact", "planned", "estimated"], Query(description=COUNT_STRATEGY_DESCRIPTION)] = "exact",
     db: psycopg.AsyncConnection = Depends(get_db),
     current_user: UserInDB = Depends(get_current_active_user)
 ) -> int:
-    """Get total number of users, optionally filtered by search term. Requires authentication."""
+    """
+    Get total number of users, optionally filtered by search term. Requires authentication.
+    
+    The X-Count-Strategy response header names the strategy that produced the count.
+    """
     # Validate search term for safe characters
     search = validate_search_term(search)
     
     if search:
         search_pattern = f"%{search}%"
-        result = await db.execute(
-            "SELECT COUNT(*) FROM users WHERE email ILIKE %s OR first_name ILIKE %s OR last_name ILIKE %s",
-            (search_pattern, search_pattern, search_pattern)
+        total, count_strategy = await count_rows(
+            db,
+            "FROM users WHERE email ILIKE %s OR first_name ILIKE %s OR last_name ILIKE %s",
+            (search_pattern, search_pattern, search_pattern),
+            count
         )
     else:
-        result = await db.execute("SELECT COUNT(*) FROM users")
-    row = await result.fetchone()
-    return row['count'] if row else 0
+        total, count_strategy = await count_rows(db, "FROM users", None, count, relation="users")
+    response.headers["X-Count-Strategy"] = count_strategy
+    return total
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -431,6 +441,8 @@ async def update_user(
         result = await db.execute(query, tuple(values))
         updated_record = await result.fetchone()
         await db.commit()
+        # Other workers are invalidated by the users_realtime_notify trigger
+        user_cache.invalidate(str(user_id))
         if not updated_record:
              raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
         return UserInDB(**updated_record)
@@ -455,6 +467,7 @@ async def delete_user(
 
     result = await db.execute("DELETE FROM users WHERE id = %s", (user_id,))
     await db.commit()
+    user_cache.invalidate(str(user_id))
     if result.rowcount == 0:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
     return UserDeleteResponse(status="user_deleted", id=user_id)
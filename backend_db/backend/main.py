@@ -5,22 +5,25 @@ from fastapi import FastAPI
 from contextlib import asynccontextmanager
 from db import init_db, close_db
 from fastapi.middleware.cors import CORSMiddleware
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.responses import JSONResponse
 from endpoints.users import router as users_router
 from endpoints.tables import router as tables_router
 from endpoints.system import router as system_router
 from endpoints.backups import router as backups_router
-from endpoints.sql import router as sql_router
+from endpoints.sql import router as sql_router, recover_sql_jobs, stop_sql_jobs
 from endpoints.realtime import router as realtime_router
 from endpoints.buckets import router as buckets_router
 from endpoints.files import router as files_router
+from endpoints.uploads import router as uploads_router
 from endpoints.functions import router as functions_router
 from endpoints.webhooks import router as webhooks_router
 from endpoints.schema import router as schema_router
 from security import API_KEY
+from middleware import APIKeyMiddleware
 from fastapi.openapi.utils import get_openapi
 from services.backup_service import start_scheduler, stop_scheduler
+from services.cache_service import start_cache_listener, stop_cache_listener
+from services.row_count_service import start_row_count_folder, stop_row_count_folder
+from services.sql_history_service import start_sql_history_writer, stop_sql_history_writer
 from storage_client import close_client as close_storage_client
 
 # App metadata from environment variables (required)
@@ -28,68 +31,20 @@ APP_NAME = os.environ["APP_NAME"]
 APP_DESCRIPTION = os.environ["APP_DESCRIPTION"]
 APP_VERSION = os.environ["APP_VERSION"]
 
-# ─────────────────────────────────────────────────────────────────────────────
-# Custom Middleware for API Key Validation
-# ─────────────────────────────────────────────────────────────────────────────
-
-class APIKeyMiddleware(BaseHTTPMiddleware):
-    """
-    Middleware to validate API key for all requests except documentation endpoints
-    and public webhook trigger endpoints.
-    Runs before routing and OpenAPI schema validation.
-    
-    API Key Sources:
-    - HTTP Header: X-API-Key (for REST endpoints)
-    - Query Parameter: X-API-Key (for WebSocket - can't use headers during handshake)
-    """
-    async def dispatch(self, request, call_next):
-        # Only webhook trigger endpoint is excluded from API key validation
-        # Documentation endpoints now require API key for security
-        excluded_paths: list[str] = []
-        
-        current_path = request.url.path
-        
-        # Skip API key validation for excluded endpoints
-        if current_path in excluded_paths:
-            return await call_next(request)
-        
-        # Skip API key validation for webhook trigger endpoint (public ingestion)
-        # Pattern: /webhooks/trigger/{webhook_token}
-        if current_path.startswith("/webhooks/trigger/"):
-            return await call_next(request)
-        
-        # Check for API key in header first, then query params (for WebSocket)
-        api_key = request.headers.get("X-API-Key")
-        
-        # WebSocket connections can't use headers during handshake
-        # Allow API key via query parameter for WebSocket endpoints
-        if not api_key and current_path.startswith("/realtime/socket"):
-            api_key = request.query_params.get("X-API-Key")
-        
-        if not api_key:
-            return JSONResponse(
-                status_code=406,
-                content={"detail": "Missing required header: X-API-Key"}
-            )
-        
-        if api_key != API_KEY:
-            return JSONResponse(
-                status_code=401,
-                content={"detail": "Invalid API key"}
-            )
-        
-        # API key is valid, proceed with request
-        response = await call_next(request)
-        return response
-
-
-
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     await init_db()
+    await start_cache_listener()
+    await start_row_count_folder()
+    await start_sql_history_writer()
+    await recover_sql_jobs()
     await start_scheduler()
     yield
     await stop_scheduler()
+    await stop_sql_jobs()
+    await stop_sql_history_writer()
+    await stop_row_count_folder()
+    await stop_cache_listener()
     await close_storage_client()
     await close_db()
 
@@ -103,7 +58,8 @@ app = FastAPI(
 
 # Add API Key middleware BEFORE CORS
 # This ensures API key validation happens first
-app.add_middleware(APIKeyMiddleware)
+# Pure ASGI middleware (see middleware.py) - no BaseHTTPMiddleware overhead
+app.add_middleware(APIKeyMiddleware, api_key=API_KEY)
 
 # CORS origins from environment variable (required, no fallback)
 CORS_ORIGINS = os.environ["CORS_ORIGINS"].split(",")
@@ -128,6 +84,7 @@ app.include_router(sql_router)
 app.include_router(realtime_router)
 app.include_router(buckets_router)
 app.include_router(files_router)
+app.include_router(uploads_router)
 app.include_router(functions_router)
 app.include_router(webhooks_router)
 app.include_router(schema_router)
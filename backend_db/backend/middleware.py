@@ -0,0 +1,100 @@
+# middleware.py
+"""
+Pure ASGI middleware for the backend API.
+
+These run directly on the ASGI (scope, receive, send) interface instead of
+Starlette's BaseHTTPMiddleware, so they add no extra task or memory-stream hop
+per request and never wrap streamed bodies (file downloads, WebSocket upgrades).
+"""
+
+import hmac
+from urllib.parse import parse_qsl
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+API_KEY_HEADER = b"x-api-key"
+API_KEY_QUERY_PARAM = "X-API-Key"
+
+# Webhook trigger endpoint is public ingestion - no API key required
+# Pattern: /webhooks/trigger/{webhook_token}
+PUBLIC_PATH_PREFIXES: tuple[str, ...] = ("/webhooks/trigger/",)
+
+# WebSocket connections can't use headers during handshake
+# so the API key is also accepted as a query parameter on these paths
+QUERY_KEY_PATH_PREFIXES: tuple[str, ...] = ("/realtime/socket",)
+
+
+class APIKeyMiddleware:
+    """
+    Middleware to validate API key for all requests except public webhook
+    trigger endpoints. Runs before routing and OpenAPI schema validation.
+
+    API Key Sources:
+    - HTTP Header: X-API-Key (for REST endpoints)
+    - Query Parameter: X-API-Key (for WebSocket - can't use headers during handshake)
+
+    The key is compared in constant time. Rejected HTTP requests get a JSON
+    406 (missing) or 401 (invalid); rejected WebSocket handshakes are closed
+    before accept, which the server turns into an HTTP 403.
+    """
+
+    def __init__(self, app: ASGIApp, api_key: str) -> None:
+        self.app = app
+        self._api_key = api_key.encode()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] not in ("http", "websocket"):
+            # lifespan and other scope types pass straight through
+            await self.app(scope, receive, send)
+            return
+
+        path: str = scope["path"]
+        if path.startswith(PUBLIC_PATH_PREFIXES):
+            await self.app(scope, receive, send)
+            return
+
+        api_key = self._extract_api_key(scope, path)
+
+        if not api_key:
+            await self._reject(scope, send, 406, b'{"detail":"Missing required header: X-API-Key"}')
+            return
+
+        if not hmac.compare_digest(api_key, self._api_key):
+            await self._reject(scope, send, 401, b'{"detail":"Invalid API key"}')
+            return
+
+        # API key is valid, hand off the untouched scope/receive/send
+        await self.app(scope, receive, send)
+
+    @staticmethod
+    def _extract_api_key(scope: Scope, path: str) -> bytes | None:
+        """Read the API key from the header, falling back to the query string for WebSocket paths."""
+        for name, value in scope["headers"]:
+            if name == API_KEY_HEADER and value:
+                return value
+
+        if path.startswith(QUERY_KEY_PATH_PREFIXES):
+            query_string: bytes = scope.get("query_string", b"")
+            if query_string:
+                for key, value in parse_qsl(query_string.decode("latin-1")):
+                    if key == API_KEY_QUERY_PARAM:
+                        return value.encode()
+        return None
+
+    @staticmethod
+    async def _reject(scope: Scope, send: Send, status_code: int, body: bytes) -> None:
+        """Send a JSON error response (HTTP) or refuse the handshake (WebSocket)."""
+        if scope["type"] == "websocket":
+            # Policy violation - closing before accept rejects the upgrade
+            await send({"type": "websocket.close", "code": 1008})
+            return
+
+        await send({
+            "type": "http.response.start",
+            "status": status_code,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
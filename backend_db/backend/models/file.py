@@ -49,6 +49,7 @@ class FileUploadResponse(BaseModel):
     path: str
     size: int
     file_id: Optional[UUID] = None
+    checksum_sha256: Optional[str] = None
     upload_time: Optional[float] = None
     url: Optional[str] = None
     # macOS-style rename info
@@ -56,6 +57,30 @@ class FileUploadResponse(BaseModel):
     message: Optional[str] = None
 
 
+# ─────────────────────────────────────────────────────────────────────────────
+# Resumable Upload
+# ─────────────────────────────────────────────────────────────────────────────
+
+class UploadStatusResponse(BaseModel):
+    """Progress of a resumable upload session."""
+    upload_id: UUID
+    size: int
+    offset: int = Field(description="Bytes received without a gap from the start - where a serial upload resumes")
+    received_bytes: int = Field(description="Bytes received in total, across all ranges")
+    ranges: List[List[int]] = Field(default_factory=list, description="Received [start, end) byte ranges, merged")
+    complete: bool = Field(description="Every byte has been received; the upload can be completed")
+    expires_at: datetime
+
+
+class UploadSessionResponse(UploadStatusResponse):
+    """A new resumable upload session."""
+    upload_token: str = Field(description="Send as X-Upload-Token on every request of this session")
+    bucket_id: UUID
+    path: str = Field(description="Requested path; the final one is decided on completion (auto-rename applies)")
+    chunk_size: int = Field(description="Suggested chunk size in bytes")
+    max_chunk_size: int = Field(description="Largest chunk accepted in one PUT")
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # Database
 # ─────────────────────────────────────────────────────────────────────────────
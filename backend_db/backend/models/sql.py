@@ -3,6 +3,7 @@ from pydantic import BaseModel, Field, ConfigDict
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 from uuid import UUID
+from enum import Enum
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # SQL Execution Models
@@ -20,12 +21,42 @@ class SqlQueryRequest(BaseModel):
         max_length=100000,
         description="SQL query to execute"
     )
+    max_rows: Optional[int] = Field(
+        None,
+        ge=1,
+        description="Stop reading a read-only result after this many rows (capped by the server limit)"
+    )
+    per_statement: bool = Field(
+        False,
+        description="POST /sql/query only: run each statement of the script separately in one transaction and pipelined round trip, returning a result, row count and timing per statement"
+    )
     
     model_config = ConfigDict(
         extra='ignore',
         json_schema_extra={
             "examples": [{
-                "query": "SELECT * FROM users LIMIT 10"
+                "query": "SELECT * FROM users LIMIT 10",
+                "max_rows": 1000,
+                "per_statement": False
+            }]
+        }
+    )
+
+
+class SqlExplainRequest(BaseModel):
+    """Request model for profiling a single SQL statement."""
+    query: str = Field(
+        ..., 
+        min_length=1, 
+        max_length=100000,
+        description="SQL statement to run under EXPLAIN (ANALYZE, BUFFERS) in a rolled-back transaction"
+    )
+    
+    model_config = ConfigDict(
+        extra='ignore',
+        json_schema_extra={
+            "examples": [{
+                "query": "SELECT * FROM files WHERE bucket_id = '00000000-0000-0000-0000-000000000000'"
             }]
         }
     )
@@ -35,6 +66,18 @@ class SqlQueryRequest(BaseModel):
 # Response Models
 # ─────────────────────────────────────────────────────────────────────────────
 
+class SqlStatementResult(BaseModel):
+    """Result of one statement of a script run with per_statement."""
+    index: int = Field(..., description="Position of the statement in the script, from 0")
+    statement: str
+    is_read_only: bool
+    execution_time: float = Field(..., description="Execution time in seconds (server-side for pipelined statements)")
+    row_count: int = Field(..., description="Rows returned (read-only) or affected")
+    columns: Optional[List[str]] = None
+    data: Optional[List[Dict[str, Any]]] = None
+    truncated: bool = False
+
+
 class SqlExecutionResult(BaseModel):
     """Result of a SQL query execution."""
     success: bool = Field(..., description="Whether the query executed successfully")
@@ -45,6 +88,8 @@ class SqlExecutionResult(BaseModel):
     data: Optional[List[Dict[str, Any]]] = Field(None, description="Query result data")
     message: Optional[str] = Field(None, description="Success or info message")
     error: Optional[str] = Field(None, description="Error message if query failed")
+    truncated: bool = Field(False, description="Whether the result was cut off at the row or byte limit")
+    statements: Optional[List[SqlStatementResult]] = Field(None, description="Per-statement results when per_statement was requested")
     
     model_config = ConfigDict(
         json_schema_extra={
@@ -55,12 +100,68 @@ class SqlExecutionResult(BaseModel):
                 "row_count": 5,
                 "columns": ["id", "name", "email"],
                 "data": [{"id": 1, "name": "John", "email": "john@example.com"}],
-                "message": "Query executed successfully"
+                "message": "Query executed successfully",
+                "truncated": False
             }]
         }
     )
 
 
+class SqlPlanNode(BaseModel):
+    """One node of an EXPLAIN ANALYZE plan tree. Times are in milliseconds."""
+    node_type: str
+    relation_name: Optional[str] = None
+    index_name: Optional[str] = None
+    join_type: Optional[str] = None
+    startup_cost: float = Field(..., description="Planner cost before the first row")
+    total_cost: float = Field(..., description="Planner cost for all rows")
+    plan_rows: float = Field(..., description="Rows the planner estimated per loop")
+    actual_rows: float = Field(..., description="Rows actually returned per loop")
+    row_estimate_error: float = Field(
+        ...,
+        description="actual_rows / plan_rows (both floored at 1): above 1 the planner under-estimated, below 1 it over-estimated"
+    )
+    loops: int
+    never_executed: bool = False
+    total_time: float = Field(..., description="Time spent in this node and its children, over all loops")
+    self_time: float = Field(..., description="total_time minus the children's total_time")
+    shared_hit_blocks: int = Field(0, description="Shared buffer hits, including children")
+    shared_read_blocks: int = Field(0, description="Shared blocks read from disk or the OS cache, including children")
+    temp_read_blocks: int = 0
+    temp_written_blocks: int = 0
+    children: List["SqlPlanNode"] = Field(default_factory=list)
+
+
+class SqlExplainResult(BaseModel):
+    """Structured EXPLAIN (ANALYZE, BUFFERS) output for one statement."""
+    history_id: Optional[UUID] = Field(None, description="sql_history entry the plan is stored with; null if the history queue was full and the entry was dropped")
+    query: str
+    planning_time: float = Field(..., description="Planning time in milliseconds")
+    execution_time: float = Field(..., description="Execution time in milliseconds")
+    plan: SqlPlanNode
+    raw_plan: Dict[str, Any] = Field(..., description="The EXPLAIN (FORMAT JSON) document as returned by PostgreSQL")
+
+
+class SqlQueryInsight(BaseModel):
+    """Cumulative pg_stat_statements counters for one normalized statement. Times are in milliseconds."""
+    queryid: int
+    query: str = Field(..., description="Normalized statement text (constants replaced by $n)")
+    source: Optional[str] = Field(None, description="Backend call site from the statement's /* selfdb:module.function */ tag (first text seen for the queryid)")
+    calls: int
+    total_time: float
+    mean_time: float
+    rows: int
+    shared_blks_hit: int
+    shared_blks_read: int
+
+
+class SqlInsightsResponse(BaseModel):
+    """Top statements of this database from pg_stat_statements."""
+    sort_by: str
+    stats_since: Optional[datetime] = Field(None, description="When the statistics were last reset")
+    queries: List[SqlQueryInsight]
+
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # SQL History Models
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -74,6 +175,8 @@ class SqlHistoryInDB(BaseModel):
     row_count: Optional[int] = None
     error: Optional[str] = None
     user_id: UUID
+    job_id: Optional[UUID] = None
+    plan: Optional[Dict[str, Any]] = None
     executed_at: datetime
     
     model_config = ConfigDict(from_attributes=True)
@@ -87,6 +190,8 @@ class SqlHistoryRead(BaseModel):
     execution_time: float
     row_count: Optional[int] = None
     error: Optional[str] = None
+    job_id: Optional[UUID] = None
+    has_plan: bool = Field(False, description="Whether an EXPLAIN plan is stored (GET /sql/history/{id}/plan)")
     executed_at: datetime
     
     model_config = ConfigDict(from_attributes=True)
@@ -97,6 +202,50 @@ class SqlHistoryListResponse(BaseModel):
     history: List[SqlHistoryRead]
 
 
+# ═══════════════════════════════════════════════════════════════════════════════
+# SQL Job Models
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class SqlJobStatus(str, Enum):
+    """Async SQL job status."""
+    QUEUED = "queued"
+    RUNNING = "running"
+    CANCELLING = "cancelling"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+class SqlJobRead(BaseModel):
+    """Async SQL job returned to client."""
+    id: UUID
+    query: str
+    is_read_only: bool
+    status: SqlJobStatus
+    columns: Optional[List[str]] = Field(None, description="Result columns once the query has started returning rows")
+    row_count: int = Field(0, description="Rows stored so far (read-only) or rows affected (write)")
+    truncated: bool = Field(False, description="Whether the stored result was cut off at the row or byte limit")
+    error: Optional[str] = None
+    execution_time: Optional[float] = Field(None, description="Seconds from start to finish")
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    expires_at: datetime
+    
+    model_config = ConfigDict(from_attributes=True)
+
+
+class SqlJobResult(BaseModel):
+    """A page of an async SQL job's stored result rows."""
+    id: UUID
+    status: SqlJobStatus
+    columns: Optional[List[str]] = None
+    data: List[Dict[str, Any]] = Field(default_factory=list)
+    offset: int
+    row_count: int = Field(..., description="Rows stored for the job so far")
+    truncated: bool = False
+    has_more: bool = Field(..., description="Whether rows past this page are already stored")
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # SQL Snippets Models
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field, field_validator, ConfigDict
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from datetime import datetime
 from uuid import UUID
 import re
@@ -173,3 +173,39 @@ class RowDeleteResponse(BaseModel):
     status: str = Field(default="row_deleted")
     table_id: UUID
     row_id: str
+
+# ─────────────────────────────────────────────────────────────────────────────
+# 7. Statistics Models
+# ─────────────────────────────────────────────────────────────────────────────
+class IndexStats(BaseModel):
+    name: str
+    size_bytes: int
+    is_primary: bool
+    is_unique: bool
+    idx_scan: int = Field(description="Scans started on this index")
+    idx_tup_read: int = Field(description="Index entries returned by scans")
+    idx_tup_fetch: int = Field(description="Table rows fetched by simple index scans")
+    last_idx_scan: Optional[datetime] = None
+    unused: bool = Field(description="Never scanned and not enforcing uniqueness - a candidate to drop")
+
+class TableStats(BaseModel):
+    table_id: Optional[UUID] = Field(None, description="Registry id, if the table is in the tables registry")
+    name: str
+    total_bytes: int = Field(description="Table, indexes and TOAST")
+    table_bytes: int
+    index_bytes: int
+    live_tuples: int
+    dead_tuples: int
+    dead_tuple_ratio: float = Field(description="dead / (live + dead)")
+    bloat_bytes: Optional[int] = Field(None, description="Estimated space beyond what the live rows need; null until the table is analyzed")
+    bloat_ratio: Optional[float] = Field(None, description="bloat_bytes / table_bytes")
+    seq_scan: int
+    seq_tup_read: int = Field(description="Rows read by sequential scans")
+    idx_scan: int
+    idx_tup_fetch: int
+    n_mod_since_analyze: int
+    last_vacuum: Optional[datetime] = None
+    last_autovacuum: Optional[datetime] = None
+    last_analyze: Optional[datetime] = None
+    last_autoanalyze: Optional[datetime] = None
+    indexes: List[IndexStats] = Field(default_factory=list)
@@ -17,6 +17,7 @@ from pydantic import BaseModel
 from pydantic_settings import BaseSettings, SettingsConfigDict
 import psycopg
 from db import get_db
+from services.cache_service import user_cache
 
 # ─────────────────────────────────────────────────────────────────────────────
 # Configuration
@@ -106,9 +107,57 @@ def create_access_token(data: dict, expires_delta: timedelta | None = None):
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
+
+# Resumable upload sessions authorize chunk requests with their own token, so
+# those requests need neither a user lookup nor a database connection
+UPLOAD_TOKEN_TYPE = "upload"
+
+
+def create_upload_token(claims: dict, expires_at: datetime) -> str:
+    """
+    Sign the claims of one upload session. The token has no "sub", so it is
+    never accepted as an access token.
+    """
+    to_encode = {key: str(value) if isinstance(value, UUID) else value for key, value in claims.items()}
+    to_encode.update({"typ": UPLOAD_TOKEN_TYPE, "exp": expires_at})
+    return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+
+
+def decode_upload_token(token: str) -> dict | None:
+    """Claims of a valid, unexpired upload token, else None."""
+    try:
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    except InvalidTokenError:
+        return None
+    if payload.get("typ") != UPLOAD_TOKEN_TYPE:
+        return None
+    return payload
+
 # ─────────────────────────────────────────────────────────────────────────────
 # Dependencies
 # ─────────────────────────────────────────────────────────────────────────────
+async def _fetch_user_record(db: psycopg.AsyncConnection, user_id: UUID) -> dict | None:
+    """
+    Load a user row, served from the per-worker user cache when possible.
+    
+    The cache is invalidated from the users_realtime_notify trigger, so role
+    changes, deactivations and deletes apply on the next request.
+    """
+    key = str(user_id)
+    record = user_cache.get(key)
+    if record is not None:
+        return dict(record)
+    
+    generation = user_cache.generation
+    result = await db.execute("SELECT * FROM users WHERE id = %s", (user_id,))
+    record = await result.fetchone()
+    if record is None:
+        return None
+    
+    user_cache.set(key, record, generation)
+    return dict(record)
+
+
 async def get_current_user(
     token: Annotated[str, Depends(oauth2_scheme)],
     db: psycopg.AsyncConnection = Depends(get_db)
@@ -127,9 +176,12 @@ async def get_current_user(
     except InvalidTokenError:
         raise credentials_exception
 
-    # Fetch user from DB
-    result = await db.execute("SELECT * FROM users WHERE id = %s", (UUID(token_data.user_id),))
-    record = await result.fetchone()
+    # Fetch user from cache or DB
+    try:
+        user_uuid = UUID(token_data.user_id)
+    except ValueError:
+        raise credentials_exception
+    record = await _fetch_user_record(db, user_uuid)
     if record is None:
         raise credentials_exception
     
@@ -165,9 +217,8 @@ async def get_optional_current_user(
         if user_id is None:
             return None
         
-        # Fetch user from DB
-        result = await db.execute("SELECT * FROM users WHERE id = %s", (UUID(user_id),))
-        record = await result.fetchone()
+        # Fetch user from cache or DB
+        record = await _fetch_user_record(db, UUID(user_id))
         if record is None:
             return None
         
@@ -211,6 +262,7 @@ async def create_refresh_token(
         """
         INSERT INTO refresh_tokens (user_id, token_hash, expires_at)
         VALUES (%s, %s, %s)
+        /* selfdb:security.create_refresh_token */
         """,
         (user_id, token_hash, expires_at)
     )
@@ -233,6 +285,7 @@ async def validate_refresh_token(
         SELECT user_id, expires_at, revoked_at 
         FROM refresh_tokens 
         WHERE token_hash = %s
+        /* selfdb:security.validate_refresh_token */
         """,
         (token_hash,)
     )
@@ -270,6 +323,7 @@ async def rotate_refresh_token(
         SET revoked_at = CURRENT_TIMESTAMP 
         WHERE token_hash = %s AND revoked_at IS NULL
         RETURNING id
+        /* selfdb:security.rotate_refresh_token */
         """,
         (token_hash,)
     )
@@ -297,6 +351,7 @@ async def revoke_refresh_token(
         UPDATE refresh_tokens 
         SET revoked_at = CURRENT_TIMESTAMP 
         WHERE token_hash = %s AND revoked_at IS NULL
+        /* selfdb:security.revoke_refresh_token */
         """,
         (token_hash,)
     )
@@ -314,6 +369,7 @@ async def revoke_all_user_tokens(
         UPDATE refresh_tokens 
         SET revoked_at = CURRENT_TIMESTAMP 
         WHERE user_id = %s AND revoked_at IS NULL
+        /* selfdb:security.revoke_all_user_tokens */
         """,
         (user_id,)
     )
@@ -0,0 +1,256 @@
+# cache_service.py
+"""
+In-process caches for hot metadata lookups, invalidated via Postgres LISTEN/NOTIFY.
+
+Each uvicorn worker keeps its own caches. A single dedicated connection per worker
+LISTENs on the realtime trigger channels (see 05_realtime_function.sql) and evicts
+entries as soon as the underlying rows change, so every worker sees updates within
+milliseconds of the commit.
+
+The listener connects to Postgres directly (not PgBouncer): LISTEN needs a session,
+which PgBouncer's transaction pooling mode doesn't provide. While the listener is
+disconnected every cache is bypassed, so a missed notification can never serve
+stale data.
+"""
+
+import asyncio
+import json
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Callable, Hashable
+
+import psycopg
+from psycopg import sql
+from psycopg.conninfo import make_conninfo
+
+from db import settings
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Configuration
+# ─────────────────────────────────────────────────────────────────────────────
+
+LISTENER_RECONNECT_MIN_SECONDS = 1.0
+LISTENER_RECONNECT_MAX_SECONDS = 30.0
+
+_MISSING = object()
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# TTL/LRU Cache
+# ─────────────────────────────────────────────────────────────────────────────
+
+class TTLCache:
+    """
+    Bounded LRU cache with a per-entry TTL and hit/miss/eviction counters.
+
+    Not thread-safe - only used from the worker's event loop.
+
+    `generation` increases on every invalidation. Read it before a miss is
+    loaded from the database and pass it to `set()`: if a notification arrived
+    while the query was in flight the stale result is dropped instead of cached.
+    """
+
+    def __init__(self, name: str, max_size: int, ttl_seconds: float) -> None:
+        self.name = name
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.generation = 0
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0 and self.ttl_seconds > 0 and _listener_connected
+
+    def get(self, key: Hashable) -> Any:
+        """Return the cached value, or None on a miss (or while the cache is bypassed)."""
+        if not self.enabled:
+            self.misses += 1
+            return None
+
+        entry = self._entries.get(key, _MISSING)
+        if entry is _MISSING:
+            self.misses += 1
+            return None
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            self.expirations += 1
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any, generation: int | None = None) -> None:
+        """Store a value unless the cache was invalidated since `generation` was read."""
+        if not self.enabled:
+            return
+        if generation is not None and generation != self.generation:
+            return
+
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, key: Hashable) -> None:
+        self.generation += 1
+        if self._entries.pop(key, None) is not None:
+            self.invalidations += 1
+
+    def clear(self) -> None:
+        self.generation += 1
+        self.invalidations += len(self._entries)
+        self._entries.clear()
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": (self.hits / lookups) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+        }
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Caches
+# ─────────────────────────────────────────────────────────────────────────────
+
+# Validated users keyed by user id (UUID) - see security.get_current_user
+user_cache = TTLCache(
+    "users",
+    max_size=settings.USER_CACHE_MAX_SIZE,
+    ttl_seconds=settings.USER_CACHE_TTL_SECONDS,
+)
+
+
+# Table registry rows plus derived column metadata keyed by table id (str) -
+# see endpoints.tables.get_table_meta
+table_cache = TTLCache(
+    "tables",
+    max_size=settings.TABLE_CACHE_MAX_SIZE,
+    ttl_seconds=settings.TABLE_CACHE_TTL_SECONDS,
+)
+
+
+def _invalidator(cache: TTLCache) -> Callable[[dict[str, Any]], None]:
+    """Build a handler that evicts the old and new row ids of a change."""
+    def handler(payload: dict[str, Any]) -> None:
+        for record in (payload.get("new"), payload.get("old")):
+            if record and record.get("id"):
+                cache.invalidate(str(record["id"]))
+    return handler
+
+
+# Notification channel -> (handler, cache). Handlers receive the decoded
+# realtime_notify() payload; the cache is cleared whenever a payload
+# can't be decoded or the listener reconnects.
+_CHANNEL_HANDLERS: dict[str, tuple[Callable[[dict[str, Any]], None], TTLCache]] = {
+    "table:users": (_invalidator(user_cache), user_cache),
+    "table:tables": (_invalidator(table_cache), table_cache),
+}
+
+
+def get_cache_stats() -> dict[str, Any]:
+    """Per-cache counters for this worker."""
+    return {
+        "listener_connected": _listener_connected,
+        "caches": {cache.name: cache.stats() for _, cache in _CHANNEL_HANDLERS.values()},
+    }
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# LISTEN/NOTIFY Invalidation
+# ─────────────────────────────────────────────────────────────────────────────
+
+_listener_task: asyncio.Task | None = None
+_listener_connected = False
+
+
+def _clear_all() -> None:
+    for _, cache in _CHANNEL_HANDLERS.values():
+        cache.clear()
+
+
+def _dispatch(channel: str, payload: str) -> None:
+    handler, cache = _CHANNEL_HANDLERS.get(channel, (None, None))
+    if handler is None:
+        return
+    try:
+        handler(json.loads(payload))
+    except (ValueError, TypeError, AttributeError):
+        # Unparseable payload - drop everything this channel covers
+        cache.clear()
+
+
+async def _listen_forever() -> None:
+    global _listener_connected
+
+    conninfo = make_conninfo(
+        host=settings.POSTGRES_HOST,
+        port=settings.POSTGRES_PORT,
+        user=settings.POSTGRES_USER,
+        password=settings.POSTGRES_PASSWORD,
+        dbname=settings.POSTGRES_DB,
+        application_name="selfdb-cache-listener",
+    )
+    backoff = LISTENER_RECONNECT_MIN_SECONDS
+
+    while True:
+        try:
+            async with await psycopg.AsyncConnection.connect(conninfo, autocommit=True) as conn:
+                for channel in _CHANNEL_HANDLERS:
+                    await conn.execute(sql.SQL("LISTEN {}").format(sql.Identifier(channel)))
+
+                # Anything cached before (re)connecting may have missed a notification
+                _clear_all()
+                _listener_connected = True
+                backoff = LISTENER_RECONNECT_MIN_SECONDS
+
+                async for notify in conn.notifies():
+                    _dispatch(notify.channel, notify.payload)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"[{datetime.now()}] Cache listener disconnected: {e}")
+        finally:
+            _listener_connected = False
+            _clear_all()
+
+        await asyncio.sleep(backoff)
+        backoff = min(backoff * 2, LISTENER_RECONNECT_MAX_SECONDS)
+
+
+async def start_cache_listener() -> None:
+    """Start the per-worker LISTEN task. Caches stay bypassed until it connects."""
+    global _listener_task
+    if _listener_task is None:
+        _listener_task = asyncio.create_task(_listen_forever())
+
+
+async def stop_cache_listener() -> None:
+    """Stop the LISTEN task and drop all cached entries."""
+    global _listener_task
+    if _listener_task is not None:
+        _listener_task.cancel()
+        try:
+            await _listener_task
+        except asyncio.CancelledError:
+            pass
+        _listener_task = None
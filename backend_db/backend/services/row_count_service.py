@@ -0,0 +1,131 @@
+# row_count_service.py
+"""
+Contention-free maintenance of tables.row_count.
+
+Row writes used to run `UPDATE tables SET row_count = row_count ± 1` inside the
+user's transaction, so every concurrent writer to one table queued on the same
+registry row lock until the previous writer committed. Instead, writers append
+a delta to table_row_deltas (plain INSERTs never block each other) and a
+background task in each worker folds the log into tables.row_count and
+tables.updated_at every ROW_COUNT_FOLD_INTERVAL_SECONDS.
+
+Folds from several workers can overlap safely: each claims its batch of deltas
+with FOR UPDATE SKIP LOCKED and deletes them in the same transaction, so a
+delta is applied exactly once.
+"""
+
+import asyncio
+from datetime import datetime
+from uuid import UUID
+
+import psycopg
+
+import db as database
+from db import settings
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Recording
+# ─────────────────────────────────────────────────────────────────────────────
+
+async def record_row_delta(db: psycopg.AsyncConnection, table_id: UUID, delta: int) -> None:
+    """
+    Record a row count change in the caller's transaction.
+
+    A delta of 0 only marks the table as modified (tables.updated_at).
+    """
+    await db.execute(
+        "INSERT INTO table_row_deltas (table_id, delta) VALUES (%s, %s)",
+        (table_id, delta)
+    )
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Folding
+# ─────────────────────────────────────────────────────────────────────────────
+
+FOLD_SQL = """
+    WITH claimed AS (
+        SELECT id FROM table_row_deltas
+        ORDER BY id
+        LIMIT %s
+        FOR UPDATE SKIP LOCKED
+    ), folded AS (
+        DELETE FROM table_row_deltas d
+        USING claimed
+        WHERE d.id = claimed.id
+        RETURNING d.table_id, d.delta, d.created_at
+    ), totals AS (
+        SELECT table_id, SUM(delta) AS delta, MAX(created_at) AS changed_at, COUNT(*) AS deltas
+        FROM folded
+        GROUP BY table_id
+    ), applied AS (
+        UPDATE tables t
+        SET row_count = GREATEST(t.row_count + totals.delta, 0),
+            updated_at = GREATEST(t.updated_at, totals.changed_at)
+        FROM totals
+        WHERE t.id = totals.table_id
+    )
+    SELECT COALESCE(SUM(deltas), 0)::bigint AS folded FROM totals
+"""
+
+
+async def fold_row_deltas(db: psycopg.AsyncConnection) -> int:
+    """
+    Fold pending deltas into the tables registry.
+
+    Returns:
+        Number of delta rows folded (deltas of deleted tables are dropped)
+    """
+    total = 0
+    while True:
+        result = await db.execute(FOLD_SQL, (settings.ROW_COUNT_FOLD_BATCH_SIZE,))
+        row = await result.fetchone()
+        await db.commit()
+        folded = row['folded'] if row else 0
+        total += folded
+        if folded < settings.ROW_COUNT_FOLD_BATCH_SIZE:
+            return total
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Background Task
+# ─────────────────────────────────────────────────────────────────────────────
+
+_folder_task: asyncio.Task | None = None
+
+
+async def _fold_forever() -> None:
+    while True:
+        await asyncio.sleep(settings.ROW_COUNT_FOLD_INTERVAL_SECONDS)
+        try:
+            async with database.pool.connection() as conn:
+                await fold_row_deltas(conn)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"[{datetime.now()}] Row count fold failed: {e}")
+
+
+async def start_row_count_folder() -> None:
+    """Start the per-worker fold task."""
+    global _folder_task
+    if _folder_task is None:
+        _folder_task = asyncio.create_task(_fold_forever())
+
+
+async def stop_row_count_folder() -> None:
+    """Stop the fold task and fold whatever is still pending."""
+    global _folder_task
+    if _folder_task is not None:
+        _folder_task.cancel()
+        try:
+            await _folder_task
+        except asyncio.CancelledError:
+            pass
+        _folder_task = None
+
+    try:
+        async with database.pool.connection() as conn:
+            await fold_row_deltas(conn)
+    except Exception as e:
+        print(f"[{datetime.now()}] Row count fold failed: {e}")
@@ -0,0 +1,246 @@
+# sql_history_service.py
+"""
+Buffered, batched writes to sql_history.
+
+The SQL endpoints used to INSERT and commit a history row on the request path
+after every query (failed ones included), costing each request two extra round
+trips. Now they only queue the record in memory; a background task in each
+worker writes the queue with one COPY per batch, as soon as
+SQL_HISTORY_BATCH_SIZE records are waiting or the oldest has waited
+SQL_HISTORY_FLUSH_INTERVAL_MS, and flushes what is left on shutdown. History
+therefore shows up in GET /sql/history up to that interval late.
+
+The same task enforces retention: every SQL_HISTORY_PURGE_INTERVAL_SECONDS it
+deletes entries older than SQL_HISTORY_RETENTION_DAYS in batches, so the table
+stays bounded without an external job.
+"""
+
+import asyncio
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Dict, List
+from uuid import UUID
+
+import psycopg
+from psycopg.types.json import Jsonb
+
+import db as database
+from db import settings
+
+HISTORY_COLUMNS = "id, query, is_read_only, execution_time, row_count, error, user_id, job_id, executed_at, plan"
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Recording
+# ─────────────────────────────────────────────────────────────────────────────
+
+_queue: asyncio.Queue | None = None
+_dropped = 0
+
+
+def _history_queue() -> asyncio.Queue:
+    # Created lazily so it binds to the running event loop
+    global _queue
+    if _queue is None:
+        _queue = asyncio.Queue(maxsize=settings.SQL_HISTORY_QUEUE_MAX_SIZE)
+    return _queue
+
+
+def record_sql_history(
+    query: str,
+    is_read_only: bool,
+    execution_time: float,
+    row_count: int,
+    error: str | None,
+    user_id: UUID,
+    job_id: UUID | None = None,
+    plan: Dict[str, Any] | None = None
+) -> UUID | None:
+    """
+    Queue a query execution for sql_history. Never blocks and never raises:
+    when the queue is full the record is dropped and counted.
+    
+    Returns:
+        The id the entry will have once written, or None if it was dropped
+    """
+    global _dropped
+    history_id = uuid.uuid4()
+    try:
+        _history_queue().put_nowait((
+            history_id, query, is_read_only, execution_time, row_count,
+            error, user_id, job_id, datetime.now(timezone.utc),
+            Jsonb(plan) if plan is not None else None
+        ))
+    except asyncio.QueueFull:
+        _dropped += 1
+        return None
+    return history_id
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Writing
+# ─────────────────────────────────────────────────────────────────────────────
+
+async def write_history_records(db: psycopg.AsyncConnection, records: List[tuple]) -> None:
+    """
+    Write queued records in one transaction with COPY.
+
+    COPY fails as a whole if one record's user was deleted meanwhile, so that
+    batch is retried with executemany, skipping records of missing users.
+    """
+    try:
+        async with db.cursor() as cur:
+            async with cur.copy(f"COPY sql_history ({HISTORY_COLUMNS}) FROM STDIN") as copy:
+                for record in records:
+                    await copy.write_row(record)
+        await db.commit()
+    except psycopg.errors.ForeignKeyViolation:
+        await db.rollback()
+        async with db.cursor() as cur:
+            await cur.executemany(
+                f"""
+                INSERT INTO sql_history ({HISTORY_COLUMNS})
+                SELECT %s, %s, %s, %s, %s, %s, u.id, %s, %s, %s
+                FROM users u
+                WHERE u.id = %s
+                """,
+                [(*record[:6], *record[7:], record[6]) for record in records]
+            )
+        await db.commit()
+
+
+async def _write_batch(records: List[tuple]) -> None:
+    global _dropped
+    if _dropped:
+        print(f"[{datetime.now()}] SQL history queue full, dropped {_dropped} record(s)")
+        _dropped = 0
+    try:
+        async with database.pool.connection() as conn:
+            await write_history_records(conn, records)
+    except Exception as e:
+        print(f"[{datetime.now()}] Failed to write {len(records)} SQL history record(s): {e}")
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Retention
+# ─────────────────────────────────────────────────────────────────────────────
+
+PURGE_BATCH_SIZE = 10000
+
+PURGE_SQL = """
+    WITH expired AS (
+        SELECT id FROM sql_history
+        WHERE executed_at < now() - make_interval(days => %s)
+        LIMIT %s
+        FOR UPDATE SKIP LOCKED
+    )
+    DELETE FROM sql_history h
+    USING expired
+    WHERE h.id = expired.id
+"""
+
+
+async def purge_sql_history(db: psycopg.AsyncConnection) -> int:
+    """
+    Delete history older than SQL_HISTORY_RETENTION_DAYS, PURGE_BATCH_SIZE rows
+    per transaction so a large backlog never holds long locks.
+
+    Returns:
+        Number of entries deleted
+    """
+    total = 0
+    while True:
+        result = await db.execute(PURGE_SQL, (settings.SQL_HISTORY_RETENTION_DAYS, PURGE_BATCH_SIZE))
+        await db.commit()
+        total += result.rowcount
+        if result.rowcount < PURGE_BATCH_SIZE:
+            return total
+
+
+async def _purge() -> None:
+    try:
+        async with database.pool.connection() as conn:
+            await purge_sql_history(conn)
+    except Exception as e:
+        print(f"[{datetime.now()}] SQL history purge failed: {e}")
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Background Task
+# ─────────────────────────────────────────────────────────────────────────────
+
+_writer_task: asyncio.Task | None = None
+# Records taken off the queue but not yet handed to a write
+_buffer: List[tuple] = []
+# The write in progress; shielded so stopping the writer never cuts a COPY short
+_write_task: asyncio.Task | None = None
+
+
+async def _write_forever() -> None:
+    global _write_task
+    queue = _history_queue()
+    loop = asyncio.get_running_loop()
+    next_purge = loop.time()
+
+    while True:
+        if settings.SQL_HISTORY_RETENTION_DAYS > 0 and loop.time() >= next_purge:
+            await _purge()
+            next_purge = loop.time() + settings.SQL_HISTORY_PURGE_INTERVAL_SECONDS
+
+        try:
+            async with asyncio.timeout(settings.SQL_HISTORY_PURGE_INTERVAL_SECONDS):
+                _buffer.append(await queue.get())
+        except TimeoutError:
+            continue
+
+        # Gather until the batch is full or the first record has waited long enough
+        deadline = loop.time() + settings.SQL_HISTORY_FLUSH_INTERVAL_MS / 1000
+        while len(_buffer) < settings.SQL_HISTORY_BATCH_SIZE:
+            try:
+                _buffer.append(queue.get_nowait())
+                continue
+            except asyncio.QueueEmpty:
+                pass
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                async with asyncio.timeout(remaining):
+                    _buffer.append(await queue.get())
+            except TimeoutError:
+                break
+
+        records = _buffer[:]
+        _buffer.clear()
+        _write_task = asyncio.create_task(_write_batch(records))
+        await asyncio.shield(_write_task)
+
+
+async def start_sql_history_writer() -> None:
+    """Start the per-worker history writer."""
+    global _writer_task
+    if _writer_task is None:
+        _writer_task = asyncio.create_task(_write_forever())
+
+
+async def stop_sql_history_writer() -> None:
+    """Stop the writer and flush every record still queued."""
+    global _writer_task, _write_task
+    if _writer_task is not None:
+        _writer_task.cancel()
+        try:
+            await _writer_task
+        except asyncio.CancelledError:
+            pass
+        _writer_task = None
+
+    if _write_task is not None:
+        await _write_task
+        _write_task = None
+
+    queue = _history_queue()
+    records = _buffer[:]
+    _buffer.clear()
+    while not queue.empty():
+        records.append(queue.get_nowait())
+    for start in range(0, len(records), settings.SQL_HISTORY_BATCH_SIZE):
+        await _write_batch(records[start:start + settings.SQL_HISTORY_BATCH_SIZE])
@@ -162,14 +162,32 @@ async def upload_file_streaming(
     return response.json()
 
 
-async def download_file(bucket: str, path: str) -> httpx.Response:
-    """Download a file from a bucket (returns streaming response)."""
+async def download_file(
+    bucket: str,
+    path: str,
+    method: str = "GET",
+    range_header: str | None = None,
+    if_range: str | None = None
+) -> httpx.Response:
+    """
+    Open a download from a bucket without reading the body.
+    
+    Range / If-Range are forwarded, so the response may be 206 (or 416, raised
+    as httpx.HTTPStatusError like any error status). The caller streams the body
+    and must close the response with `aclose()`.
+    """
+    headers = {}
+    if range_header:
+        headers["Range"] = range_header
+    if if_range:
+        headers["If-Range"] = if_range
+    
     client = await get_client()
-    response = await client.get(
-        f"{STORAGE_BASE_URL}/files/{bucket}/{path}",
-        follow_redirects=True
-    )
-    response.raise_for_status()
+    request = client.build_request(method, f"{STORAGE_BASE_URL}/files/{bucket}/{path}", headers=headers)
+    response = await client.send(request, stream=True, follow_redirects=True)
+    if response.is_error:
+        await response.aclose()
+        response.raise_for_status()
     return response
 
 
@@ -180,6 +198,73 @@ async def delete_file(bucket: str, path: str) -> None:
     response.raise_for_status()
 
 
+# ─────────────────────────────────────────────────────────────────────────────
+# Resumable Upload Sessions
+# ─────────────────────────────────────────────────────────────────────────────
+
+async def create_upload_session(size: int, ttl_seconds: float) -> dict:
+    """Create an upload session for `size` bytes; returns its status."""
+    client = await get_client()
+    response = await client.post(
+        f"{STORAGE_BASE_URL}/uploads",
+        json={"size": size, "ttl_seconds": ttl_seconds}
+    )
+    response.raise_for_status()
+    return response.json()
+
+
+async def get_upload_session(session_id: str) -> dict:
+    """Received ranges and resume offset of a session."""
+    client = await get_client()
+    response = await client.get(f"{STORAGE_BASE_URL}/uploads/{session_id}")
+    response.raise_for_status()
+    return response.json()
+
+
+async def upload_chunk(
+    session_id: str,
+    offset: int,
+    stream: AsyncGenerator[bytes, None],
+    content_length: int
+) -> dict:
+    """Stream one chunk into a session at `offset`; returns the session status."""
+    client = await get_client()
+    response = await client.put(
+        f"{STORAGE_BASE_URL}/uploads/{session_id}",
+        params={"offset": offset},
+        content=stream,
+        headers={"Content-Length": str(content_length)}
+    )
+    response.raise_for_status()
+    return response.json()
+
+
+async def assemble_upload_session(session_id: str) -> dict:
+    """Assemble a session's chunks into a staged file; returns its size and checksum."""
+    client = await get_client()
+    response = await client.post(f"{STORAGE_BASE_URL}/uploads/{session_id}/assemble")
+    response.raise_for_status()
+    return response.json()
+
+
+async def complete_upload_session(session_id: str, bucket: str, path: str, content_type: str) -> dict:
+    """Move an assembled session's file into bucket/path; returns the same result as an upload."""
+    client = await get_client()
+    response = await client.post(
+        f"{STORAGE_BASE_URL}/uploads/{session_id}/complete/{bucket}/{path}",
+        headers={"Content-Type": content_type}
+    )
+    response.raise_for_status()
+    return response.json()
+
+
+async def abort_upload_session(session_id: str) -> None:
+    """Discard a session and its chunks."""
+    client = await get_client()
+    response = await client.delete(f"{STORAGE_BASE_URL}/uploads/{session_id}")
+    response.raise_for_status()
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # Health Check
 # ─────────────────────────────────────────────────────────────────────────────
@@ -0,0 +1,81 @@
+# utils/counting.py
+"""Row count strategies for paginated list endpoints."""
+
+import json
+from typing import Any, Literal, Sequence
+
+import psycopg
+from psycopg import sql
+
+# - exact:     SELECT COUNT(*) with the same filter (default, scans every match)
+# - planned:   the planner's row estimate from EXPLAIN for the same filter
+# - estimated: pg_class.reltuples for unfiltered listings, planned otherwise
+# - none:      no total; callers report has_more from a LIMIT + 1 fetch instead
+CountStrategy = Literal["exact", "planned", "estimated", "none"]
+
+COUNT_STRATEGY_DESCRIPTION = (
+    "How `total` is computed: exact (COUNT(*)), planned (planner estimate), "
+    "estimated (table statistics, unfiltered only - falls back to planned), "
+    "or none (no total, use has_more)"
+)
+
+
+def _as_sql(fragment: str | sql.Composable) -> sql.Composable:
+    return fragment if isinstance(fragment, sql.Composable) else sql.SQL(fragment)
+
+
+async def count_rows(
+    db: psycopg.AsyncConnection,
+    from_clause: str | sql.Composable,
+    params: Sequence[Any] | None,
+    strategy: CountStrategy,
+    *,
+    relation: str | None = None,
+) -> tuple[int | None, CountStrategy]:
+    """
+    Count the rows matched by `FROM ... WHERE ...` using the requested strategy.
+
+    Args:
+        db: The database connection
+        from_clause: Trusted "FROM <table> [WHERE ...]" fragment with %s placeholders
+        params: Parameters for the placeholders in from_clause
+        strategy: Requested count strategy
+        relation: Table name when the listing is unfiltered, enables "estimated"
+
+    Returns:
+        (total, strategy that produced it) - total is None for "none"
+    """
+    if strategy == "none":
+        return None, "none"
+
+    from_sql = _as_sql(from_clause)
+    params = tuple(params) if params else None
+
+    if strategy == "estimated":
+        if relation is not None:
+            result = await db.execute(
+                "SELECT reltuples::bigint AS estimate FROM pg_class WHERE oid = to_regclass(%s)",
+                (sql.Identifier(relation).as_string(db),)
+            )
+            row = await result.fetchone()
+            # reltuples is -1 until the table is first vacuumed/analyzed
+            if row and row['estimate'] is not None and row['estimate'] >= 0:
+                return int(row['estimate']), "estimated"
+        strategy = "planned"
+
+    if strategy == "planned":
+        result = await db.execute(
+            sql.SQL("EXPLAIN (FORMAT JSON) SELECT 1 {}").format(from_sql),
+            params
+        )
+        row = await result.fetchone()
+        plan = row['QUERY PLAN'] if row else None
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        if plan:
+            return int(plan[0]["Plan"]["Plan Rows"]), "planned"
+        strategy = "exact"
+
+    result = await db.execute(sql.SQL("SELECT COUNT(*) {}").format(from_sql), params)
+    row = await result.fetchone()
+    return (row['count'] if row else 0), "exact"
@@ -0,0 +1,66 @@
+# utils/export.py
+"""
+Streaming table export (GET /tables/{id}/export).
+
+Rows leave Postgres through COPY ... TO STDOUT and are forwarded in fixed-size
+chunks, so memory stays bounded by EXPORT_CHUNK_BYTES plus libpq's buffer no
+matter how large the table is:
+- csv: COPY's own CSV output, with a header line
+- ndjson: one row_to_json() document per row; COPY's text escaping is undone by
+  psycopg's row parser before each line is written out
+"""
+
+from typing import AsyncIterator, Literal
+
+import psycopg
+
+ExportFormat = Literal["csv", "ndjson"]
+
+EXPORT_CHUNK_BYTES = 64 * 1024
+
+EXPORT_MEDIA_TYPES: dict[str, str] = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+}
+
+
+def export_copy_sql(table_name: str, data_format: ExportFormat) -> str:
+    """COPY statement that writes the whole table to STDOUT in data_format."""
+    if data_format == "csv":
+        return f'COPY "{table_name}" TO STDOUT (FORMAT csv, HEADER)'
+    return f'COPY (SELECT row_to_json(t)::text FROM "{table_name}" AS t) TO STDOUT'
+
+
+async def stream_export(
+    db: psycopg.AsyncConnection,
+    table_name: str,
+    data_format: ExportFormat,
+    chunk_bytes: int = EXPORT_CHUNK_BYTES,
+) -> AsyncIterator[bytes]:
+    """
+    Yield the table's rows as CSV or NDJSON in chunks of about chunk_bytes.
+
+    The export runs in one read-only snapshot, which is rolled back when the
+    stream ends or the client goes away.
+    """
+    buffer = bytearray()
+    try:
+        async with db.cursor() as cur:
+            async with cur.copy(export_copy_sql(table_name, data_format)) as copy:
+                if data_format == "csv":
+                    async for data in copy:
+                        buffer += data
+                        if len(buffer) >= chunk_bytes:
+                            yield bytes(buffer)
+                            buffer.clear()
+                else:
+                    async for (document,) in copy.rows():
+                        buffer += document.encode()
+                        buffer += b"\n"
+                        if len(buffer) >= chunk_bytes:
+                            yield bytes(buffer)
+                            buffer.clear()
+        if buffer:
+            yield bytes(buffer)
+    finally:
+        await db.rollback()
@@ -0,0 +1,129 @@
+# utils/ingest.py
+"""
+Record framing for streamed bulk ingest (POST /tables/{id}/data/bulk).
+
+The request body is decoded and split into records as it arrives, so only the
+current batch is ever held in memory:
+- ndjson: one JSON object per line, blank lines ignored
+- csv: one record per line, except that quoted fields may span lines - a record
+  ends at the first newline where the number of '"' seen so far is even
+  (escaped quotes are doubled, so they never change the parity)
+"""
+
+import bisect
+import codecs
+import re
+from typing import AsyncIterator, Literal, Sequence
+
+BulkFormat = Literal["ndjson", "csv"]
+
+# Upper bound for a single record, guards against unterminated lines/quotes
+MAX_RECORD_CHARS = 8 * 1024 * 1024
+
+# Postgres reports the failing input line of a COPY as "COPY <table>, line N[, column ...]"
+COPY_LINE_PATTERN = re.compile(r'\bline (\d+)\b')
+
+
+class RecordSplitter:
+    """Incrementally split decoded text into records."""
+
+    def __init__(self, data_format: BulkFormat, max_record_chars: int = MAX_RECORD_CHARS) -> None:
+        self.csv = data_format == "csv"
+        self.max_record_chars = max_record_chars
+        self._line: list[str] = []  # Pieces of the current, unterminated line
+        self._line_chars = 0
+        self._record: list[str] = []  # Lines of a CSV record with an open quote
+        self._record_chars = 0
+        self._quotes = 0
+
+    def feed(self, text: str) -> list[str]:
+        """Add decoded text, return the records it completed."""
+        *lines, rest = text.split("\n")
+        records = []
+        for piece in lines:
+            self._line.append(piece)
+            record = self._end_line("".join(self._line))
+            self._line.clear()
+            self._line_chars = 0
+            if record is not None:
+                records.append(record)
+
+        if rest:
+            self._line.append(rest)
+            self._line_chars += len(rest)
+            self._check_size(self._line_chars + self._record_chars)
+        return records
+
+    def close(self) -> list[str]:
+        """Flush the final record at end of input."""
+        records = []
+        if self._line:
+            record = self._end_line("".join(self._line))
+            self._line.clear()
+            if record is not None:
+                records.append(record)
+        if self._record:
+            raise ValueError("Unterminated quoted field at end of input")
+        return records
+
+    def _end_line(self, line: str) -> str | None:
+        if self.csv:
+            self._quotes += line.count('"')
+            self._record.append(line)
+            self._record_chars += len(line) + 1
+            self._check_size(self._record_chars)
+            if self._quotes % 2:
+                return None
+            line = "\n".join(self._record)
+            self._record.clear()
+            self._record_chars = 0
+            self._quotes = 0
+        else:
+            self._check_size(len(line))
+
+        line = line.removesuffix("\r")
+        return line if line.strip() else None
+
+    def _check_size(self, chars: int) -> None:
+        if chars > self.max_record_chars:
+            raise ValueError(f"Record exceeds {self.max_record_chars} characters")
+
+
+async def iter_records(chunks: AsyncIterator[bytes], data_format: BulkFormat) -> AsyncIterator[str]:
+    """
+    Yield records from a streamed UTF-8 body.
+
+    Raises:
+        ValueError: On invalid UTF-8, an oversized record or an unterminated CSV quote
+    """
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    splitter = RecordSplitter(data_format)
+    try:
+        async for chunk in chunks:
+            for record in splitter.feed(decoder.decode(chunk)):
+                yield record
+        for record in splitter.feed(decoder.decode(b"", final=True)):
+            yield record
+    except UnicodeDecodeError as e:
+        raise ValueError(f"Body is not valid UTF-8: {e.reason}") from e
+    for record in splitter.close():
+        yield record
+
+
+def copy_error_index(context: str | None, line_starts: Sequence[int]) -> int | None:
+    """
+    Map a COPY error back to the record that caused it.
+
+    Args:
+        context: The error's diag.context ("COPY <table>, line N, ...")
+        line_starts: COPY line number of each record of the batch. COPY counts
+            records, so a quoted CSV field spanning lines does not advance it
+
+    Returns:
+        Index into the batch, or None if the error isn't tied to an input line
+    """
+    match = COPY_LINE_PATTERN.search(context or "")
+    if not match or not line_starts:
+        return None
+    index = bisect.bisect_right(line_starts, int(match.group(1))) - 1
+    return index if index >= 0 else None
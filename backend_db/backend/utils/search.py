@@ -0,0 +1,80 @@
+# utils/search.py
+"""
+SQL builders for table data search.
+
+Search over a user table runs one of three ways:
+- ILIKE (default): '"col"::text ILIKE %s' OR-ed over every text column, always a
+  sequential scan
+- trigram: the same ILIKE predicates, restricted to the indexed columns, served
+  by one pg_trgm GIN index per column (BitmapOr)
+- fulltext: an expression GIN index on to_tsvector(...) matched with
+  websearch_to_tsquery - word search instead of substring search
+
+The index expressions built here must match the query expressions exactly, so
+both sides are generated from the same functions.
+"""
+
+import hashlib
+import re
+from typing import Literal, Sequence
+
+SearchMethod = Literal["trigram", "fulltext"]
+
+# Text search configurations are plain identifiers (simple, english, ...)
+TS_CONFIG_PATTERN = re.compile(r'^[a-z_][a-z0-9_]*$')
+
+
+def search_index_name(table_name: str, method: SearchMethod, definition: str = "") -> str:
+    """
+    Deterministic index name that stays within Postgres' 63-char limit.
+
+    definition is what the index covers (the column of a trigram index; the
+    columns and language of a fulltext index), so a changed definition gets a
+    new name instead of being skipped by CREATE INDEX IF NOT EXISTS.
+    """
+    digest = hashlib.md5(f"{table_name}.{definition}".encode()).hexdigest()[:16]
+    return f"search_{method}_{digest}"
+
+
+def ilike_clause(columns: Sequence[str]) -> str:
+    """'"a"::text ILIKE %s OR "b"::text ILIKE %s' - one parameter per column."""
+    return " OR ".join(f'"{col}"::text ILIKE %s' for col in columns)
+
+
+def fulltext_expression(columns: Sequence[str], language: str) -> str:
+    """The to_tsvector() expression shared by the fulltext index and its queries."""
+    document = " || ' ' || ".join(f"""coalesce("{col}"::text, '')""" for col in columns)
+    return f"to_tsvector('{language}'::regconfig, {document})"
+
+
+def fulltext_clause(columns: Sequence[str], language: str) -> str:
+    """Fulltext match predicate - takes the raw search term as its only parameter."""
+    return f"{fulltext_expression(columns, language)} @@ websearch_to_tsquery('{language}'::regconfig, %s)"
+
+
+def search_index_ddl(
+    table_name: str,
+    columns: Sequence[str],
+    method: SearchMethod,
+    language: str = "simple",
+    concurrently: bool = True,
+) -> list[tuple[str, str]]:
+    """Return [(index_name, CREATE INDEX statement)] for a table's search index."""
+    create = "CREATE INDEX CONCURRENTLY IF NOT EXISTS" if concurrently else "CREATE INDEX IF NOT EXISTS"
+
+    if method == "trigram":
+        statements = []
+        for col in columns:
+            name = search_index_name(table_name, method, col)
+            statements.append((
+                name,
+                f'{create} "{name}" ON "{table_name}" USING gin ((("{col}")::text) gin_trgm_ops)'
+            ))
+        return statements
+
+    # Column order is part of the expression, so it is part of the name too
+    name = search_index_name(table_name, method, f"{','.join(columns)}:{language}")
+    return [(
+        name,
+        f'{create} "{name}" ON "{table_name}" USING gin (({fulltext_expression(columns, language)}))'
+    )]
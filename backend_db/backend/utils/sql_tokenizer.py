@@ -0,0 +1,197 @@
+# utils/sql_tokenizer.py
+"""
+Single-pass SQL statement splitter for the SQL editor.
+
+split_statements() walks the script once, jumping between the only characters
+that can change lexical state (; ' " $ - /) with compiled regexes, so a multi-MB
+migration script is split in time linear in its size. It understands:
+- 'standard' strings ('' escapes) and E'escape' strings (backslash escapes)
+- "quoted identifiers"
+- $$dollar$$ and $tag$dollar$tag$ quoted bodies
+- -- line comments and nested /* block */ comments
+
+Each SqlStatement keeps the text as written (what gets executed) plus a
+normalized `code` form - lowercase, comments removed, string literals and
+dollar-quoted bodies emptied - that statements are classified on without
+string contents causing false matches. Security checks that must also see
+inside function bodies use the raw text instead (see written_tables).
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Iterator, List
+
+# Characters that can start a token other than plain code
+SPECIAL_CHARS = re.compile(r"[;'\"$/-]")
+STRING_END = re.compile(r"[^']*(?:''[^']*)*'")
+ESCAPE_STRING_END = re.compile(r"(?:[^'\\]|\\.|'')*'", re.DOTALL)
+IDENTIFIER_END = re.compile(r'[^"]*(?:""[^"]*)*"')
+DOLLAR_TAG = re.compile(r"\$(?:[A-Za-z_\u0080-\uffff][A-Za-z0-9_\u0080-\uffff]*)?\$")
+BLOCK_COMMENT_DELIMITER = re.compile(r"/\*|\*/")
+
+FIRST_KEYWORD = re.compile(r"[\s(]*([a-z_]+)")
+READ_ONLY_KEYWORDS = frozenset({'select', 'explain', 'show', 'describe', 'with'})
+# Parentheses, quoted identifiers and INTO, to find a SELECT ... INTO new_table
+# outside subqueries; INSERT INTO / MERGE INTO (after a WITH) match as a whole
+INTO_SCAN = re.compile(r'[()]|"[^"]*(?:""[^"]*)*"|\b(?:insert|merge)\s+into\b|\binto\b')
+
+DROP_TABLE_PREFIX = re.compile(r"drop\s+table\s+(?:if\s+exists\s+)?")
+# An optionally schema-qualified, optionally quoted table name (group 1)
+TABLE_NAME = r'("?\w+"?(?:\."?\w+"?)?)'
+DROP_TABLE_NAME = re.compile(r"\s*" + TABLE_NAME + r"\s*(,?)")
+# No leading \b: it disables re's literal prefix search (4x slower on large
+# scripts), so the word boundary is checked on the few matches instead
+WRITE_TARGET = re.compile(
+    r"(?:insert\s+into|update|delete\s+from|drop\s+table|truncate)\s+"
+    r"(?:if\s+exists\s+|only\s+|table\s+)?" + TABLE_NAME
+)
+
+
+@dataclass(slots=True)
+class SqlStatement:
+    """One statement of a script, without its terminating semicolon."""
+    text: str
+    code: str
+    keyword: str = field(init=False)
+
+    def __post_init__(self) -> None:
+        match = FIRST_KEYWORD.match(self.code)
+        self.keyword = match.group(1) if match else ""
+
+    @property
+    def is_read_only(self) -> bool:
+        """SELECT, EXPLAIN, SHOW, DESCRIBE or WITH, unless it is a SELECT ... INTO."""
+        return self.keyword in READ_ONLY_KEYWORDS and not self.selects_into()
+
+    def selects_into(self) -> bool:
+        """Whether a SELECT / WITH statement has a top-level INTO (creates a table)."""
+        if self.keyword not in ('select', 'with'):
+            return False
+        depth = 0
+        for match in INTO_SCAN.finditer(self.code):
+            token = match.group()
+            if token == "(":
+                depth += 1
+            elif token == ")":
+                depth -= 1
+            elif token == "into" and depth == 0:
+                return True
+        return False
+
+    def dropped_tables(self) -> List[str]:
+        """Table names of a DROP TABLE statement, lowercase and unquoted ("schema.table" if qualified)."""
+        prefix = DROP_TABLE_PREFIX.match(self.code)
+        if not prefix:
+            return []
+        names = []
+        pos = prefix.end()
+        while match := DROP_TABLE_NAME.match(self.code, pos):
+            names.append(match.group(1).replace('"', ''))
+            if not match.group(2):
+                break
+            pos = match.end()
+        return names
+
+    def written_tables(self) -> Iterator[str]:
+        """
+        Every table named after INSERT INTO / UPDATE / DELETE FROM / DROP TABLE /
+        TRUNCATE anywhere in the raw text, including string literals and
+        function bodies - deliberately conservative, for security checks.
+        Names are lowercase and unquoted ("schema.table" if qualified).
+        """
+        text = self.text.lower()
+        for match in WRITE_TARGET.finditer(text):
+            start = match.start()
+            if start and (text[start - 1].isalnum() or text[start - 1] == "_"):
+                continue
+            yield match.group(1).replace('"', '')
+
+
+def _string_end(sql: str, start: int, escapes: bool) -> int:
+    """Index just past the string literal whose opening quote is at start - 1."""
+    match = (ESCAPE_STRING_END if escapes else STRING_END).match(sql, start)
+    return match.end() if match else len(sql)
+
+
+def _block_comment_end(sql: str, start: int) -> int:
+    """Index just past the (possibly nested) block comment opened at start - 2."""
+    depth = 1
+    for match in BLOCK_COMMENT_DELIMITER.finditer(sql, start):
+        depth += 1 if match.group() == "/*" else -1
+        if depth == 0:
+            return match.end()
+    return len(sql)
+
+
+def split_statements(sql: str) -> List[SqlStatement]:
+    """
+    Split a SQL script into statements in a single pass.
+
+    Statements that are empty once comments are removed are dropped. An
+    unterminated string, identifier, dollar quote or comment runs to the end
+    of the script, as it would for the server.
+    """
+    statements: List[SqlStatement] = []
+    code_parts: List[str] = []
+    statement_start = 0  # Start of the current statement's text
+    segment_start = 0    # Start of plain code not yet copied into code_parts
+    pos = 0
+    length = len(sql)
+
+    def end_statement(end: int) -> None:
+        code_parts.append(sql[segment_start:end])
+        code = "".join(code_parts).strip().lower()
+        code_parts.clear()
+        if code:
+            statements.append(SqlStatement(text=sql[statement_start:end].strip(), code=code))
+
+    while match := SPECIAL_CHARS.search(sql, pos):
+        i = match.start()
+        char = sql[i]
+
+        if char == ";":
+            end_statement(i)
+            statement_start = segment_start = pos = i + 1
+            continue
+
+        if char == "'":
+            # E'...' allows backslash escapes; the E must not end a longer word
+            escapes = (
+                i > 0 and sql[i - 1] in "eE"
+                and (i < 2 or not (sql[i - 2].isalnum() or sql[i - 2] == "_"))
+            )
+            end = _string_end(sql, i + 1, escapes)
+            code_parts.append(sql[segment_start:i])
+            code_parts.append("''")
+            segment_start = pos = end
+        elif char == '"':
+            # Identifiers stay in the code form (table names are parsed from it)
+            match = IDENTIFIER_END.match(sql, i + 1)
+            pos = match.end() if match else length
+        elif char == "$":
+            tag = DOLLAR_TAG.match(sql, i)
+            # $1 parameters and identifiers containing $ are plain code
+            if not tag or (i > 0 and (sql[i - 1].isalnum() or sql[i - 1] == "_")):
+                pos = i + 1
+                continue
+            close = sql.find(tag.group(), tag.end())
+            end = length if close == -1 else close + len(tag.group())
+            code_parts.append(sql[segment_start:i])
+            code_parts.append(tag.group() * 2)
+            segment_start = pos = end
+        elif sql.startswith("--", i):
+            end = sql.find("\n", i)
+            end = length if end == -1 else end
+            code_parts.append(sql[segment_start:i])
+            code_parts.append(" ")
+            segment_start = pos = end
+        elif sql.startswith("/*", i):
+            end = _block_comment_end(sql, i + 2)
+            code_parts.append(sql[segment_start:i])
+            code_parts.append(" ")
+            segment_start = pos = end
+        else:
+            pos = i + 1
+
+    end_statement(length)
+    return statements
@@ -0,0 +1,94 @@
+# utils/table_stats.py
+"""Size, vacuum and scan statistics for tables in the public schema."""
+
+from typing import List
+
+import psycopg
+
+from models.table import TableStats
+
+# One catalog query per call: pg_stat_user_tables for the counters, sizes from
+# the relation files, per-index usage aggregated as JSON. The bloat estimate
+# compares relpages against the pages reltuples rows of pg_stats' average width
+# would need (28 bytes of tuple header + line pointer each, 24-byte page header).
+TABLE_STATS_SQL = """
+    SELECT
+        t.id AS table_id,
+        c.relname AS name,
+        pg_total_relation_size(c.oid) AS total_bytes,
+        pg_relation_size(c.oid) AS table_bytes,
+        pg_indexes_size(c.oid) AS index_bytes,
+        s.n_live_tup AS live_tuples,
+        s.n_dead_tup AS dead_tuples,
+        COALESCE(s.n_dead_tup::float8 / NULLIF(s.n_live_tup + s.n_dead_tup, 0), 0) AS dead_tuple_ratio,
+        CASE WHEN c.reltuples >= 0 AND w.row_width IS NOT NULL THEN
+            GREATEST(
+                c.relpages - ceil(c.reltuples * (28 + w.row_width) / (b.block_size - 24)),
+                0
+            )::bigint * b.block_size
+        END AS bloat_bytes,
+        s.seq_scan,
+        s.seq_tup_read,
+        COALESCE(s.idx_scan, 0) AS idx_scan,
+        COALESCE(s.idx_tup_fetch, 0) AS idx_tup_fetch,
+        s.n_mod_since_analyze,
+        s.last_vacuum,
+        s.last_autovacuum,
+        s.last_analyze,
+        s.last_autoanalyze,
+        COALESCE(ix.indexes, '[]'::jsonb) AS indexes
+    FROM pg_class c
+    JOIN pg_stat_user_tables s ON s.relid = c.oid
+    CROSS JOIN (SELECT current_setting('block_size')::int AS block_size) b
+    LEFT JOIN tables t ON t.name = c.relname
+    LEFT JOIN LATERAL (
+        SELECT sum(avg_width) AS row_width
+        FROM pg_stats
+        WHERE schemaname = 'public' AND tablename = c.relname
+    ) w ON TRUE
+    LEFT JOIN LATERAL (
+        SELECT jsonb_agg(jsonb_build_object(
+            'name', i.indexrelname,
+            'size_bytes', pg_relation_size(i.indexrelid),
+            'is_primary', x.indisprimary,
+            'is_unique', x.indisunique,
+            'idx_scan', i.idx_scan,
+            'idx_tup_read', i.idx_tup_read,
+            'idx_tup_fetch', i.idx_tup_fetch,
+            'last_idx_scan', i.last_idx_scan,
+            'unused', i.idx_scan = 0 AND NOT x.indisunique
+        ) ORDER BY i.indexrelname) AS indexes
+        FROM pg_stat_user_indexes i
+        JOIN pg_index x ON x.indexrelid = i.indexrelid
+        WHERE i.relid = c.oid
+    ) ix ON TRUE
+    WHERE c.relnamespace = 'public'::regnamespace
+      AND c.relkind IN ('r', 'p')
+      AND (%(name)s::text IS NULL OR c.relname = %(name)s)
+    ORDER BY total_bytes DESC, c.relname
+    /* selfdb:table_stats.fetch_table_stats */
+"""
+
+
+async def fetch_table_stats(db: psycopg.AsyncConnection, name: str | None = None) -> List[TableStats]:
+    """
+    Statistics for one table of the public schema, or for all of them.
+
+    Counters are cumulative since the last statistics reset; sizes are current.
+
+    Args:
+        db: The database connection
+        name: Table name, or None for every table
+
+    Returns:
+        Tables by total size, largest first
+    """
+    result = await db.execute(TABLE_STATS_SQL, {"name": name})
+    stats = []
+    for row in await result.fetchall():
+        row["bloat_ratio"] = (
+            row["bloat_bytes"] / row["table_bytes"]
+            if row["bloat_bytes"] is not None and row["table_bytes"] else None
+        )
+        stats.append(TableStats(**row))
+    return stats
@@ -4,3 +4,11 @@
 
 -- Enable pgcrypto for password hashing with crypt() and gen_salt()
 CREATE EXTENSION IF NOT EXISTS pgcrypto;
+
+-- Enable pg_trgm for trigram GIN indexes backing ILIKE table data search
+-- (opt-in per table via PUT /tables/{table_id}/search-index)
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- Enable pg_stat_statements for per-query execution statistics (GET /sql/insights)
+-- Requires shared_preload_libraries=pg_stat_statements (set in docker-compose)
+CREATE EXTENSION IF NOT EXISTS pg_stat_statements;
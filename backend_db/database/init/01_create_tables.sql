@@ -47,10 +47,26 @@ CREATE TABLE IF NOT EXISTS tables (
     metadata JSONB DEFAULT '{}'::jsonb,
     row_count INTEGER DEFAULT 0,
     realtime_enabled BOOLEAN NOT NULL DEFAULT FALSE,
+    table_oid OID,  -- pg_class oid, lets the DDL event triggers follow renames (09_table_registry_sync.sql)
     created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
 );
 
+-- ─────────────────────────────────────────────────────────────────────────────
+-- Table Row Deltas
+-- Append-only log of row count changes, folded into tables.row_count by the
+-- backend (services/row_count_service.py). Writers only INSERT here, so
+-- concurrent inserts into one user table never wait on its registry row.
+-- No foreign key to tables: the FK check would lock the registry row again
+-- (KEY SHARE); deltas of deleted tables are simply discarded by the fold.
+-- ─────────────────────────────────────────────────────────────────────────────
+CREATE TABLE IF NOT EXISTS table_row_deltas (
+    id BIGSERIAL PRIMARY KEY,
+    table_id UUID NOT NULL,
+    delta INTEGER NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+);
+
 -- ─────────────────────────────────────────────────────────────────────────────
 -- SQL Query History Table
 -- Stores executed SQL queries for history tracking
@@ -63,9 +79,43 @@ CREATE TABLE IF NOT EXISTS sql_history (
     row_count INTEGER DEFAULT 0,
     error TEXT,
     user_id UUID NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    job_id UUID,  -- Set when the query ran as an async SQL job (no FK: jobs expire)
+    plan JSONB,  -- EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) document, set by POST /sql/explain
     executed_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
 );
 
+-- ─────────────────────────────────────────────────────────────────────────────
+-- SQL Jobs Table
+-- Long-running admin queries submitted through POST /sql/jobs. backend_pid and
+-- started_at (the job transaction's start) identify the backend running the
+-- job so it can be cancelled. Rows are purged once expires_at has passed.
+-- ─────────────────────────────────────────────────────────────────────────────
+CREATE TABLE IF NOT EXISTS sql_jobs (
+    id UUID PRIMARY KEY,
+    query TEXT NOT NULL,
+    is_read_only BOOLEAN NOT NULL DEFAULT TRUE,
+    status VARCHAR(20) NOT NULL DEFAULT 'queued',  -- queued, running, succeeded, failed, cancelled
+    columns JSONB,
+    row_count INTEGER DEFAULT 0,
+    truncated BOOLEAN NOT NULL DEFAULT FALSE,
+    error TEXT,
+    backend_pid INTEGER,
+    user_id UUID NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    started_at TIMESTAMP WITH TIME ZONE,
+    finished_at TIMESTAMP WITH TIME ZONE,
+    expires_at TIMESTAMP WITH TIME ZONE NOT NULL
+);
+
+-- Result rows of read-only jobs, one row per fetched batch
+CREATE TABLE IF NOT EXISTS sql_job_results (
+    job_id UUID NOT NULL REFERENCES sql_jobs(id) ON DELETE CASCADE,
+    first_row INTEGER NOT NULL,
+    row_count INTEGER NOT NULL,
+    rows JSONB NOT NULL,
+    PRIMARY KEY (job_id, first_row)
+);
+
 -- ─────────────────────────────────────────────────────────────────────────────
 -- SQL Snippets Table
 -- Stores saved SQL code snippets for reuse
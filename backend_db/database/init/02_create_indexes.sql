@@ -32,6 +32,13 @@ CREATE INDEX IF NOT EXISTS idx_sql_history_user_id ON sql_history(user_id);
 -- Index on executed_at for ordering by time
 CREATE INDEX IF NOT EXISTS idx_sql_history_executed_at ON sql_history(executed_at DESC);
 
+-- ─────────────────────────────────────────────────────────────────────────────
+-- SQL Jobs Indexes
+-- ─────────────────────────────────────────────────────────────────────────────
+
+-- Index on expires_at for purging expired jobs and their results
+CREATE INDEX IF NOT EXISTS idx_sql_jobs_expires_at ON sql_jobs(expires_at);
+
 -- ─────────────────────────────────────────────────────────────────────────────
 -- SQL Snippets Indexes
 -- ─────────────────────────────────────────────────────────────────────────────
@@ -68,6 +68,38 @@ BEGIN
 END;
 $$;
 
+-- ─────────────────────────────────────────────────────────────────────────────
+-- tables_registry_notify() - Slim trigger function for tables registry UPDATEs
+-- 
+-- A registry row carries the whole table_schema, metadata and description;
+-- realtime_notify() would send it twice (new and old) and overflow pg_notify's
+-- 8000-byte payload limit on wide tables, aborting the UPDATE. Listeners only
+-- need the id to invalidate, so only id and name are sent:
+-- {
+--   "event": "UPDATE",
+--   "table": "tables",
+--   "new": { "id": ..., "name": ... },
+--   "old": { "id": ..., "name": ... }
+-- }
+-- ─────────────────────────────────────────────────────────────────────────────
+CREATE OR REPLACE FUNCTION tables_registry_notify()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    PERFORM pg_notify(
+        'table:' || TG_TABLE_NAME,
+        jsonb_build_object(
+            'event', TG_OP,
+            'table', TG_TABLE_NAME,
+            'new', jsonb_build_object('id', NEW.id, 'name', NEW.name),
+            'old', jsonb_build_object('id', OLD.id, 'name', OLD.name)
+        )::TEXT
+    );
+    RETURN NEW;
+END;
+$$;
+
 -- ─────────────────────────────────────────────────────────────────────────────
 -- Helper function to enable realtime on a table
 -- Creates the trigger that calls realtime_notify()
@@ -124,5 +156,6 @@ $$;
 -- Grant execute permissions
 -- ─────────────────────────────────────────────────────────────────────────────
 GRANT EXECUTE ON FUNCTION realtime_notify() TO PUBLIC;
+GRANT EXECUTE ON FUNCTION tables_registry_notify() TO PUBLIC;
 GRANT EXECUTE ON FUNCTION enable_realtime_for_table(TEXT) TO PUBLIC;
 GRANT EXECUTE ON FUNCTION disable_realtime_for_table(TEXT) TO PUBLIC;
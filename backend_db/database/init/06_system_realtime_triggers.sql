@@ -17,8 +17,6 @@ CREATE TRIGGER users_realtime_notify
 -- ─────────────────────────────────────────────────────────────────────────────
 -- Trigger for tables table
 -- Broadcasts: INSERT, DELETE events to channel "table:tables"
--- NOTE: UPDATE is excluded to prevent duplicate events when row_count or
--- metadata is updated (each table creation + row insert would fire 2 events)
 -- ─────────────────────────────────────────────────────────────────────────────
 DROP TRIGGER IF EXISTS tables_realtime_notify ON tables;
 CREATE TRIGGER tables_realtime_notify
@@ -26,6 +24,31 @@ CREATE TRIGGER tables_realtime_notify
     FOR EACH ROW
     EXECUTE FUNCTION realtime_notify();
 
+-- ─────────────────────────────────────────────────────────────────────────────
+-- Trigger for tables table (definition changes)
+-- Broadcasts: UPDATE events to channel "table:tables" when the table definition
+-- changes (rename, schema edit, visibility, owner, realtime toggle), so API
+-- workers can invalidate their cached registry rows
+-- NOTE: row_count/updated_at-only updates are filtered out by the WHEN clause
+-- to prevent duplicate events (row count folds touch only those columns)
+-- NOTE: sends only id/name via tables_registry_notify(), since the full rows
+-- of a wide table would exceed the pg_notify payload limit
+-- ─────────────────────────────────────────────────────────────────────────────
+DROP TRIGGER IF EXISTS tables_realtime_notify_update ON tables;
+CREATE TRIGGER tables_realtime_notify_update
+    AFTER UPDATE ON tables
+    FOR EACH ROW
+    WHEN (
+        OLD.name IS DISTINCT FROM NEW.name
+        OR OLD.table_schema IS DISTINCT FROM NEW.table_schema
+        OR OLD.public IS DISTINCT FROM NEW.public
+        OR OLD.owner_id IS DISTINCT FROM NEW.owner_id
+        OR OLD.description IS DISTINCT FROM NEW.description
+        OR OLD.metadata IS DISTINCT FROM NEW.metadata
+        OR OLD.realtime_enabled IS DISTINCT FROM NEW.realtime_enabled
+    )
+    EXECUTE FUNCTION tables_registry_notify();
+
 -- ─────────────────────────────────────────────────────────────────────────────
 -- Trigger for buckets table
 -- Broadcasts: INSERT, UPDATE, DELETE events to channel "table:buckets"
@@ -55,6 +78,7 @@ BEGIN
     RAISE NOTICE 'System realtime triggers created:';
     RAISE NOTICE '  - users_realtime_notify on users table';
     RAISE NOTICE '  - tables_realtime_notify on tables table';
+    RAISE NOTICE '  - tables_realtime_notify_update on tables table';
     RAISE NOTICE '  - buckets_realtime_notify on buckets table';
     RAISE NOTICE '  - files_realtime_notify on files table';
 END $$;
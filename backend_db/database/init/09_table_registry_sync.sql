@@ -0,0 +1,236 @@
+-- ═══════════════════════════════════════════════════════════════════════════════
+-- Tables Registry Sync (DDL Event Triggers)
+-- Keeps the tables registry in step with pg_catalog for DDL issued through any
+-- path: the SQL editor, SQL jobs, functions, psql. CREATE TABLE [AS], SELECT
+-- INTO, ALTER TABLE (columns, renames) and DROP TABLE are reflected in the same
+-- transaction as the DDL itself, so the registry never sees uncommitted tables.
+--
+-- Endpoints that maintain the registry themselves (POST/PATCH/DELETE /tables)
+-- opt out per transaction with:
+--     SELECT set_config('selfdb.registry_sync', 'off', TRUE)
+-- ═══════════════════════════════════════════════════════════════════════════════
+
+-- ─────────────────────────────────────────────────────────────────────────────
+-- Helper: system tables in the public schema that are never registered
+-- ─────────────────────────────────────────────────────────────────────────────
+CREATE OR REPLACE FUNCTION registry_is_system_table(table_name TEXT)
+RETURNS BOOLEAN
+LANGUAGE sql
+IMMUTABLE
+AS $$
+    SELECT table_name = ANY (ARRAY[
+        'system_config', 'users', 'tables', 'table_row_deltas',
+        'sql_history', 'sql_snippets', 'sql_jobs', 'sql_job_results',
+        'buckets', 'files', 'functions', 'function_executions', 'function_logs',
+        'webhooks', 'webhook_deliveries', 'refresh_tokens', 'schema_ddl_version'
+    ])
+$$;
+
+-- ─────────────────────────────────────────────────────────────────────────────
+-- Helper: registry column type for a PostgreSQL type
+-- Same names the /tables API uses (TEXT, INTEGER, BIGINT, DECIMAL, FLOAT,
+-- BOOLEAN, DATE, TIMESTAMP, JSON, JSONB, UUID); other types keep their SQL name
+-- ─────────────────────────────────────────────────────────────────────────────
+CREATE OR REPLACE FUNCTION registry_column_type(type_oid OID)
+RETURNS TEXT
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT CASE t.typname
+        WHEN 'text' THEN 'TEXT'
+        WHEN 'varchar' THEN 'TEXT'
+        WHEN 'bpchar' THEN 'TEXT'
+        WHEN 'bytea' THEN 'TEXT'
+        WHEN 'int2' THEN 'INTEGER'
+        WHEN 'int4' THEN 'INTEGER'
+        WHEN 'int8' THEN 'BIGINT'
+        WHEN 'numeric' THEN 'DECIMAL'
+        WHEN 'float4' THEN 'FLOAT'
+        WHEN 'float8' THEN 'FLOAT'
+        WHEN 'bool' THEN 'BOOLEAN'
+        WHEN 'date' THEN 'DATE'
+        WHEN 'time' THEN 'TIMESTAMP'
+        WHEN 'timestamp' THEN 'TIMESTAMP'
+        WHEN 'timestamptz' THEN 'TIMESTAMP'
+        WHEN 'json' THEN 'JSON'
+        WHEN 'jsonb' THEN 'JSONB'
+        WHEN 'uuid' THEN 'UUID'
+        ELSE upper(format_type(t.oid, NULL))
+    END
+    FROM pg_type t
+    WHERE t.oid = type_oid
+$$;
+
+-- ─────────────────────────────────────────────────────────────────────────────
+-- Helper: table_schema JSON of a table, read from pg_attribute
+-- Format: {column: {type, nullable[, default]}}
+-- ─────────────────────────────────────────────────────────────────────────────
+CREATE OR REPLACE FUNCTION registry_table_schema(rel OID)
+RETURNS JSONB
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT COALESCE(
+        jsonb_object_agg(
+            a.attname,
+            jsonb_build_object(
+                'type', registry_column_type(a.atttypid),
+                'nullable', NOT a.attnotnull
+            ) || CASE
+                WHEN d.adbin IS NULL THEN '{}'::jsonb
+                ELSE jsonb_build_object('default', pg_get_expr(d.adbin, d.adrelid))
+            END
+        ),
+        '{}'::jsonb
+    )
+    FROM pg_attribute a
+    LEFT JOIN pg_attrdef d ON d.adrelid = a.attrelid AND d.adnum = a.attnum
+    WHERE a.attrelid = rel
+      AND a.attnum > 0
+      AND NOT a.attisdropped
+$$;
+
+-- ─────────────────────────────────────────────────────────────────────────────
+-- sync_table_registry(rels) - bring the registry rows of the given tables in
+-- line with pg_catalog:
+--   1. renames: a row whose table_oid is one of rels but whose name is stale
+--   2. schema: rows matched by name get table_schema (and table_oid) refreshed
+--   3. new tables: inserted, owned by auth.uid() when set (the SQL editor sets
+--      it), otherwise by the first admin
+-- ─────────────────────────────────────────────────────────────────────────────
+CREATE OR REPLACE FUNCTION sync_table_registry(rels OID[])
+RETURNS VOID
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    new_owner UUID;
+    rel RECORD;
+    rows_in_table BIGINT;
+BEGIN
+    UPDATE tables t
+    SET name = c.relname, updated_at = now()
+    FROM pg_class c
+    WHERE c.oid = ANY (rels)
+      AND t.table_oid = c.oid
+      AND t.name <> c.relname
+      AND NOT EXISTS (SELECT 1 FROM tables other WHERE other.name = c.relname);
+
+    UPDATE tables t
+    SET table_schema = s.table_schema, table_oid = s.oid, updated_at = now()
+    FROM (
+        SELECT c.oid, c.relname, registry_table_schema(c.oid) AS table_schema
+        FROM pg_class c
+        WHERE c.oid = ANY (rels)
+    ) s
+    WHERE t.name = s.relname
+      AND (t.table_schema IS DISTINCT FROM s.table_schema OR t.table_oid IS DISTINCT FROM s.oid);
+
+    SELECT COALESCE(
+        (SELECT id FROM users WHERE id = auth.uid()),
+        (SELECT id FROM users WHERE role = 'ADMIN' ORDER BY created_at LIMIT 1)
+    ) INTO new_owner;
+    IF new_owner IS NULL THEN
+        RETURN;
+    END IF;
+
+    FOR rel IN
+        SELECT c.oid, c.relname
+        FROM pg_class c
+        WHERE c.oid = ANY (rels)
+          AND NOT EXISTS (SELECT 1 FROM tables t WHERE t.name = c.relname)
+    LOOP
+        -- CREATE TABLE AS / SELECT INTO tables start out populated
+        EXECUTE format('SELECT COUNT(*) FROM %s', rel.oid::regclass) INTO rows_in_table;
+
+        INSERT INTO tables (id, name, table_schema, public, owner_id, description, metadata, row_count, table_oid, created_at, updated_at)
+        VALUES (
+            gen_random_uuid(), rel.relname, registry_table_schema(rel.oid), FALSE, new_owner,
+            'Table created via SQL', '{}'::jsonb, rows_in_table, rel.oid, now(), now()
+        )
+        ON CONFLICT (name) DO NOTHING;
+    END LOOP;
+END;
+$$;
+
+-- ─────────────────────────────────────────────────────────────────────────────
+-- Event trigger: ddl_command_end
+-- Collects the user tables touched by the command (CREATE TABLE [AS],
+-- SELECT INTO, ALTER TABLE incl. RENAME and column changes) and syncs them.
+-- Indexes, triggers, views etc. are other pg_class kinds or catalogs and
+-- are skipped.
+-- ─────────────────────────────────────────────────────────────────────────────
+CREATE OR REPLACE FUNCTION registry_ddl_command_end()
+RETURNS event_trigger
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    rels OID[];
+BEGIN
+    IF current_setting('selfdb.registry_sync', TRUE) = 'off' THEN
+        RETURN;
+    END IF;
+
+    SELECT array_agg(DISTINCT c.oid) INTO rels
+    FROM pg_event_trigger_ddl_commands() cmd
+    JOIN pg_class c ON c.oid = cmd.objid
+    WHERE cmd.classid = 'pg_class'::regclass
+      AND NOT cmd.in_extension
+      AND c.relkind IN ('r', 'p')
+      AND c.relpersistence <> 't'
+      AND c.relnamespace = 'public'::regnamespace
+      AND length(c.relname) <= 63
+      AND NOT registry_is_system_table(c.relname);
+
+    IF rels IS NOT NULL THEN
+        PERFORM sync_table_registry(rels);
+    END IF;
+END;
+$$;
+
+-- ─────────────────────────────────────────────────────────────────────────────
+-- Event trigger: sql_drop
+-- Removes the registry rows of dropped tables. Dropped columns arrive as
+-- 'table column' and are left to ddl_command_end, which resyncs the table's
+-- schema. DROP SCHEMA public CASCADE (backup restore) drops the registry
+-- itself and is deliberately not handled.
+-- ─────────────────────────────────────────────────────────────────────────────
+CREATE OR REPLACE FUNCTION registry_sql_drop()
+RETURNS event_trigger
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    IF current_setting('selfdb.registry_sync', TRUE) = 'off' THEN
+        RETURN;
+    END IF;
+
+    DELETE FROM tables t
+    USING pg_event_trigger_dropped_objects() d
+    WHERE d.object_type = 'table'
+      AND d.schema_name = 'public'
+      AND NOT d.is_temporary
+      AND t.name = d.object_name
+      AND NOT registry_is_system_table(d.object_name);
+END;
+$$;
+
+DROP EVENT TRIGGER IF EXISTS registry_sync_ddl_command_end;
+CREATE EVENT TRIGGER registry_sync_ddl_command_end
+    ON ddl_command_end
+    WHEN TAG IN ('CREATE TABLE', 'CREATE TABLE AS', 'SELECT INTO', 'ALTER TABLE')
+    EXECUTE FUNCTION registry_ddl_command_end();
+
+DROP EVENT TRIGGER IF EXISTS registry_sync_sql_drop;
+CREATE EVENT TRIGGER registry_sync_sql_drop
+    ON sql_drop
+    WHEN TAG IN ('DROP TABLE')
+    EXECUTE FUNCTION registry_sql_drop();
+
+-- ─────────────────────────────────────────────────────────────────────────────
+-- Verification
+-- ─────────────────────────────────────────────────────────────────────────────
+DO $$
+BEGIN
+    RAISE NOTICE 'Tables registry sync event triggers created:';
+    RAISE NOTICE '  - registry_sync_ddl_command_end (CREATE TABLE [AS], SELECT INTO, ALTER TABLE)';
+    RAISE NOTICE '  - registry_sync_sql_drop (DROP TABLE)';
+END $$;
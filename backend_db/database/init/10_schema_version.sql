@@ -0,0 +1,89 @@
+-- ═══════════════════════════════════════════════════════════════════════════════
+-- Schema Version (DDL Counter)
+-- A single-row counter bumped by event triggers whenever DDL changes an object
+-- in the public schema. Readers that cache catalog-derived data (the schema
+-- visualization) compare it against the version they cached under.
+--
+-- The counter is a table row, not a sequence, so the bump commits or rolls back
+-- with the DDL: a reader never sees the new version before the new catalog.
+-- ═══════════════════════════════════════════════════════════════════════════════
+
+CREATE TABLE IF NOT EXISTS schema_ddl_version (
+    id INTEGER PRIMARY KEY DEFAULT 1,
+    version BIGINT NOT NULL DEFAULT 1,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    CONSTRAINT single_row CHECK (id = 1)
+);
+
+INSERT INTO schema_ddl_version (id, version)
+VALUES (1, 1)
+ON CONFLICT (id) DO NOTHING;
+
+-- ─────────────────────────────────────────────────────────────────────────────
+-- bump_schema_ddl_version() - shared by both event triggers
+-- ─────────────────────────────────────────────────────────────────────────────
+CREATE OR REPLACE FUNCTION bump_schema_ddl_version()
+RETURNS VOID
+LANGUAGE sql
+AS $$
+    UPDATE schema_ddl_version
+    SET version = version + 1, updated_at = now()
+    WHERE id = 1
+$$;
+
+-- ─────────────────────────────────────────────────────────────────────────────
+-- Event trigger: ddl_command_end
+-- CREATE / ALTER / COMMENT / GRANT on anything in public. Temporary objects
+-- live in pg_temp_* and do not count.
+-- ─────────────────────────────────────────────────────────────────────────────
+CREATE OR REPLACE FUNCTION schema_version_ddl_command_end()
+RETURNS event_trigger
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    IF EXISTS (
+        SELECT 1 FROM pg_event_trigger_ddl_commands()
+        WHERE schema_name = 'public' AND NOT in_extension
+    ) THEN
+        PERFORM bump_schema_ddl_version();
+    END IF;
+END;
+$$;
+
+-- ─────────────────────────────────────────────────────────────────────────────
+-- Event trigger: sql_drop
+-- DROP commands are not reported by pg_event_trigger_ddl_commands()
+-- ─────────────────────────────────────────────────────────────────────────────
+CREATE OR REPLACE FUNCTION schema_version_sql_drop()
+RETURNS event_trigger
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    IF EXISTS (
+        SELECT 1 FROM pg_event_trigger_dropped_objects()
+        WHERE schema_name = 'public' AND NOT is_temporary
+    ) THEN
+        PERFORM bump_schema_ddl_version();
+    END IF;
+END;
+$$;
+
+DROP EVENT TRIGGER IF EXISTS schema_version_ddl_command_end;
+CREATE EVENT TRIGGER schema_version_ddl_command_end
+    ON ddl_command_end
+    EXECUTE FUNCTION schema_version_ddl_command_end();
+
+DROP EVENT TRIGGER IF EXISTS schema_version_sql_drop;
+CREATE EVENT TRIGGER schema_version_sql_drop
+    ON sql_drop
+    EXECUTE FUNCTION schema_version_sql_drop();
+
+-- ─────────────────────────────────────────────────────────────────────────────
+-- Verification
+-- ─────────────────────────────────────────────────────────────────────────────
+DO $$
+BEGIN
+    RAISE NOTICE 'Schema version counter created:';
+    RAISE NOTICE '  - schema_ddl_version (single row, bumped on DDL in public)';
+    RAISE NOTICE '  - schema_version_ddl_command_end, schema_version_sql_drop event triggers';
+END $$;
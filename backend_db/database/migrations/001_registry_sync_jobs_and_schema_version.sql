@@ -0,0 +1,102 @@
+-- ═══════════════════════════════════════════════════════════════════════════════
+-- Migration 001: Registry sync, row deltas, SQL jobs, query plans, schema version
+-- Brings a database created before these features up to the schema in init/.
+-- init/ only runs on an empty volume; this migration is idempotent and also
+-- runs (as a no-op) after init/ on a fresh one.
+--
+-- Apply to an existing volume (or after restoring an older backup):
+--     docker-compose exec -T db psql -v ON_ERROR_STOP=1 \
+--         -U "$POSTGRES_USER" -d "$POSTGRES_DB" \
+--         -f /docker-entrypoint-initdb.d/migrations/001_registry_sync_jobs_and_schema_version.sql
+--
+-- Functions and triggers are (re)created by including the idempotent init
+-- scripts that define them (\ir resolves paths relative to this file).
+-- ═══════════════════════════════════════════════════════════════════════════════
+
+-- ─────────────────────────────────────────────────────────────────────────────
+-- Extensions (trigram search indexes, GET /sql/insights)
+-- ─────────────────────────────────────────────────────────────────────────────
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+CREATE EXTENSION IF NOT EXISTS pg_stat_statements;
+
+-- ─────────────────────────────────────────────────────────────────────────────
+-- Tables registry: pg_class oid, backfilled for tables registered by name
+-- ─────────────────────────────────────────────────────────────────────────────
+ALTER TABLE tables ADD COLUMN IF NOT EXISTS table_oid OID;
+
+UPDATE tables t
+SET table_oid = c.oid
+FROM pg_class c
+WHERE t.table_oid IS NULL
+  AND c.relname = t.name
+  AND c.relnamespace = 'public'::regnamespace
+  AND c.relkind IN ('r', 'p');
+
+-- ─────────────────────────────────────────────────────────────────────────────
+-- Table Row Deltas (folded into tables.row_count by the backend)
+-- ─────────────────────────────────────────────────────────────────────────────
+CREATE TABLE IF NOT EXISTS table_row_deltas (
+    id BIGSERIAL PRIMARY KEY,
+    table_id UUID NOT NULL,
+    delta INTEGER NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+);
+
+-- ─────────────────────────────────────────────────────────────────────────────
+-- SQL History: async job id and EXPLAIN plan
+-- ─────────────────────────────────────────────────────────────────────────────
+ALTER TABLE sql_history ADD COLUMN IF NOT EXISTS job_id UUID;
+ALTER TABLE sql_history ADD COLUMN IF NOT EXISTS plan JSONB;
+
+-- ─────────────────────────────────────────────────────────────────────────────
+-- SQL Jobs and their results
+-- ─────────────────────────────────────────────────────────────────────────────
+CREATE TABLE IF NOT EXISTS sql_jobs (
+    id UUID PRIMARY KEY,
+    query TEXT NOT NULL,
+    is_read_only BOOLEAN NOT NULL DEFAULT TRUE,
+    status VARCHAR(20) NOT NULL DEFAULT 'queued',  -- queued, running, succeeded, failed, cancelled
+    columns JSONB,
+    row_count INTEGER DEFAULT 0,
+    truncated BOOLEAN NOT NULL DEFAULT FALSE,
+    error TEXT,
+    backend_pid INTEGER,
+    user_id UUID NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    started_at TIMESTAMP WITH TIME ZONE,
+    finished_at TIMESTAMP WITH TIME ZONE,
+    expires_at TIMESTAMP WITH TIME ZONE NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS sql_job_results (
+    job_id UUID NOT NULL REFERENCES sql_jobs(id) ON DELETE CASCADE,
+    first_row INTEGER NOT NULL,
+    row_count INTEGER NOT NULL,
+    rows JSONB NOT NULL,
+    PRIMARY KEY (job_id, first_row)
+);
+
+CREATE INDEX IF NOT EXISTS idx_sql_jobs_expires_at ON sql_jobs(expires_at);
+
+-- ─────────────────────────────────────────────────────────────────────────────
+-- Functions, triggers and event triggers
+--   05_realtime_function.sql       tables_registry_notify()
+--   06_system_realtime_triggers.sql tables_realtime_notify_update
+--   09_table_registry_sync.sql     registry_sync_* event triggers
+--   10_schema_version.sql          schema_ddl_version + schema_version_* event triggers
+-- ─────────────────────────────────────────────────────────────────────────────
+\ir ../init/05_realtime_function.sql
+\ir ../init/06_system_realtime_triggers.sql
+\ir ../init/09_table_registry_sync.sql
+\ir ../init/10_schema_version.sql
+
+-- ─────────────────────────────────────────────────────────────────────────────
+-- Verification
+-- ─────────────────────────────────────────────────────────────────────────────
+DO $$
+BEGIN
+    RAISE NOTICE 'Migration 001 applied:';
+    RAISE NOTICE '  - tables.table_oid, sql_history.job_id, sql_history.plan';
+    RAISE NOTICE '  - table_row_deltas, sql_jobs, sql_job_results, schema_ddl_version';
+    RAISE NOTICE '  - registry sync and schema version event triggers';
+END $$;
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Upload Hashing & Dedup Benchmark
+
+Replays the storage service's upload write loop (256 KB chunks written to a
+temp file with aiofiles, then an atomic rename) on files of increasing size,
+and times four variants:
+
+    - plain       write + rename (the upload path before checksums)
+    - sha256      write + incremental hashlib.sha256 + rename - the cost of
+                  checksum_sha256 on every upload
+    - dedup-new   sha256 + blob_store.store_and_link for content not stored yet
+    - dedup-dup   the same for content already in the store: the temp file is
+                  dropped and the path becomes a hard link
+
+and reports throughput, overhead against plain, and the disk used by
+--copies uploads of the same file under each layout. Runs against a
+temporary STORAGE_PATH; no storage service or database is needed.
+
+Usage:
+    cd storage
+    uv run python benchmarks/upload_hashing_benchmark.py
+    uv run python benchmarks/upload_hashing_benchmark.py --sizes-mb 8 64 256 --repeat 5
+"""
+
+import argparse
+import asyncio
+import hashlib
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# The store location is read at import time
+STORAGE_DIR = tempfile.mkdtemp(prefix="selfdb-upload-bench-")
+os.environ["STORAGE_PATH"] = STORAGE_DIR
+
+# Make storage modules importable when run from any directory
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import aiofiles  # noqa: E402
+import aiofiles.os  # noqa: E402
+import aiofiles.tempfile  # noqa: E402
+
+from blob_store import BLOBS_PATH, store_and_link  # noqa: E402
+from endpoints.files import CHUNK_SIZE  # noqa: E402
+
+BUCKET_PATH = Path(STORAGE_DIR) / "bench-bucket"
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Upload Variants
+# ─────────────────────────────────────────────────────────────────────────────
+
+async def write_upload(data: bytes, file_path: Path, hashed: bool) -> tuple[Path, str | None]:
+    """The upload loop: chunks into a temp file next to the target."""
+    digest = hashlib.sha256() if hashed else None
+    async with aiofiles.tempfile.NamedTemporaryFile(dir=str(file_path.parent), delete=False, suffix=".tmp") as tmp:
+        view = memoryview(data)
+        for start in range(0, len(data), CHUNK_SIZE):
+            chunk = view[start:start + CHUNK_SIZE]
+            await tmp.write(chunk)
+            if digest is not None:
+                digest.update(chunk)
+    return Path(tmp.name), digest.hexdigest() if digest is not None else None
+
+
+async def upload_plain(data: bytes, file_path: Path) -> None:
+    tmp_path, _ = await write_upload(data, file_path, hashed=False)
+    await aiofiles.os.replace(tmp_path, file_path)
+
+
+async def upload_sha256(data: bytes, file_path: Path) -> None:
+    tmp_path, _ = await write_upload(data, file_path, hashed=True)
+    await aiofiles.os.replace(tmp_path, file_path)
+
+
+async def upload_dedup(data: bytes, file_path: Path) -> None:
+    tmp_path, digest = await write_upload(data, file_path, hashed=True)
+    await store_and_link(tmp_path, file_path, digest)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Runner
+# ─────────────────────────────────────────────────────────────────────────────
+
+def reset_storage() -> None:
+    shutil.rmtree(BUCKET_PATH, ignore_errors=True)
+    shutil.rmtree(BLOBS_PATH, ignore_errors=True)
+    BUCKET_PATH.mkdir(parents=True)
+
+
+def disk_usage(path: Path) -> int:
+    """Bytes allocated under path, each inode counted once (hard links share one)."""
+    seen, total = set(), 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            st = os.lstat(os.path.join(root, name))
+            if st.st_ino not in seen:
+                seen.add(st.st_ino)
+                total += st.st_size
+    return total
+
+
+async def best_of(repeat: int, run) -> float:
+    best = float("inf")
+    for i in range(repeat):
+        best = min(best, await run(i))
+    return best
+
+
+async def run(args: argparse.Namespace) -> None:
+    print(f"  {'size':>8}  {'variant':>10}  {'MB/s':>8}  {'vs plain':>9}")
+
+    for size_mb in sorted(args.sizes_mb):
+        data = os.urandom(int(size_mb * 1024 * 1024))
+        mb = len(data) / (1024 * 1024)
+        results = {}
+
+        async def timed(upload, name: str, prepare=None):
+            async def once(i: int) -> float:
+                reset_storage()
+                if prepare is not None:
+                    await prepare()
+                start = time.perf_counter()
+                await upload(data, BUCKET_PATH / f"{name}-{i}.bin")
+                return time.perf_counter() - start
+            return await best_of(args.repeat, once)
+
+        async def store_once():
+            await upload_dedup(data, BUCKET_PATH / "original.bin")
+
+        results["plain"] = await timed(upload_plain, "plain")
+        results["sha256"] = await timed(upload_sha256, "sha256")
+        results["dedup-new"] = await timed(upload_dedup, "new")
+        results["dedup-dup"] = await timed(upload_dedup, "dup", prepare=store_once)
+
+        for name, seconds in results.items():
+            overhead = (seconds / results["plain"] - 1) * 100
+            print(f"  {size_mb:6g}MB  {name:>10}  {mb / seconds:8.0f}  {overhead:+8.1f}%")
+
+    # Disk used by the same file uploaded --copies times
+    data = os.urandom(int(args.sizes_mb[0] * 1024 * 1024))
+    usage = {}
+    for name, upload in (("plain", upload_plain), ("dedup", upload_dedup)):
+        reset_storage()
+        for i in range(args.copies):
+            await upload(data, BUCKET_PATH / f"copy-{i}.bin")
+        usage[name] = disk_usage(Path(STORAGE_DIR))
+    saved = usage["plain"] - usage["dedup"]
+    print(
+        f"\n  {args.copies} uploads of one {args.sizes_mb[0]:g} MB file: "
+        f"plain {usage['plain'] / 1024 / 1024:.1f} MB, dedup {usage['dedup'] / 1024 / 1024:.1f} MB "
+        f"({saved / 1024 / 1024:.1f} MB saved)"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes-mb", type=float, nargs="+", default=[1, 16, 128], help="Upload sizes in MB (default: 1 16 128)")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per size and variant, best is reported (default: 3)")
+    parser.add_argument("--copies", type=int, default=10, help="Identical uploads for the disk usage comparison (default: 10)")
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("  UPLOAD HASHING & DEDUP BENCHMARK")
+    print("=" * 70)
+    try:
+        asyncio.run(run(args))
+    finally:
+        shutil.rmtree(STORAGE_DIR, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+# blob_store.py
+"""
+Optional content-addressed blob layout (STORAGE_DEDUP=true).
+
+Every uploaded blob is stored once under BASE_PATH/.blobs/ab/cd/<sha256>, and
+a bucket path is a hard link to it. The reference count is the inode's link
+count, kept by the filesystem: uploading identical content adds a link,
+deleting a file or a bucket (rmtree) drops one, and nothing else needs to be
+updated - across workers and crashes alike. Downloads, ranges and sendfile see
+ordinary files.
+
+A blob whose only remaining link is the store's own is an orphan; the garbage
+collector (run every STORAGE_DEDUP_GC_INTERVAL seconds, and on demand via
+POST /blobs/gc) removes it.
+
+Files written with dedup off stay plain files and keep working; they are not
+deduplicated retroactively.
+"""
+
+import asyncio
+import os
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+
+import aiofiles.os
+
+BASE_PATH = Path(os.getenv("STORAGE_PATH", "./data"))
+# Not a valid bucket name, so it can never collide with one
+BLOBS_PATH = BASE_PATH / ".blobs"
+
+DEDUP_ENABLED = os.getenv("STORAGE_DEDUP", "false").lower() in ("1", "true", "yes")
+GC_INTERVAL = float(os.getenv("STORAGE_DEDUP_GC_INTERVAL", "3600"))
+# Orphans younger than this are left alone: an upload may be linking them
+GC_GRACE_SECONDS = 60
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Store & Link
+# ─────────────────────────────────────────────────────────────────────────────
+
+def blob_path(digest: str) -> Path:
+    """Location of a blob in the store, fanned out over two directory levels."""
+    return BLOBS_PATH / digest[:2] / digest[2:4] / digest
+
+
+async def store_and_link(tmp_path: Path, file_path: Path, digest: str) -> bool:
+    """
+    Move a fully written temp file into the store and point file_path at it.
+
+    The temp file becomes the blob if the content is new; otherwise it is
+    discarded and file_path is linked to the existing blob, whose mtime is
+    set to now. file_path is replaced atomically, like the plain upload path.
+
+    Returns:
+        True if the content was already stored (deduplicated)
+    """
+    blob = blob_path(digest)
+    await aiofiles.os.makedirs(blob.parent, exist_ok=True)
+    link_tmp = file_path.parent / f".{uuid.uuid4().hex}.lnk"
+    deduplicated = False
+    try:
+        while True:
+            try:
+                await aiofiles.os.link(tmp_path, blob)
+            except FileExistsError:
+                deduplicated = True
+            try:
+                await aiofiles.os.link(blob, link_tmp)
+                break
+            except FileNotFoundError:
+                # The GC removed an orphan blob between the two links - store ours
+                deduplicated = False
+        if deduplicated:
+            # Links share the blob's mtime; date it to this upload so file_path's
+            # Last-Modified never goes backwards (other paths just revalidate)
+            await asyncio.to_thread(os.utime, blob)
+        await aiofiles.os.replace(link_tmp, file_path)
+    finally:
+        for leftover in (link_tmp, tmp_path):
+            try:
+                await aiofiles.os.unlink(leftover)
+            except FileNotFoundError:
+                pass
+    return deduplicated
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Report & Garbage Collection
+# ─────────────────────────────────────────────────────────────────────────────
+
+@dataclass
+class StoreScan:
+    blobs: int = 0
+    references: int = 0
+    stored_bytes: int = 0
+    logical_bytes: int = 0
+    orphans: int = 0
+    orphan_bytes: int = 0
+    removed: int = 0
+    removed_bytes: int = 0
+
+    @property
+    def saved_bytes(self) -> int:
+        """Bytes that referenced blobs would take again without deduplication."""
+        return self.logical_bytes - (self.stored_bytes - self.orphan_bytes)
+
+
+def scan_store(collect: bool = False) -> StoreScan:
+    """
+    Walk the store once. With collect=True, orphans older than
+    GC_GRACE_SECONDS are deleted as they are found.
+
+    Blocking - run in a thread.
+    """
+    scan = StoreScan()
+    if not BLOBS_PATH.exists():
+        return scan
+    cutoff = time.time() - GC_GRACE_SECONDS
+
+    for level1 in os.scandir(BLOBS_PATH):
+        if not level1.is_dir(follow_symlinks=False):
+            continue
+        for level2 in os.scandir(level1.path):
+            if not level2.is_dir(follow_symlinks=False):
+                continue
+            for entry in os.scandir(level2.path):
+                try:
+                    st = entry.stat(follow_symlinks=False)
+                except FileNotFoundError:
+                    continue
+                references = st.st_nlink - 1
+                scan.blobs += 1
+                scan.stored_bytes += st.st_size
+                if references > 0:
+                    scan.references += references
+                    scan.logical_bytes += st.st_size * references
+                    continue
+
+                scan.orphans += 1
+                scan.orphan_bytes += st.st_size
+                # ctime moves with every link change, so it dates the last unlink
+                if collect and st.st_ctime < cutoff:
+                    try:
+                        os.unlink(entry.path)
+                        scan.removed += 1
+                        scan.removed_bytes += st.st_size
+                    except FileNotFoundError:
+                        pass
+    return scan
+
+
+async def collect_garbage() -> StoreScan:
+    """Remove orphan blobs; returns the scan with what was reclaimed."""
+    return await asyncio.to_thread(scan_store, True)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Background GC
+# ─────────────────────────────────────────────────────────────────────────────
+
+_gc_task: asyncio.Task | None = None
+
+
+async def _gc_forever() -> None:
+    while True:
+        await asyncio.sleep(GC_INTERVAL)
+        try:
+            scan = await collect_garbage()
+            if scan.removed:
+                print(f"[{datetime.now()}] Blob GC removed {scan.removed} orphan(s), {scan.removed_bytes} bytes")
+        except Exception as e:
+            print(f"[{datetime.now()}] Blob GC failed: {e}")
+
+
+async def start_blob_gc() -> None:
+    """Start the periodic orphan collector (dedup layout only)."""
+    global _gc_task
+    if DEDUP_ENABLED and GC_INTERVAL > 0 and _gc_task is None:
+        _gc_task = asyncio.create_task(_gc_forever())
+
+
+async def stop_blob_gc() -> None:
+    global _gc_task
+    if _gc_task is not None:
+        _gc_task.cancel()
+        try:
+            await _gc_task
+        except asyncio.CancelledError:
+            pass
+        _gc_task = None
@@ -1,12 +1,12 @@
 # db.py - Database connection for Storage Service
 # Connects to PgBouncer for file/bucket metadata operations
 
-from typing import AsyncGenerator
+from typing import Any, AsyncGenerator
 from contextlib import asynccontextmanager
 import os
 import psycopg
 from psycopg.rows import dict_row
-from psycopg_pool import AsyncNullConnectionPool
+from psycopg_pool import AsyncConnectionPool, AsyncNullConnectionPool
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -15,8 +15,22 @@ from psycopg_pool import AsyncNullConnectionPool
 
 DATABASE_URL = os.getenv("DATABASE_URL")
 
-# Global pool - NullConnectionPool delegates pooling to PgBouncer
-pool: AsyncNullConnectionPool | None = None
+# "null" opens a PgBouncer connection per request, "pool" keeps them open
+DB_POOL_MODES = ("null", "pool")
+DB_POOL_MODE = os.getenv("DB_POOL_MODE", "null")
+if DB_POOL_MODE not in DB_POOL_MODES:
+    # Fail at startup like the backend's settings validation, rather than silently using "null"
+    raise ValueError(f"DB_POOL_MODE must be one of {', '.join(DB_POOL_MODES)}, got {DB_POOL_MODE!r}")
+DB_POOL_MIN_SIZE = int(os.getenv("DB_POOL_MIN_SIZE", "2"))
+DB_POOL_MAX_SIZE = int(os.getenv("DB_POOL_MAX_SIZE", "50"))  # Lower than backend since storage is internal only
+DB_POOL_MAX_IDLE = float(os.getenv("DB_POOL_MAX_IDLE", "300"))
+DB_POOL_MAX_LIFETIME = float(os.getenv("DB_POOL_MAX_LIFETIME", "1800"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_CHECK = os.getenv("DB_POOL_CHECK", "true").lower() in ("1", "true", "yes")
+
+# Global pool - NullConnectionPool delegates pooling to PgBouncer,
+# ConnectionPool keeps persistent connections to PgBouncer
+pool: AsyncConnectionPool | AsyncNullConnectionPool | None = None
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -31,15 +45,32 @@ async def init_db() -> None:
         # Running without database (standalone mode for testing)
         return
     
-    pool = AsyncNullConnectionPool(
-        conninfo=DATABASE_URL,
-        open=False,
-        max_size=50,  # Lower than backend since storage is internal only
-        kwargs={
-            "row_factory": dict_row,
-            "autocommit": False,
-        }
-    )
+    connection_kwargs = {
+        "row_factory": dict_row,
+        "autocommit": False,
+        "prepare_threshold": None,  # PgBouncer transaction mode can't keep prepared statements
+    }
+    
+    if DB_POOL_MODE == "pool":
+        pool = AsyncConnectionPool(
+            conninfo=DATABASE_URL,
+            open=False,
+            min_size=DB_POOL_MIN_SIZE,
+            max_size=DB_POOL_MAX_SIZE,
+            max_idle=DB_POOL_MAX_IDLE,
+            max_lifetime=DB_POOL_MAX_LIFETIME,
+            timeout=DB_POOL_TIMEOUT,
+            check=AsyncConnectionPool.check_connection if DB_POOL_CHECK else None,
+            kwargs=connection_kwargs,
+        )
+    else:
+        pool = AsyncNullConnectionPool(
+            conninfo=DATABASE_URL,
+            open=False,
+            max_size=DB_POOL_MAX_SIZE,
+            timeout=DB_POOL_TIMEOUT,
+            kwargs=connection_kwargs,
+        )
     await pool.open()
     
     # Verify connection
@@ -68,3 +99,18 @@ async def get_db() -> AsyncGenerator[psycopg.AsyncConnection, None]:
 def is_db_configured() -> bool:
     """Check if database is configured."""
     return DATABASE_URL is not None and pool is not None
+
+
+def get_pool_stats() -> dict[str, Any] | None:
+    """Pool gauges for this worker, or None when running without a database."""
+    if pool is None:
+        return None
+    
+    stats = pool.get_stats()
+    requests_num = stats.get("requests_num", 0)
+    return {
+        "mode": DB_POOL_MODE,
+        "connections_in_use": max(stats.get("pool_size", 0) - stats.get("pool_available", 0), 0),
+        "requests_waiting": stats.get("requests_waiting", 0),
+        "avg_wait_ms": (stats.get("requests_wait_ms", 0) / requests_num) if requests_num else 0.0,
+    }
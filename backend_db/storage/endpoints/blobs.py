@@ -0,0 +1,51 @@
+# blobs.py
+"""Content-addressed blob store: dedup report and garbage collection (see blob_store)."""
+
+import asyncio
+from fastapi import APIRouter
+
+from blob_store import DEDUP_ENABLED, collect_garbage, scan_store
+from models.blob import BlobStoreReport, BlobGcResponse
+
+router = APIRouter(prefix="/blobs", tags=["blobs"])
+
+# ─────────────────────────────────────────────────────────────────────────────
+# DEDUP REPORT
+# ─────────────────────────────────────────────────────────────────────────────
+
+@router.get(
+    "/report",
+    response_model=BlobStoreReport,
+    summary="Dedup Report"
+)
+async def get_blob_report() -> BlobStoreReport:
+    """Blobs, references and bytes saved by deduplication, from one walk of the store."""
+    scan = await asyncio.to_thread(scan_store)
+    return BlobStoreReport(
+        dedup_enabled=DEDUP_ENABLED,
+        blobs=scan.blobs,
+        references=scan.references,
+        stored_bytes=scan.stored_bytes,
+        logical_bytes=scan.logical_bytes,
+        saved_bytes=scan.saved_bytes,
+        orphans=scan.orphans,
+        orphan_bytes=scan.orphan_bytes
+    )
+
+# ─────────────────────────────────────────────────────────────────────────────
+# GARBAGE COLLECTION
+# ─────────────────────────────────────────────────────────────────────────────
+
+@router.post(
+    "/gc",
+    response_model=BlobGcResponse,
+    summary="Collect Orphan Blobs"
+)
+async def run_blob_gc() -> BlobGcResponse:
+    """Delete blobs that no bucket path references any more."""
+    scan = await collect_garbage()
+    return BlobGcResponse(
+        removed=scan.removed,
+        removed_bytes=scan.removed_bytes,
+        orphans_skipped=scan.orphans - scan.removed
+    )
@@ -103,7 +103,8 @@ async def list_buckets() -> List[BucketResponse]:
             try:
                 # Check is_dir and get stat in try block - directory might be deleted
                 # by another worker between iterdir() and stat()
-                if item.is_dir():
+                # Dot directories (the .blobs store) are not buckets
+                if item.is_dir() and not item.name.startswith("."):
                     stat = item.stat()
                     buckets.append(BucketResponse(
                         name=item.name,
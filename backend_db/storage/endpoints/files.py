@@ -1,18 +1,23 @@
 # files.py
 import os
+import stat
+import hashlib
+import secrets
 import mimetypes
+from email.utils import formatdate, parsedate_to_datetime
 from pathlib import Path
-from typing import Annotated, Optional
+from typing import Annotated, AsyncIterator, Optional
 from datetime import datetime, timezone
 import aiofiles
 import aiofiles.os
 import aiofiles.tempfile
 from fastapi import APIRouter, HTTPException, UploadFile, File, Path as PathParam, Header, Request, status
-from fastapi.responses import FileResponse, StreamingResponse
+from fastapi.responses import FileResponse, Response, StreamingResponse
 from pydantic import BaseModel
 
 from models.file import FileMetadata, FileUploadResponse
 from models.bucket import BUCKET_NAME_PATTERN
+from blob_store import DEDUP_ENABLED, store_and_link
 
 router = APIRouter(prefix="/files", tags=["files"])
 
@@ -22,6 +27,14 @@ BASE_PATH = Path(os.getenv("STORAGE_PATH", "./data"))
 # Chunk size for streaming operations - larger chunks = fewer syscalls = faster I/O
 CHUNK_SIZE = 256 * 1024  # 256KB chunks for optimal throughput
 
+# Download path for whole files:
+# - auto:     FileResponse with the ASGI pathsend extension when the server offers
+#             it (e.g. Granian), so the server sends the file itself - zero-copy
+#             where it can - otherwise the aiofiles stream below
+# - aiofiles: always stream through async_file_iterator
+# Range requests always use async_file_iterator.
+DOWNLOAD_MODE = os.getenv("STORAGE_DOWNLOAD_MODE", "auto")
+
 # Threshold for using memory buffering vs direct disk writes
 # Files smaller than this stay in memory (SpooledTemporaryFile behavior)
 MEMORY_THRESHOLD = 1024 * 1024  # 1MB
@@ -49,6 +62,21 @@ def safe_join(base: Path, *parts: str) -> Path:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid path")
     return result
 
+async def commit_upload(tmp_path: Path, file_path: Path, digest: str) -> bool:
+    """
+    Move a fully written temp file (in file_path's directory) into place.
+    
+    Returns:
+        True if the content was already stored (STORAGE_DEDUP only)
+    """
+    if DEDUP_ENABLED:
+        # Content-addressed layout: the path becomes a hard link to the blob
+        return await store_and_link(tmp_path, file_path, digest)
+    # Atomic rename - safe even with multiple workers (async)
+    # os.replace is atomic on POSIX systems when src and dst are on same filesystem
+    await aiofiles.os.replace(str(tmp_path), str(file_path))
+    return False
+
 # ─────────────────────────────────────────────────────────────────────────────
 # UPLOAD FILE (Streaming - accepts raw bytes or multipart form)
 # ─────────────────────────────────────────────────────────────────────────────
@@ -80,6 +108,9 @@ async def upload_file(
        and optional X-Filename header for original filename
     2. Multipart form: Traditional file upload using multipart/form-data
     
+    The response carries the SHA-256 of the content, computed while writing.
+    With STORAGE_DEDUP on, identical content is stored once (see blob_store).
+    
     Performance optimizations:
     - Async file I/O via aiofiles (non-blocking)
     - Larger chunk sizes (256KB) for fewer syscalls
@@ -96,6 +127,9 @@ async def upload_file(
     
     total_size = 0
     tmp_path = None
+    deduplicated = False
+    # Hashed as the chunks are written - no second pass over the file
+    digest = hashlib.sha256()
     
     # Determine if this is a multipart form upload or raw bytes
     request_content_type = content_type or request.headers.get("content-type", "")
@@ -123,6 +157,7 @@ async def upload_file(
                     )
                 while chunk := await file.read(CHUNK_SIZE):
                     await tmp.write(chunk)
+                    digest.update(chunk)
                     total_size += len(chunk)
                 # Get content type from uploaded file
                 actual_content_type = file.content_type or mimetypes.guess_type(path)[0] or "application/octet-stream"
@@ -130,6 +165,7 @@ async def upload_file(
                 # Handle raw bytes streaming (new streaming API) - fastest path
                 async for chunk in request.stream():
                     await tmp.write(chunk)
+                    digest.update(chunk)
                     total_size += len(chunk)
                 # Get content type from header or guess from path
                 actual_content_type = request_content_type if request_content_type and request_content_type != "application/octet-stream" else mimetypes.guess_type(path)[0] or "application/octet-stream"
@@ -142,9 +178,7 @@ async def upload_file(
                 detail="File cannot be empty"
             )
         
-        # Atomic rename - safe even with multiple workers (async)
-        # os.replace is atomic on POSIX systems when src and dst are on same filesystem
-        await aiofiles.os.replace(str(tmp_path), str(file_path))
+        deduplicated = await commit_upload(tmp_path, file_path, digest.hexdigest())
         
     except HTTPException:
         # Re-raise HTTP exceptions
@@ -162,28 +196,165 @@ async def upload_file(
         )
     
     return FileUploadResponse(
+        deduplicated=deduplicated,
         file=FileMetadata(
             name=file_path.name,
             path=path,
             size=total_size,
             content_type=actual_content_type,
+            checksum_sha256=digest.hexdigest(),
             created_at=datetime.now(timezone.utc)
         )
     )
 
+# ─────────────────────────────────────────────────────────────────────────────
+# RANGE REQUESTS (RFC 9110 §14)
+# ─────────────────────────────────────────────────────────────────────────────
+
+# More ranges than this in one request are ignored and the whole file is sent
+MAX_RANGES = 32
+
+
+def is_ascii_digits(value: str) -> bool:
+    """True for a non-empty run of 0-9 (str.isdigit also accepts e.g. '²', which int() rejects)."""
+    return value.isascii() and value.isdigit()
+
+
+def parse_range_header(range_header: str, file_size: int) -> list[tuple[int, int]] | None:
+    """
+    Parse `Range: bytes=...` into inclusive (start, end) pairs, in request order.
+    
+    Returns None when the header must be ignored and the full file sent: a unit
+    other than bytes, invalid syntax, too many ranges, or ranges that together
+    ask for more than the file (overlap abuse).
+    
+    Raises:
+        HTTPException 416 with `Content-Range: bytes */size` when no range is satisfiable
+    """
+    unit, _, spec = range_header.partition("=")
+    if unit.strip().lower() != "bytes" or not spec.strip():
+        return None
+    
+    ranges = []
+    for part in spec.split(","):
+        first, dash, last = part.strip().partition("-")
+        if not dash or not (is_ascii_digits(first) or is_ascii_digits(last)):
+            return None
+        if not first:
+            # Suffix range: the last N bytes
+            length = int(last)
+            if length > 0 and file_size > 0:
+                ranges.append((max(file_size - length, 0), file_size - 1))
+            continue
+        if not is_ascii_digits(first) or (last and not is_ascii_digits(last)):
+            return None
+        start, end = int(first), int(last) if last else file_size - 1
+        if last and end < start:
+            return None
+        if start < file_size:
+            ranges.append((start, min(end, file_size - 1)))
+    
+    if not ranges:
+        raise HTTPException(
+            status_code=status.HTTP_416_RANGE_NOT_SATISFIABLE,
+            detail="Requested range not satisfiable",
+            headers={"Content-Range": f"bytes */{file_size}"}
+        )
+    if len(ranges) > MAX_RANGES or sum(end - start + 1 for start, end in ranges) > file_size:
+        return None
+    return ranges
+
+
+def if_range_matches(if_range: str | None, last_modified: str) -> bool:
+    """
+    If-Range lets a client resume only if the file is unchanged. Without ETags
+    only an exact Last-Modified date matches; anything else means send it all.
+    """
+    return if_range is None or if_range.strip() == last_modified
+
+
+def not_modified_since(if_modified_since: str | None, mtime: float) -> bool:
+    """If-Modified-Since check at one-second resolution, as HTTP dates have."""
+    if not if_modified_since:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        return False
+    return int(mtime) <= since.timestamp()
+
+
+def supports_pathsend(request: Request) -> bool:
+    """Whether the ASGI server can send a file by path (http.response.pathsend)."""
+    return DOWNLOAD_MODE == "auto" and "http.response.pathsend" in request.scope.get("extensions", {})
+
+
+def multipart_byteranges(
+    file_path: Path,
+    ranges: list[tuple[int, int]],
+    file_size: int,
+    content_type: str
+) -> tuple[str, int, AsyncIterator[bytes]]:
+    """
+    Build a multipart/byteranges body for several ranges.
+    
+    Returns:
+        (Content-Type with boundary, exact Content-Length, body iterator)
+    """
+    boundary = secrets.token_hex(16)
+    part_headers = [
+        (
+            f"\r\n--{boundary}\r\n"
+            f"Content-Type: {content_type}\r\n"
+            f"Content-Range: bytes {start}-{end}/{file_size}\r\n\r\n"
+        ).encode("latin-1")
+        for start, end in ranges
+    ]
+    closing = f"\r\n--{boundary}--\r\n".encode("latin-1")
+    content_length = (
+        sum(len(header) for header in part_headers)
+        + sum(end - start + 1 for start, end in ranges)
+        + len(closing)
+    )
+    
+    async def body():
+        for header, (start, end) in zip(part_headers, ranges):
+            yield header
+            async for chunk in async_file_iterator(file_path, start, end - start + 1):
+                yield chunk
+        yield closing
+    
+    return f"multipart/byteranges; boundary={boundary}", content_length, body()
+
 # ─────────────────────────────────────────────────────────────────────────────
 # DOWNLOAD FILE
 # ─────────────────────────────────────────────────────────────────────────────
 
-async def async_file_iterator(file_path: Path, chunk_size: int = CHUNK_SIZE):
-    """Async generator that streams file content in chunks."""
+async def async_file_iterator(
+    file_path: Path,
+    start: int = 0,
+    length: int | None = None,
+    chunk_size: int = CHUNK_SIZE
+):
+    """Async generator that streams file content in chunks, optionally only `length` bytes from `start`."""
     async with aiofiles.open(file_path, mode='rb') as f:
-        while chunk := await f.read(chunk_size):
+        if start:
+            await f.seek(start)
+        remaining = length
+        while remaining is None or remaining > 0:
+            chunk = await f.read(chunk_size if remaining is None else min(chunk_size, remaining))
+            if not chunk:
+                break
+            if remaining is not None:
+                remaining -= len(chunk)
             yield chunk
 
 
-@router.get(
+@router.api_route(
     "/{bucket}/{path:path}",
+    methods=["GET", "HEAD"],
     responses={
         200: {
             "description": "File content",
@@ -199,23 +370,35 @@ async def async_file_iterator(file_path: Path, chunk_size: int = CHUNK_SIZE):
                 }
             }
         },
+        206: {"description": "Partial content (one range, or multipart/byteranges for several)"},
+        304: {"description": "Not modified since If-Modified-Since"},
+        416: {"model": ErrorResponse, "description": "Range Not Satisfiable"},
         **RESP_ERRORS
     },
     summary="Download File"
 )
 async def download_file(
+    request: Request,
     bucket: Annotated[str, PathParam(
         min_length=3, 
         max_length=63, 
         pattern=BUCKET_NAME_PATTERN,
         examples=["my-bucket", "test-storage"]
     )],
-    path: Annotated[str, PathParam(examples=["document.pdf", "images/photo.png"])]
+    path: Annotated[str, PathParam(examples=["document.pdf", "images/photo.png"])],
+    range_header: Annotated[Optional[str], Header(alias="Range")] = None,
+    if_range: Annotated[Optional[str], Header(alias="If-Range")] = None,
+    if_modified_since: Annotated[Optional[str], Header(alias="If-Modified-Since")] = None,
 ):
     """Download a file from a bucket using async streaming.
     
+    Supports `Range` (single and multiple byte ranges, answered with 206),
+    `If-Range` against Last-Modified, `If-Modified-Since` (304 from the file's
+    mtime, without opening it), and HEAD (headers only, no file read).
+    
     Performance optimizations:
-    - Async file I/O via aiofiles for non-blocking reads
+    - Whole files go out via pathsend when the server supports it (DOWNLOAD_MODE)
+    - Async file I/O via aiofiles for non-blocking reads otherwise
     - StreamingResponse for memory-efficient large file transfers
     - Proper Content-Length header for progress indication
     """
@@ -225,30 +408,62 @@ async def download_file(
     
     file_path = safe_join(bucket_path, path)
     
-    # Check if file exists (async)
-    if not await aiofiles.os.path.exists(str(file_path)):
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="File not found")
-    
     try:
         # Get file stats for Content-Length header
         stat_result = await aiofiles.os.stat(str(file_path))
-        file_size = stat_result.st_size
-        
-        content_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
-        
-        # Use StreamingResponse with async generator for memory efficiency
-        headers = {
-            "Content-Disposition": f'attachment; filename="{file_path.name}"',
-            "Content-Length": str(file_size),
-        }
-        
-        return StreamingResponse(
-            async_file_iterator(file_path),
-            media_type=content_type,
-            headers=headers
-        )
     except FileNotFoundError:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="File not found")
+    if not stat.S_ISREG(stat_result.st_mode):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="File not found")
+    
+    file_size = stat_result.st_size
+    content_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+    last_modified = formatdate(stat_result.st_mtime, usegmt=True)
+    
+    headers = {
+        "Content-Disposition": f'attachment; filename="{file_path.name}"',
+        "Accept-Ranges": "bytes",
+        "Last-Modified": last_modified,
+    }
+    
+    if not_modified_since(if_modified_since, stat_result.st_mtime):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"Last-Modified": last_modified})
+    
+    ranges = None
+    if range_header and if_range_matches(if_range, last_modified):
+        ranges = parse_range_header(range_header, file_size)
+    
+    if ranges is None and range_header is None and request.method != "HEAD" and supports_pathsend(request):
+        response = FileResponse(file_path, stat_result=stat_result, media_type=content_type, headers=headers)
+        # Its mtime/size ETag is not a validator this service honours
+        del response.headers["etag"]
+        return response
+    
+    if ranges is None:
+        status_code = status.HTTP_200_OK
+        headers["Content-Length"] = str(file_size)
+        body = async_file_iterator(file_path) if request.method != "HEAD" else None
+    elif len(ranges) == 1:
+        status_code = status.HTTP_206_PARTIAL_CONTENT
+        start, end = ranges[0]
+        headers["Content-Range"] = f"bytes {start}-{end}/{file_size}"
+        headers["Content-Length"] = str(end - start + 1)
+        body = async_file_iterator(file_path, start, end - start + 1) if request.method != "HEAD" else None
+    else:
+        status_code = status.HTTP_206_PARTIAL_CONTENT
+        content_type, content_length, body = multipart_byteranges(file_path, ranges, file_size, content_type)
+        headers["Content-Length"] = str(content_length)
+    
+    if request.method == "HEAD":
+        return Response(status_code=status_code, media_type=content_type, headers=headers)
+    
+    # Use StreamingResponse with async generator for memory efficiency
+    return StreamingResponse(
+        body,
+        status_code=status_code,
+        media_type=content_type,
+        headers=headers
+    )
 
 # ─────────────────────────────────────────────────────────────────────────────
 # DELETE FILE
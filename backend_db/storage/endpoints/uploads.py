@@ -0,0 +1,338 @@
+# uploads.py
+"""Resumable chunked uploads: create a session, PUT chunks at offsets, assemble, complete (see upload_sessions)."""
+
+import asyncio
+import hashlib
+import mimetypes
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Annotated, Optional
+from uuid import UUID
+import aiofiles
+import aiofiles.os
+from fastapi import APIRouter, HTTPException, Header, Path as PathParam, Query, Request, status
+
+from endpoints.files import BASE_PATH, CHUNK_SIZE, RESP_ERRORS, ErrorResponse, safe_join, commit_upload
+from models.bucket import BUCKET_NAME_PATTERN
+from models.file import FileMetadata, FileUploadResponse
+from models.upload import UploadAssembled, UploadSessionCreate, UploadSessionStatus
+from upload_sessions import (
+    ASSEMBLED_FILE,
+    DEFAULT_TTL_SECONDS,
+    UploadSession,
+    assembled_dir,
+    chunk_name,
+    claim_session,
+    contiguous_offset,
+    create_session,
+    list_chunks,
+    load_assembled,
+    load_session,
+    mark_assembled,
+    received_ranges,
+    release_session,
+    remove_session_dir,
+    session_dir,
+)
+
+router = APIRouter(prefix="/uploads", tags=["uploads"])
+
+UPLOAD_ERRORS = {
+    **RESP_ERRORS,
+    409: {"model": ErrorResponse, "description": "Upload Incomplete"},
+}
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Helpers
+# ─────────────────────────────────────────────────────────────────────────────
+
+def session_status(session: UploadSession) -> UploadSessionStatus:
+    """Status computed from the chunk files. Blocking - run in a thread."""
+    ranges = received_ranges(list_chunks(session.path))
+    received = sum(min(end, session.size) - start for start, end in ranges)
+    return UploadSessionStatus(
+        session_id=session.session_id,
+        size=session.size,
+        offset=min(contiguous_offset(ranges), session.size),
+        received_bytes=received,
+        ranges=[[start, end] for start, end in ranges],
+        complete=received >= session.size,
+        expires_at=datetime.fromtimestamp(session.expires_at, timezone.utc)
+    )
+
+
+async def get_session(session_id: UUID) -> UploadSession:
+    session = await asyncio.to_thread(load_session, session_id)
+    if session is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Upload session not found")
+    return session
+
+
+async def assemble_chunks(
+    chunks: list[tuple[int, int, Path]],
+    size: int,
+    target: Path
+) -> str:
+    """
+    Concatenate the chunks into target, hashing as it goes. Overlapping chunks
+    (retries with another chunk size) are read from where the previous one ended.
+
+    Returns:
+        SHA-256 hex digest
+    """
+    digest = hashlib.sha256()
+    position = 0
+    try:
+        async with aiofiles.open(target, "wb") as out:
+            for offset, length, chunk_path in chunks:
+                end = min(offset + length, size)
+                if end <= position:
+                    continue
+                if offset > position:
+                    raise RuntimeError(f"Missing bytes {position}-{offset - 1}")
+                async with aiofiles.open(chunk_path, "rb") as src:
+                    await src.seek(position - offset)
+                    while position < end:
+                        data = await src.read(min(CHUNK_SIZE, end - position))
+                        if not data:
+                            raise RuntimeError(f"Chunk at offset {offset} is truncated")
+                        await out.write(data)
+                        digest.update(data)
+                        position += len(data)
+        if position != size:
+            raise RuntimeError(f"Missing bytes {position}-{size - 1}")
+    except BaseException:
+        try:
+            await aiofiles.os.unlink(str(target))
+        except FileNotFoundError:
+            pass
+        raise
+    return digest.hexdigest()
+
+
+def assembled_result(session: UploadSession) -> UploadAssembled:
+    return UploadAssembled(
+        session_id=session.session_id,
+        size=session.size,
+        checksum_sha256=session.checksum_sha256,
+        expires_at=datetime.fromtimestamp(session.expires_at, timezone.utc)
+    )
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# CREATE SESSION
+# ─────────────────────────────────────────────────────────────────────────────
+
+@router.post(
+    "",
+    response_model=UploadSessionStatus,
+    status_code=status.HTTP_201_CREATED,
+    responses=RESP_ERRORS,
+    summary="Create Upload Session"
+)
+async def create_upload_session(payload: UploadSessionCreate) -> UploadSessionStatus:
+    """Start a resumable upload of `size` bytes. Chunks are sent with PUT /uploads/{session_id}."""
+    session = await asyncio.to_thread(create_session, payload.size, payload.ttl_seconds or DEFAULT_TTL_SECONDS)
+    return await asyncio.to_thread(session_status, session)
+
+# ─────────────────────────────────────────────────────────────────────────────
+# SESSION STATUS
+# ─────────────────────────────────────────────────────────────────────────────
+
+@router.get(
+    "/{session_id}",
+    response_model=UploadSessionStatus,
+    responses=RESP_ERRORS,
+    summary="Get Upload Session"
+)
+async def get_upload_session(session_id: UUID) -> UploadSessionStatus:
+    """Received ranges and the offset to resume from."""
+    session = await get_session(session_id)
+    return await asyncio.to_thread(session_status, session)
+
+# ─────────────────────────────────────────────────────────────────────────────
+# UPLOAD CHUNK
+# ─────────────────────────────────────────────────────────────────────────────
+
+@router.put(
+    "/{session_id}",
+    response_model=UploadSessionStatus,
+    responses=RESP_ERRORS,
+    summary="Upload Chunk"
+)
+async def upload_chunk(
+    request: Request,
+    session_id: UUID,
+    offset: Annotated[int, Query(ge=0, description="Byte offset of the chunk within the file")]
+) -> UploadSessionStatus:
+    """
+    Write the raw request body at `offset`. Chunks may be sent in any order and
+    concurrently; sending a chunk again replaces it. The chunk only becomes part
+    of the session once fully received, so an interrupted PUT leaves nothing
+    behind and is simply retried.
+    """
+    session = await get_session(session_id)
+    if offset >= session.size:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Offset is past the end of the upload")
+
+    limit = session.size - offset
+    tmp_path = session.path / f".{uuid.uuid4().hex}.tmp"
+    length = 0
+    try:
+        async with aiofiles.open(tmp_path, "wb") as f:
+            async for chunk in request.stream():
+                length += len(chunk)
+                if length > limit:
+                    raise HTTPException(
+                        status_code=status.HTTP_400_BAD_REQUEST,
+                        detail="Chunk extends past the declared upload size"
+                    )
+                await f.write(chunk)
+
+        if length == 0:
+            raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Chunk cannot be empty")
+
+        await aiofiles.os.replace(str(tmp_path), str(session.path / chunk_name(offset)))
+    except FileNotFoundError:
+        # Completed, aborted or expired while the chunk was arriving
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Upload session not found")
+    finally:
+        try:
+            await aiofiles.os.unlink(str(tmp_path))
+        except FileNotFoundError:
+            pass
+
+    return await asyncio.to_thread(session_status, session)
+
+# ─────────────────────────────────────────────────────────────────────────────
+# ASSEMBLE SESSION
+# ─────────────────────────────────────────────────────────────────────────────
+
+@router.post(
+    "/{session_id}/assemble",
+    response_model=UploadAssembled,
+    responses=UPLOAD_ERRORS,
+    summary="Assemble Upload Session"
+)
+async def assemble_upload_session(session_id: UUID) -> UploadAssembled:
+    """
+    Concatenate the received chunks into a staged file inside the session,
+    hashing them. Nothing appears in a bucket yet; publish it with
+    POST /uploads/{session_id}/complete/{bucket}/{path}.
+
+    Repeating it once assembled returns the same result. 409 if bytes are
+    still missing; the session is kept so the missing chunks can be sent.
+    """
+    assembled = await asyncio.to_thread(load_assembled, session_id)
+    if assembled is not None:
+        return assembled_result(assembled)
+
+    session = await get_session(session_id)
+    progress = await asyncio.to_thread(session_status, session)
+    if not progress.complete:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Upload incomplete: {progress.received_bytes} of {progress.size} bytes received"
+        )
+
+    # Only one request gets to assemble; late chunk PUTs now get 404
+    claimed = await asyncio.to_thread(claim_session, session)
+    if claimed is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Upload session not found")
+
+    try:
+        chunks = await asyncio.to_thread(list_chunks, claimed)
+        digest = await assemble_chunks(chunks, session.size, claimed / ASSEMBLED_FILE)
+        await asyncio.to_thread(mark_assembled, session, claimed, digest)
+    except Exception as e:
+        await asyncio.to_thread(release_session, session, claimed)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Upload failed: {str(e)}"
+        )
+
+    return assembled_result(session)
+
+# ─────────────────────────────────────────────────────────────────────────────
+# COMPLETE SESSION
+# ─────────────────────────────────────────────────────────────────────────────
+
+@router.post(
+    "/{session_id}/complete/{bucket}/{path:path}",
+    response_model=FileUploadResponse,
+    status_code=status.HTTP_201_CREATED,
+    responses=UPLOAD_ERRORS,
+    summary="Complete Upload Session"
+)
+async def complete_upload_session(
+    session_id: UUID,
+    bucket: Annotated[str, PathParam(
+        min_length=3,
+        max_length=63,
+        pattern=BUCKET_NAME_PATTERN,
+        examples=["my-bucket", "test-storage"]
+    )],
+    path: Annotated[str, PathParam(examples=["document.pdf", "images/photo.png"])],
+    content_type: Annotated[Optional[str], Header(alias="Content-Type")] = None,
+) -> FileUploadResponse:
+    """
+    Move an assembled session's file into bucket/path and end the session.
+
+    The file appears atomically, exactly as with a single-request upload
+    (including STORAGE_DEDUP). 409 if the session has not been assembled.
+    """
+    bucket_path = BASE_PATH / bucket
+    if not bucket_path.exists():
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Bucket not found")
+    file_path = safe_join(bucket_path, path)
+
+    session = await asyncio.to_thread(load_assembled, session_id)
+    if session is None:
+        if await asyncio.to_thread(load_session, session_id) is not None:
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Upload has not been assembled")
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Upload session not found")
+
+    directory = assembled_dir(session_id)
+    try:
+        await aiofiles.os.makedirs(file_path.parent, exist_ok=True)
+        deduplicated = await commit_upload(directory / ASSEMBLED_FILE, file_path, session.checksum_sha256)
+    except FileNotFoundError:
+        # Completed by a concurrent request
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Upload session not found")
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Upload failed: {str(e)}"
+        )
+
+    await asyncio.to_thread(remove_session_dir, directory)
+
+    actual_content_type = content_type if content_type and content_type != "application/octet-stream" else mimetypes.guess_type(path)[0] or "application/octet-stream"
+    return FileUploadResponse(
+        deduplicated=deduplicated,
+        file=FileMetadata(
+            name=file_path.name,
+            path=path,
+            size=session.size,
+            content_type=actual_content_type,
+            checksum_sha256=session.checksum_sha256,
+            created_at=datetime.now(timezone.utc)
+        )
+    )
+
+# ─────────────────────────────────────────────────────────────────────────────
+# ABORT SESSION
+# ─────────────────────────────────────────────────────────────────────────────
+
+@router.delete(
+    "/{session_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    responses=RESP_ERRORS,
+    summary="Abort Upload Session"
+)
+async def abort_upload_session(session_id: UUID):
+    """Discard the session and its chunks or assembled file. Idempotent, like file deletes."""
+    await asyncio.to_thread(remove_session_dir, session_dir(session_id))
+    await asyncio.to_thread(remove_session_dir, assembled_dir(session_id))
@@ -4,7 +4,11 @@ from fastapi.responses import JSONResponse
 from fastapi.exceptions import RequestValidationError
 from endpoints.buckets import router as buckets_router
 from endpoints.files import router as files_router
-from db import init_db, close_db, is_db_configured
+from endpoints.blobs import router as blobs_router
+from endpoints.uploads import router as uploads_router
+from blob_store import start_blob_gc, stop_blob_gc
+from upload_sessions import start_upload_sweeper, stop_upload_sweeper
+from db import init_db, close_db, is_db_configured, get_pool_stats
 
 
 @asynccontextmanager
@@ -17,9 +21,14 @@ async def lifespan(app: FastAPI):
         # Log but don't fail - storage can work without DB for blob-only mode
         print(f"Database connection not available: {e}")
     
+    await start_blob_gc()
+    await start_upload_sweeper()
+    
     yield
     
     # Shutdown
+    await stop_upload_sweeper()
+    await stop_blob_gc()
     await close_db()
 
 
@@ -38,10 +47,13 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
 
 app.include_router(buckets_router, prefix="/api/v1")
 app.include_router(files_router, prefix="/api/v1")
+app.include_router(blobs_router, prefix="/api/v1")
+app.include_router(uploads_router, prefix="/api/v1")
 
 @app.get("/health")
 def health():
     return {
         "status": "healthy",
-        "database": "connected" if is_db_configured() else "not configured"
+        "database": "connected" if is_db_configured() else "not configured",
+        "db_pool": get_pool_stats(),
     }
@@ -0,0 +1,22 @@
+from pydantic import BaseModel, Field
+
+# ─────────────────────────────────────────────────────────────────────────────
+# 1. Dedup Report
+# ─────────────────────────────────────────────────────────────────────────────
+class BlobStoreReport(BaseModel):
+    dedup_enabled: bool = Field(description="Whether new uploads use the content-addressed layout (STORAGE_DEDUP)")
+    blobs: int = Field(description="Distinct blobs in the store")
+    references: int = Field(description="Bucket paths linked to a blob")
+    stored_bytes: int = Field(description="Disk used by the store, orphans included")
+    logical_bytes: int = Field(description="Total size of all referencing paths")
+    saved_bytes: int = Field(description="logical_bytes minus the bytes of referenced blobs")
+    orphans: int = Field(description="Blobs no path links to any more")
+    orphan_bytes: int
+
+# ─────────────────────────────────────────────────────────────────────────────
+# 2. Garbage Collection
+# ─────────────────────────────────────────────────────────────────────────────
+class BlobGcResponse(BaseModel):
+    removed: int = Field(description="Orphan blobs deleted")
+    removed_bytes: int
+    orphans_skipped: int = Field(description="Orphans left because they changed within the grace period")
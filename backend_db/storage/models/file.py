@@ -10,6 +10,7 @@ class FileMetadata(BaseModel):
     path: str = Field(examples=["uploads/document.pdf", "images/photo.png"])
     size: int = Field(examples=[1024, 2048576])
     content_type: str = Field(examples=["application/pdf", "image/png"])
+    checksum_sha256: Optional[str] = Field(None, description="SHA-256 of the content (hex), set on upload")
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
     
@@ -22,6 +23,7 @@ class FileMetadata(BaseModel):
                     "path": "uploads/document.pdf",
                     "size": 1024,
                     "content_type": "application/pdf",
+                    "checksum_sha256": "9f86d081884c7d659a2feaa0c55ad015a3bf4f1b2b0b822cd15d6c15b0f00a08",
                     "created_at": "2024-01-01T00:00:00Z"
                 }
             ]
@@ -33,4 +35,5 @@ class FileMetadata(BaseModel):
 # ─────────────────────────────────────────────────────────────────────────────
 class FileUploadResponse(BaseModel):
     success: bool = Field(default=True, examples=[True])
+    deduplicated: bool = Field(default=False, description="Content was already stored and is now shared (STORAGE_DEDUP only)")
     file: FileMetadata
@@ -0,0 +1,32 @@
+from pydantic import BaseModel, Field
+from typing import List, Optional
+from datetime import datetime
+from uuid import UUID
+
+# ─────────────────────────────────────────────────────────────────────────────
+# 1. Session Create
+# ─────────────────────────────────────────────────────────────────────────────
+class UploadSessionCreate(BaseModel):
+    size: int = Field(gt=0, description="Total size of the file in bytes")
+    ttl_seconds: Optional[float] = Field(None, gt=0, description="Lifetime of the unfinished session (default 24 h)")
+
+# ─────────────────────────────────────────────────────────────────────────────
+# 2. Session Status
+# ─────────────────────────────────────────────────────────────────────────────
+class UploadSessionStatus(BaseModel):
+    session_id: UUID
+    size: int
+    offset: int = Field(description="Bytes received without a gap from the start")
+    received_bytes: int = Field(description="Bytes received in total, across all ranges")
+    ranges: List[List[int]] = Field(default_factory=list, description="Received [start, end) byte ranges, merged")
+    complete: bool = Field(description="Every byte has been received; the session can be completed")
+    expires_at: datetime
+
+# ─────────────────────────────────────────────────────────────────────────────
+# 3. Assembled Session
+# ─────────────────────────────────────────────────────────────────────────────
+class UploadAssembled(BaseModel):
+    session_id: UUID
+    size: int
+    checksum_sha256: str = Field(description="SHA-256 hex digest of the assembled file")
+    expires_at: datetime
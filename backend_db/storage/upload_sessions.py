@@ -0,0 +1,239 @@
+# upload_sessions.py
+"""
+Resumable upload sessions, kept on disk under BASE_PATH/.uploads.
+
+A session is a directory holding session.json (declared size, expiry) and one
+file per received chunk, named by its byte offset. Chunks are independent
+files, so they can arrive in any order, in parallel, from any worker; a retried
+chunk simply replaces the previous copy. The received ranges are the union of
+the chunk files - no index needs to be kept consistent.
+
+Completing a session takes two steps, so the file only appears in its bucket
+once the backend has reserved its path:
+1. Assemble: the directory is renamed out of the way (so exactly one request
+   assembles it and late chunks get 404), the chunks are concatenated into a
+   staged file inside it while hashing, and the directory is marked assembled
+2. Publish: the staged file is renamed into bucket/path like a plain upload
+
+Sessions past their expiry are removed by a periodic sweep.
+"""
+
+import asyncio
+import json
+import os
+import shutil
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+
+BASE_PATH = Path(os.getenv("STORAGE_PATH", "./data"))
+# Not a valid bucket name, so it can never collide with one
+UPLOADS_PATH = BASE_PATH / ".uploads"
+
+SWEEP_INTERVAL = float(os.getenv("STORAGE_UPLOAD_SWEEP_INTERVAL", "3600"))
+# Fallback lifetime when the caller does not pass one
+DEFAULT_TTL_SECONDS = 86400
+
+SESSION_FILE = "session.json"
+CHUNK_SUFFIX = ".part"
+# Suffix of a session directory claimed by a completing request
+ASSEMBLING_SUFFIX = ".assembling"
+# Suffix of a session directory whose chunks are assembled, awaiting publish
+ASSEMBLED_SUFFIX = ".assembled"
+# The assembled file, inside the session directory
+ASSEMBLED_FILE = "assembled"
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Sessions
+# ─────────────────────────────────────────────────────────────────────────────
+
+@dataclass
+class UploadSession:
+    session_id: uuid.UUID
+    size: int
+    expires_at: float
+    checksum_sha256: str | None = None  # Set once assembled
+
+    @property
+    def path(self) -> Path:
+        return session_dir(self.session_id)
+
+
+def session_dir(session_id: uuid.UUID) -> Path:
+    return UPLOADS_PATH / session_id.hex
+
+
+def assembled_dir(session_id: uuid.UUID) -> Path:
+    return UPLOADS_PATH / f"{session_id.hex}{ASSEMBLED_SUFFIX}"
+
+
+def chunk_name(offset: int) -> str:
+    """Chunk file name; zero-padded so names sort by offset."""
+    return f"{offset:020d}{CHUNK_SUFFIX}"
+
+
+def _write_session_file(directory: Path, session: UploadSession) -> None:
+    data = {"size": session.size, "expires_at": session.expires_at}
+    if session.checksum_sha256:
+        data["checksum_sha256"] = session.checksum_sha256
+    tmp = directory / f".{SESSION_FILE}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(data, f)
+    os.replace(tmp, directory / SESSION_FILE)
+
+
+def _read_session_file(session_id: uuid.UUID, directory: Path) -> UploadSession | None:
+    try:
+        with open(directory / SESSION_FILE) as f:
+            data = json.load(f)
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+    session = UploadSession(session_id, data["size"], data["expires_at"], data.get("checksum_sha256"))
+    if session.expires_at < time.time():
+        return None
+    return session
+
+
+def create_session(size: int, ttl_seconds: float) -> UploadSession:
+    """Create an empty session directory. Blocking - run in a thread."""
+    session = UploadSession(uuid.uuid4(), size, time.time() + ttl_seconds)
+    session.path.mkdir(parents=True)
+    _write_session_file(session.path, session)
+    return session
+
+
+def load_session(session_id: uuid.UUID) -> UploadSession | None:
+    """The open session, or None if it does not exist or has expired. Blocking."""
+    return _read_session_file(session_id, session_dir(session_id))
+
+
+def load_assembled(session_id: uuid.UUID) -> UploadSession | None:
+    """The session if it is assembled and awaiting publish, else None. Blocking."""
+    return _read_session_file(session_id, assembled_dir(session_id))
+
+
+def list_chunks(directory: Path) -> list[tuple[int, int, Path]]:
+    """(offset, length, path) of every received chunk, by offset. Blocking."""
+    chunks = []
+    for entry in os.scandir(directory):
+        if not entry.name.endswith(CHUNK_SUFFIX):
+            continue
+        try:
+            length = entry.stat().st_size
+        except FileNotFoundError:
+            # Replaced by a retry of the same chunk meanwhile
+            continue
+        chunks.append((int(entry.name[:-len(CHUNK_SUFFIX)]), length, Path(entry.path)))
+    chunks.sort()
+    return chunks
+
+
+def received_ranges(chunks: list[tuple[int, int, Path]]) -> list[tuple[int, int]]:
+    """Merged [start, end) byte ranges covered by the chunks."""
+    ranges: list[tuple[int, int]] = []
+    for offset, length, _ in chunks:
+        end = offset + length
+        if ranges and offset <= ranges[-1][1]:
+            ranges[-1] = (ranges[-1][0], max(ranges[-1][1], end))
+        else:
+            ranges.append((offset, end))
+    return ranges
+
+
+def contiguous_offset(ranges: list[tuple[int, int]]) -> int:
+    """Bytes received without a gap from the start - where a serial client resumes."""
+    return ranges[0][1] if ranges and ranges[0][0] == 0 else 0
+
+
+def claim_session(session: UploadSession) -> Path | None:
+    """
+    Move the session directory aside for assembly. Only one concurrent caller
+    succeeds; chunk writes still in flight fail to land and report 404.
+    Blocking.
+    """
+    claimed = session.path.with_name(f"{session.path.name}{ASSEMBLING_SUFFIX}")
+    try:
+        os.rename(session.path, claimed)
+    except FileNotFoundError:
+        return None
+    return claimed
+
+
+def release_session(session: UploadSession, claimed: Path) -> None:
+    """Put a claimed session back after a failed assembly, so it can be retried."""
+    os.rename(claimed, session.path)
+
+
+def mark_assembled(session: UploadSession, claimed: Path, checksum_sha256: str) -> None:
+    """
+    Record the checksum of the assembled file, drop the chunks and move the
+    claimed directory to its assembled name. Blocking.
+    """
+    session.checksum_sha256 = checksum_sha256
+    _write_session_file(claimed, session)
+    for _, _, chunk_path in list_chunks(claimed):
+        chunk_path.unlink(missing_ok=True)
+    os.rename(claimed, assembled_dir(session.session_id))
+
+
+def remove_session_dir(directory: Path) -> None:
+    shutil.rmtree(directory, ignore_errors=True)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Expiry Sweep
+# ─────────────────────────────────────────────────────────────────────────────
+
+def sweep_expired() -> int:
+    """Delete expired sessions, claimed ones included. Blocking - run in a thread."""
+    if not UPLOADS_PATH.exists():
+        return 0
+    removed = 0
+    now = time.time()
+    for entry in os.scandir(UPLOADS_PATH):
+        if not entry.is_dir(follow_symlinks=False):
+            continue
+        try:
+            with open(os.path.join(entry.path, SESSION_FILE)) as f:
+                expires_at = json.load(f)["expires_at"]
+        except (FileNotFoundError, ValueError, KeyError):
+            # Half-created session: fall back to the directory age
+            expires_at = entry.stat(follow_symlinks=False).st_mtime + DEFAULT_TTL_SECONDS
+        if expires_at < now:
+            remove_session_dir(Path(entry.path))
+            removed += 1
+    return removed
+
+
+_sweep_task: asyncio.Task | None = None
+
+
+async def _sweep_forever() -> None:
+    while True:
+        await asyncio.sleep(SWEEP_INTERVAL)
+        try:
+            removed = await asyncio.to_thread(sweep_expired)
+            if removed:
+                print(f"[{datetime.now()}] Removed {removed} expired upload session(s)")
+        except Exception as e:
+            print(f"[{datetime.now()}] Upload session sweep failed: {e}")
+
+
+async def start_upload_sweeper() -> None:
+    """Start the periodic removal of expired upload sessions."""
+    global _sweep_task
+    if SWEEP_INTERVAL > 0 and _sweep_task is None:
+        _sweep_task = asyncio.create_task(_sweep_forever())
+
+
+async def stop_upload_sweeper() -> None:
+    global _sweep_task
+    if _sweep_task is not None:
+        _sweep_task.cancel()
+        try:
+            await _sweep_task
+        except asyncio.CancelledError:
+            pass
+        _sweep_task = None